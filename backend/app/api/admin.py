@@ -0,0 +1,74 @@
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException
+from app.config import ADMIN_TOKEN
+from app.models.registry import UnknownModelVersionError
+from app.services.scoring import scoring_service
+
+
+def require_admin_token(x_admin_token: str = Header(None)):
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+def _models_status():
+    return {
+        "live": scoring_service.model_version,
+        "shadow": scoring_service.shadow.stats(),
+        "registry": {
+            "current": scoring_service.registry.current(),
+            "shadow": scoring_service.registry.shadow(),
+            "versions": scoring_service.registry.versions()
+        }
+    }
+
+
+@router.get("/models")
+def list_models():
+    """Registered model versions, the live model of this worker and shadow comparison stats."""
+    return _models_status()
+
+
+@router.post("/models/{version}/activate")
+def activate_model(version: str):
+    """
+    Makes a registered version the live model: swapped in on this worker now,
+    and written to the registry's CURRENT pointer for the other workers.
+    """
+    try:
+        scoring_service.activate(version, persist=True)
+    except UnknownModelVersionError:
+        raise HTTPException(status_code=404, detail=f"Model version {version} is not registered")
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Model version {version} could not be loaded: {e}")
+    return _models_status()
+
+
+@router.post("/models/{version}/shadow")
+def shadow_model(version: str):
+    """Scores a share of live traffic with a registered version and compares it with the live model."""
+    try:
+        scoring_service.set_shadow(version, persist=True)
+    except UnknownModelVersionError:
+        raise HTTPException(status_code=404, detail=f"Model version {version} is not registered")
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Model version {version} could not be loaded: {e}")
+    return _models_status()
+
+
+@router.delete("/models/shadow")
+def stop_shadow():
+    """Stops shadow scoring."""
+    scoring_service.set_shadow(None, persist=True)
+    return _models_status()
+
+
+@router.post("/drift/reset")
+def reset_drift():
+    """Starts this worker's drift sketches over, e.g. after an expected change in the applicant population."""
+    scoring_service.drift.reset()
+    return {"status": "reset", "model_version": scoring_service.model_version}
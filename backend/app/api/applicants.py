@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.schemas.applicants import (
+    ApplicantSort, SortOrder, RiskTier, ApplicantPage, ApplicantRecord, ApplicantSummary, MAX_PAGE_SIZE
+)
+from app.services.applicants import InvalidCursorError
+from app.services.scoring import scoring_service
+from app.services.metrics import TimedJSONResponse
+
+router = APIRouter()
+
+# Sync handlers: SQLite reads block, so they run in the threadpool
+@router.get("", response_model=ApplicantPage)
+def search_applicants(
+    sort: ApplicantSort = ApplicantSort.ID,
+    order: SortOrder = SortOrder.DESC,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = Query(None, description="next_cursor of the previous page"),
+    risk_tier: RiskTier = None,
+    min_credit_score: int = None,
+    max_credit_score: int = None,
+    min_probability_of_default: float = None,
+    max_probability_of_default: float = None,
+    min_limit_bal: float = None,
+    max_limit_bal: float = None
+):
+    """Scored applicants, filtered and sorted server-side, one keyset page at a time."""
+    ranges = {
+        "credit_score": (min_credit_score, max_credit_score),
+        "probability_of_default": (min_probability_of_default, max_probability_of_default),
+        "limit_bal": (min_limit_bal, max_limit_bal)
+    }
+    try:
+        page = scoring_service.applicants.search(
+            sort.value, order.value, limit, cursor, risk_tier.value if risk_tier else None, ranges
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TimedJSONResponse(page)
+
+@router.get("/summary", response_model=ApplicantSummary)
+def applicant_summary(risk_tier: RiskTier = None):
+    """Counts by risk tier, averages, total recommended loans and the credit-score histogram."""
+    return TimedJSONResponse(scoring_service.applicants.summary(risk_tier.value if risk_tier else None))
+
+@router.get("/{applicant_id}", response_model=ApplicantRecord)
+def get_applicant(applicant_id: int):
+    applicant = scoring_service.applicants.get(applicant_id)
+    if applicant is None:
+        raise HTTPException(status_code=404, detail=f"Applicant {applicant_id} not found")
+    return TimedJSONResponse(applicant)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from app.api.credit import EXPLANATION_QUERY, timing_headers
+from app.schemas.credit import CreditScoreRequest, ExplanationMode
+from app.schemas.assessment import AssessmentResponse
+from app.services.scoring import scoring_service
+from app.services.cache import result_cache
+from app.services.dispatcher import inference_dispatcher
+from app.services.metrics import TimedJSONResponse, TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("", response_model=AssessmentResponse)
+async def get_assessment(request: CreditScoreRequest, explanation: ExplanationMode = EXPLANATION_QUERY):
+    """
+    Credit score, financial health and asset recommendation for one applicant,
+    replacing the three separate calls the dashboard used to make.
+    """
+    timings = {}
+    data = request.dict()
+
+    async def compute():
+        credit = await inference_dispatcher.score(data, explanation.value, timings)
+        result = scoring_service.complete_assessment(data, credit)
+        # Add currency metadata
+        result["credit"]["currency"] = "NGN"
+        return result
+
+    # Keyed on the investment model too, which is retrained and swapped independently
+    payload = {
+        "request": data, "explanation": explanation.value,
+        "investment_model": scoring_service.investment_model_version
+    }
+    result, hit = await result_cache.get_or_compute_async("assessment", payload, scoring_service.model_version, compute)
+    headers = timing_headers(explanation, timings, {"X-Cache": "HIT" if hit else "MISS"})
+    return TimedJSONResponse(result, headers=headers)
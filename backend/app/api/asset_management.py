@@ -1,12 +1,74 @@
-from fastapi import APIRouter
-from app.schemas.asset import AssetManagementRequest
+from fastapi import APIRouter, HTTPException, Query
+from app.schemas.asset import AssetManagementRequest, AssetRecommendationResponse, PortfolioIngestRequest, SegmentBy
 from app.services.scoring import scoring_service
+from app.services.cache import result_cache, STATIC_VERSION
+from app.services.metrics import TimedJSONResponse
+from app.services.portfolio import portfolio_store
 
 router = APIRouter()
 
-@router.post("/recommendation")
-def get_asset_recommendation(request: AssetManagementRequest):
+# async: the handler does microseconds of CPU work, less than a threadpool hop costs
+@router.post("/recommendation", response_model=AssetRecommendationResponse)
+async def get_asset_recommendation(request: AssetManagementRequest):
     data = request.dict()
-    # The logic relies on inputs provided in the request
-    result = scoring_service.get_asset_recommendation(data)
-    return result
+    # The logic relies on inputs provided in the request and the investment
+    # model, not the credit model, so credit-model swaps keep these entries
+    result, hit = result_cache.get_or_compute(
+        "asset_recommendation", {"request": data, "investment_model": scoring_service.investment_model_version},
+        STATIC_VERSION,
+        lambda: scoring_service.get_asset_recommendation(data)
+    )
+    # Rendered directly; the response_model only documents the route
+    return TimedJSONResponse(result, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+# Dashboard reads. All of them are served from the portfolio store's
+# precomputed group sums or a slice of its columns, whatever the book size.
+@router.get("/aum")
+async def get_aum():
+    return TimedJSONResponse(portfolio_store.aum())
+
+@router.get("/risk-metrics")
+def get_risk_metrics(limit: int = Query(20, ge=1, le=1000)):
+    # Sync: the first read after new scores arrive scans the book for alerts
+    return TimedJSONResponse(portfolio_store.risk_metrics(limit))
+
+@router.get("/segments")
+async def get_segments(by: SegmentBy = SegmentBy.PERSONA):
+    return TimedJSONResponse(portfolio_store.segments(by.value))
+
+@router.get("/profiles")
+async def get_profiles(offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    return TimedJSONResponse(portfolio_store.profiles(offset, limit))
+
+@router.get("/profiles/{customer_id}")
+async def get_profile(customer_id: str):
+    profile = portfolio_store.profile(customer_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
+    return TimedJSONResponse(profile)
+
+@router.get("/recommendations")
+async def get_recommendations(offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    return TimedJSONResponse(portfolio_store.recommendations(offset, limit))
+
+@router.get("/recommendations/{customer_id}")
+async def get_recommendation(customer_id: str):
+    recommendation = portfolio_store.recommendation(customer_id)
+    if recommendation is None:
+        raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
+    return TimedJSONResponse(recommendation)
+
+@router.post("/customers")
+def ingest_customers(request: PortfolioIngestRequest):
+    """
+    Scores customers (credit, financial health, allocation) and upserts them
+    into the portfolio store; the dashboard aggregates update incrementally.
+    """
+    # pandas and the bulk scorer are only imported by ingestion, not at startup
+    import pandas as pd
+    from app.batch import score_frame
+
+    frame = pd.DataFrame([c.dict() for c in request.customers])
+    scored = score_frame(frame, ["customer_id", "portfolio_value"])
+    upserted = portfolio_store.ingest(scored, "customer_id", "portfolio_value")
+    return {"upserted": upserted, "customers": portfolio_store.size}
@@ -1,17 +1,93 @@
-from fastapi import APIRouter
-from app.schemas.credit import CreditScoreRequest
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import ValidationError
+from app.config import CREDIT_EXPLANATION_MODE
+from app.schemas.credit import (
+    CreditScoreRequest, CreditScoreBatchRequest, ExplanationMode, CreditScoreResponse, CreditScoreBatchResponse,
+    GlobalExplanationResponse
+)
 from app.services.scoring import scoring_service
+from app.services.cache import result_cache
+from app.services.dispatcher import inference_dispatcher
+from app.services.metrics import TimedJSONResponse, TimedRoute, stage_timer
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.post("/score")
-def get_credit_score(request: CreditScoreRequest):
+EXPLANATION_QUERY = Query(
+    ExplanationMode(CREDIT_EXPLANATION_MODE),
+    description="SHAP factors: none (score only), fast (precomputed TreeSHAP) or exact (shap.TreeExplainer)"
+)
+
+def timing_headers(explanation: ExplanationMode, timings: dict, headers: dict = None) -> dict:
+    # Per-stage latency in ms, readable by browsers' devtools via Server-Timing
+    headers = headers if headers is not None else {}
+    headers["X-Explanation-Mode"] = explanation.value
+    if timings:
+        headers["Server-Timing"] = ", ".join(f"{stage};dur={ms:.3f}" for stage, ms in timings.items())
+    return headers
+
+# The scoring routes return TimedJSONResponse instances: the result dicts are
+# rendered straight to JSON, skipping jsonable_encoder and re-validation
+# against the response_model, which only documents the route.
+@router.post("/score", response_model=CreditScoreResponse)
+async def get_credit_score(request: CreditScoreRequest, explanation: ExplanationMode = EXPLANATION_QUERY):
+    timings = {}
     data = request.dict()
-    result = scoring_service.predict_credit_score(data)
-    # Filter out internal keys
-    if "_derived_features" in result:
-        del result["_derived_features"]
-    
-    # Add currency metadata
-    result["currency"] = "NGN"
-    return result
+
+    async def compute():
+        # Micro-batched with other in-flight requests by the inference dispatcher
+        result = await inference_dispatcher.score(data, explanation.value, timings)
+        # Filter out internal keys
+        if "_derived_features" in result:
+            del result["_derived_features"]
+        
+        # Add currency metadata
+        result["currency"] = "NGN"
+        return result
+
+    result, hit = await result_cache.get_or_compute_async(
+        "credit", {"request": data, "explanation": explanation.value}, scoring_service.model_version, compute
+    )
+    headers = timing_headers(explanation, timings, {"X-Cache": "HIT" if hit else "MISS"})
+    return TimedJSONResponse(result, headers=headers)
+
+@router.post("/score/batch", response_model=CreditScoreBatchResponse)
+def get_credit_scores_batch(request: CreditScoreBatchRequest, explanation: ExplanationMode = EXPLANATION_QUERY):
+    timings = {}
+    items = [None] * len(request.records)
+    valid_idx, valid_records = [], []
+    with stage_timer("record_validation", timings):
+        for i, record in enumerate(request.records):
+            try:
+                valid_records.append(CreditScoreRequest.model_validate(record).dict())
+                valid_idx.append(i)
+            except ValidationError as e:
+                items[i] = {"index": i, "status": "error", "errors": e.errors(include_url=False)}
+
+    results = scoring_service.predict_credit_scores(valid_records, explanation.value, timings)
+    for i, result in zip(valid_idx, results):
+        result["currency"] = "NGN"
+        items[i] = {"index": i, "status": "ok", "result": result}
+
+    return TimedJSONResponse({
+        "total": len(items),
+        "succeeded": len(valid_idx),
+        "failed": len(items) - len(valid_idx),
+        "results": items
+    }, headers=timing_headers(explanation, timings))
+
+@router.get("/explainability/global", response_model=GlobalExplanationResponse)
+def get_global_explainability(include_dependence: bool = True):
+    """
+    Global feature importance, per-risk-tier summaries and dependence-curve
+    bins of the live model, precomputed by `python -m app.explain`.
+    """
+    summary = scoring_service.global_explanations()
+    if summary is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Global explanations for model {scoring_service.model_version} have not been computed; "
+                   f"run python -m app.explain"
+        )
+    if not include_dependence:
+        summary = {k: v for k, v in summary.items() if k != "dependence"}
+    return TimedJSONResponse(summary)
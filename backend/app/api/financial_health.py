@@ -1,20 +1,40 @@
 from fastapi import APIRouter
 from app.schemas.credit import CreditScoreRequest
+from app.schemas.financial_health import FinancialHealthResponse, ScenarioRequest, ScenarioResponse
 from app.services.scoring import scoring_service
-from app.services.feature_engineering import compute_features
-import pandas as pd
+from app.services.cache import result_cache, STATIC_VERSION
+from app.services.feature_engineering import compute_feature_matrix, records_to_matrix, FeatureRow
+from app.services.metrics import TimedJSONResponse, TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.post("/score")
-def get_financial_health_score(request: CreditScoreRequest):
-    # Need derived features. 
-    # Since we might not want to re-run the whole scoring pipeline, 
-    # we can just use the feature engineering part.
+# async: the handler does microseconds of CPU work, less than a threadpool hop costs
+@router.post("/score", response_model=FinancialHealthResponse)
+async def get_financial_health_score(request: CreditScoreRequest):
     data = request.dict()
-    df = pd.DataFrame([data])
-    df_processed = compute_features(df)
-    features = df_processed.iloc[0].to_dict()
-    
-    result = scoring_service.calculate_financial_health(features)
-    return result
+
+    def compute():
+        # Need derived features. 
+        # Since we might not want to re-run the whole scoring pipeline, 
+        # we can just use the feature engineering part.
+        features = FeatureRow(compute_feature_matrix(records_to_matrix([data])), 0)
+        return scoring_service.calculate_financial_health(features)
+
+    # The health formula does not use the credit model, so model swaps keep these entries
+    result, hit = result_cache.get_or_compute("financial_health", data, STATIC_VERSION, compute)
+    # Rendered directly; the response_model only documents the route
+    return TimedJSONResponse(result, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+@router.post("/simulate", response_model=ScenarioResponse)
+def simulate_financial_health(request: ScenarioRequest):
+    """
+    What-if analysis for one applicant: every combination of the
+    perturbations' values is scored in one vectorized pass, returning credit
+    score, probability of default and financial health surfaces over the grid.
+    """
+    data = request.dict()
+    result, hit = result_cache.get_or_compute(
+        "financial_health_simulation", data, scoring_service.model_version,
+        lambda: scoring_service.simulate_scenarios(data["applicant"], data["perturbations"])
+    )
+    return TimedJSONResponse(result, headers={"X-Cache": "HIT" if hit else "MISS"})
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+from app.schemas.monitoring import DriftReport
+from app.services.scoring import scoring_service
+from app.services.metrics import TimedJSONResponse
+
+router = APIRouter()
+
+@router.get("/drift", response_model=DriftReport)
+def get_drift():
+    """
+    Per-feature drift of the traffic this worker scored with the live model
+    against the model's training data: running mean and standard deviation,
+    PSI and KS on the training quantile bins, missing and out-of-range counts.
+    """
+    report = scoring_service.drift_report()
+    if report is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Model {scoring_service.model_version} has no reference profile; "
+                   f"run python -m app.profile or retrain it"
+        )
+    return TimedJSONResponse(report)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from app.services.cache import result_cache
+from app.services.dispatcher import inference_dispatcher
+from app.services.scoring import scoring_service
+
+router = APIRouter()
+
+@router.get("/cache")
+def get_cache_stats():
+    """Hit/miss/eviction counters of the shared result cache."""
+    return result_cache.stats()
+
+@router.get("/dispatcher")
+def get_dispatcher_stats():
+    """Batch sizes, queue depth and queue-wait percentiles of the inference dispatcher."""
+    return inference_dispatcher.stats()
+
+@router.get("/applicants")
+def get_applicant_store_stats():
+    """Queued, written and dropped applicants of the applicant store writer."""
+    return scoring_service.applicants.stats()
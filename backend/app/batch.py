@@ -0,0 +1,225 @@
+"""
+Offline bulk scoring for full-book re-scores:
+
+    python -m app.batch score INPUT OUTPUT_DIR [--chunk-size N] [--workers N] [--keep-column ID]
+
+INPUT is a CSV (optionally compressed) or Parquet file holding the
+CreditScoreRequest columns. It is streamed in chunks; each chunk is scored
+in a process pool (the model is loaded once per worker) and written to
+OUTPUT_DIR as its own Parquet part file. OUTPUT_DIR/_checkpoint.json records
+the finished chunks, so re-running the same command resumes where an
+interrupted run stopped.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from app.services.feature_engineering import (
+    compute_feature_matrix, RAW_FEATURES, PAY_STATUS_COLS
+)
+from app.models.investment_model import RISK_TOLERANCES, INVESTMENT_HORIZONS, PRODUCT_KEYS
+from app.services.scoring import scoring_service, RISK_TIERS, HEALTH_BANDS
+
+CHECKPOINT_FILE = '_checkpoint.json'
+DEFAULT_CHUNK_SIZE = 50000
+# Chunks read ahead per worker. Memory stays at about
+# (workers * MAX_IN_FLIGHT_PER_WORKER) chunks regardless of input size.
+MAX_IN_FLIGHT_PER_WORKER = 2
+
+
+def iter_chunks(path: str, chunk_size: int, columns: list):
+    """Yields DataFrames of up to chunk_size rows holding the given columns."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+def input_columns(path: str) -> list:
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def score_frame(frame: pd.DataFrame, keep_columns: list) -> pd.DataFrame:
+    """
+    Credit score, financial health and asset recommendation for every row
+    of a raw input frame. Missing PAY_x status columns count as 0, as in
+    compute_features.
+    """
+    raw = frame.reindex(columns=RAW_FEATURES, fill_value=0).to_numpy(dtype=np.float64)
+    features = compute_feature_matrix(raw)
+    scored = scoring_service.score_arrays(features)
+
+    health = scoring_service.financial_health_arrays(features)
+    asset = scoring_service.recommend_assets(features, scored["credit_score"], health["financial_health_score"])
+
+    out = frame[keep_columns].reset_index(drop=True)
+    out["credit_score"] = scored["credit_score"]
+    out["probability_of_default"] = scored["probability_of_default"]
+    out["risk_tier"] = np.array(RISK_TIERS)[scored["risk_tier"]]
+    out["recommended_loan_amount"] = scored["recommended_loan_amount"]
+    out["recommended_tenor_months"] = scored["recommended_tenor_months"]
+    out["financial_health_score"] = health["financial_health_score"]
+    out["health_band"] = np.array(HEALTH_BANDS)[health["health_band"]]
+    out["risk_tolerance"] = np.array(RISK_TOLERANCES)[asset["risk_tolerance"]]
+    out["investment_horizon"] = np.array(INVESTMENT_HORIZONS)[asset["investment_horizon"]]
+    allocation = pd.DataFrame(asset["allocation"], columns=PRODUCT_KEYS).add_prefix("allocation_")
+    return pd.concat([out, allocation], axis=1)
+
+
+def _init_worker():
+    if not scoring_service.load():
+        raise RuntimeError(scoring_service.load_error)
+    # One XGBoost thread per process; the pool provides the parallelism
+    scoring_service.credit_model.model.set_params(n_jobs=1)
+
+
+def _score_chunk(index: int, first_row: int, frame: pd.DataFrame, keep_columns: list, output_dir: str):
+    start = time.perf_counter()
+    out = score_frame(frame, keep_columns)
+    out.insert(0, "row_number", np.arange(first_row, first_row + len(frame)))
+    # Write to a temp name so a killed run never leaves a truncated part behind
+    part = os.path.join(output_dir, f"part-{index:05d}.parquet")
+    out.to_parquet(part + '.tmp', index=False)
+    os.replace(part + '.tmp', part)
+    return index, len(frame), time.perf_counter() - start
+
+
+def _read_checkpoint(output_dir: str, identity: dict, restart: bool) -> dict:
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if restart or not os.path.exists(path):
+        # Parts left by an earlier run would mix with this run's output
+        for name in os.listdir(output_dir):
+            if name.startswith('part-'):
+                os.remove(os.path.join(output_dir, name))
+        return {**identity, "completed": {}}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    mismatched = [k for k in identity if checkpoint.get(k) != identity[k]]
+    if mismatched:
+        raise SystemExit(
+            f"{path} belongs to a different run ({', '.join(mismatched)} changed). "
+            f"Use --restart to discard it."
+        )
+    return checkpoint
+
+
+def _write_checkpoint(output_dir: str, checkpoint: dict):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def score(input_path: str, output_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = None,
+          keep_columns: list = None, restart: bool = False) -> dict:
+    """Scores input_path into Parquet parts under output_dir. Returns the run summary."""
+    workers = workers or os.cpu_count() or 1
+    keep_columns = list(keep_columns or [])
+
+    available = input_columns(input_path)
+    missing = [c for c in RAW_FEATURES + keep_columns if c not in available and c not in PAY_STATUS_COLS]
+    if missing:
+        raise SystemExit(f"{input_path} is missing required columns: {missing}")
+    columns = [c for c in dict.fromkeys(RAW_FEATURES + keep_columns) if c in available]
+
+    if not scoring_service.load():
+        raise SystemExit(scoring_service.load_error)
+    stat = os.stat(input_path)
+    identity = {
+        "input": os.path.abspath(input_path),
+        "input_size": stat.st_size,
+        "input_mtime": stat.st_mtime,
+        "chunk_size": chunk_size,
+        "model_version": scoring_service.model_version
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = _read_checkpoint(output_dir, identity, restart)
+    completed = checkpoint["completed"]
+    if completed:
+        print(f"Resuming: {len(completed)} chunks already scored.")
+
+    start = time.perf_counter()
+    rows_scored = 0
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    pending = set()
+
+    def collect(results):
+        nonlocal rows_scored
+        for index, n_rows, seconds in results:
+            completed[str(index)] = n_rows
+            rows_scored += n_rows
+            _write_checkpoint(output_dir, checkpoint)
+            elapsed = time.perf_counter() - start
+            print(f"chunk {index}: {n_rows} rows in {seconds:.2f}s "
+                  f"({rows_scored} rows this run, {rows_scored / elapsed:,.0f} rows/s)")
+
+    try:
+        first_row = 0
+        for index, frame in enumerate(iter_chunks(input_path, chunk_size, columns)):
+            n_rows = len(frame)
+            if str(index) in completed:
+                first_row += n_rows
+                continue
+            if pool is None:
+                collect([_score_chunk(index, first_row, frame, keep_columns, output_dir)])
+            else:
+                # Bound read-ahead so memory does not grow with the input
+                if len(pending) >= workers * MAX_IN_FLIGHT_PER_WORKER:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(f.result() for f in done)
+                pending.add(pool.submit(_score_chunk, index, first_row, frame, keep_columns, output_dir))
+            first_row += n_rows
+        if pending:
+            collect(f.result() for f in wait(pending).done)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "chunks": len(completed),
+        "rows": sum(completed.values()),
+        "rows_this_run": rows_scored,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(rows_scored / elapsed, 1) if elapsed > 0 else 0.0,
+        "workers": workers
+    }
+    checkpoint["summary"] = summary
+    _write_checkpoint(output_dir, checkpoint)
+    print(f"Scored {rows_scored} rows in {elapsed:.1f}s ({summary['rows_per_second']:,.0f} rows/s) "
+          f"with {workers} worker(s). {summary['rows']} rows in {output_dir}.")
+    return summary
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m app.batch", description="Offline bulk scoring")
+    commands = parser.add_subparsers(dest="command", required=True)
+    score_cmd = commands.add_parser("score", help="Score a CSV or Parquet file into Parquet parts")
+    score_cmd.add_argument("input", help="Input .csv[.gz] or .parquet file")
+    score_cmd.add_argument("output_dir", help="Directory for part-*.parquet files and the checkpoint")
+    score_cmd.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    score_cmd.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    score_cmd.add_argument("--keep-column", action="append", default=[], dest="keep_columns",
+                           help="Input column to copy to the output, e.g. an applicant ID (repeatable)")
+    score_cmd.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.command == "score":
+        score(args.input, args.output_dir, args.chunk_size, args.workers, args.keep_columns, args.restart)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,123 @@
+import os
+
+# Runtime settings, read once from the environment at import time.
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: its affinity mask, capped by a cgroup CPU quota (containers)."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, -(-int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+# Feature engineering: compile the fused per-row kernel with numba when available
+FEATURE_ENGINE_JIT = _env_bool("FEATURE_ENGINE_JIT", False)
+
+# Credit model inference engine: "xgboost" (XGBClassifier.predict_proba) or
+# "compiled" (trees exported to NumPy arrays on load)
+CREDIT_INFERENCE_ENGINE = os.getenv("CREDIT_INFERENCE_ENGINE", "xgboost")
+
+# Default SHAP explanation mode for credit scoring: "none", "fast" or "exact"
+CREDIT_EXPLANATION_MODE = os.getenv("CREDIT_EXPLANATION_MODE", "fast")
+
+# Result cache shared by the scoring routers (LRU + TTL, optional SQLite tier)
+RESULT_CACHE_ENABLED = _env_bool("RESULT_CACHE_ENABLED", True)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "900"))
+RESULT_CACHE_DISK_PATH = os.getenv("RESULT_CACHE_DISK_PATH") or None
+
+# How the API process loads the credit model at startup:
+# "background" (default) loads in a thread while the worker already serves
+# /healthz, "eager" blocks startup until loaded, "lazy" waits for the first
+# scoring request. Serving never trains a model.
+MODEL_LOADING = os.getenv("MODEL_LOADING", "background")
+
+# Multi-process serving with gunicorn (gunicorn.conf.py): WEB_CONCURRENCY
+# worker processes, one per available CPU when unset. With PRELOAD_MODELS the
+# gunicorn master loads the models once before forking, and the workers share
+# that memory copy-on-write instead of loading their own copies.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+PRELOAD_MODELS = _env_bool("PRELOAD_MODELS", True)
+
+# Directory of the trained risk-tolerance classifier (python -m app.train_investment);
+# defaults to app/models/saved_models/investment_lgbm
+INVESTMENT_MODEL_DIR = os.getenv("INVESTMENT_MODEL_DIR") or None
+
+# Training data: source file (.xls/.xlsx/.csv/.parquet; defaults to the UCI
+# spreadsheet in app/data) and the directory for its columnar .npy cache
+TRAINING_DATA_PATH = os.getenv("TRAINING_DATA_PATH") or None
+DATA_CACHE_DIR = os.getenv("DATA_CACHE_DIR") or None
+
+# Training (python -m app.train): hyperparameter trials, CV folds and worker
+# processes for the search (0 = one per CPU)
+TRAIN_SEARCH_TRIALS = int(os.getenv("TRAIN_SEARCH_TRIALS", "12"))
+TRAIN_CV_FOLDS = int(os.getenv("TRAIN_CV_FOLDS", "5"))
+TRAIN_WORKERS = int(os.getenv("TRAIN_WORKERS", "0"))
+
+# Micro-batching inference dispatcher for /api/credit/score and /api/assessment:
+# requests arriving within DISPATCHER_WINDOW_MS (up to DISPATCHER_MAX_BATCH)
+# are scored together on DISPATCHER_WORKERS inference threads. Requests beyond
+# DISPATCHER_MAX_QUEUE waiting ones get 503.
+DISPATCHER_ENABLED = _env_bool("DISPATCHER_ENABLED", True)
+DISPATCHER_WINDOW_MS = float(os.getenv("DISPATCHER_WINDOW_MS", "2"))
+DISPATCHER_MAX_BATCH = int(os.getenv("DISPATCHER_MAX_BATCH", "64"))
+DISPATCHER_WORKERS = int(os.getenv("DISPATCHER_WORKERS", "1"))
+DISPATCHER_MAX_QUEUE = int(os.getenv("DISPATCHER_MAX_QUEUE", "1024"))
+
+# Prometheus-format metrics at /metrics (request/stage histograms, counters)
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+
+# Model registry: versioned credit model bundles under MODEL_REGISTRY_DIR
+# (defaults to app/models/saved_models/registry) with CURRENT/SHADOW pointer
+# files. Each worker polls the pointers every MODEL_WATCH_INTERVAL_SECONDS
+# (0 = off) and hot-swaps when they change. A shadow model scores
+# SHADOW_SAMPLE_RATE of live traffic off the request path.
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR") or None
+MODEL_WATCH_INTERVAL_SECONDS = float(os.getenv("MODEL_WATCH_INTERVAL_SECONDS", "5"))
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_MAX_QUEUE = int(os.getenv("SHADOW_MAX_QUEUE", "1000"))
+
+# Shared secret for the /api/admin endpoints, sent as X-Admin-Token. The
+# admin endpoints are disabled while it is unset.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+# Asset-management dashboard: PORTFOLIO_DATA_PATH is bulk-scoring output
+# (a `python -m app.batch score` directory, or one Parquet/CSV file of it)
+# loaded into the portfolio store at startup. Customers are keyed by
+# PORTFOLIO_ID_COLUMN; PORTFOLIO_VALUE_COLUMN holds their portfolio value.
+PORTFOLIO_DATA_PATH = os.getenv("PORTFOLIO_DATA_PATH") or None
+PORTFOLIO_ID_COLUMN = os.getenv("PORTFOLIO_ID_COLUMN", "APPLICANT_ID")
+PORTFOLIO_VALUE_COLUMN = os.getenv("PORTFOLIO_VALUE_COLUMN", "PORTFOLIO_VALUE")
+
+# Applicant store: every applicant scored by the API is written to a SQLite
+# database at APPLICANT_STORE_PATH (defaults to app/data/applicants.db) for
+# the dashboard's /api/applicants search. A background writer commits queued
+# results every APPLICANT_WRITE_INTERVAL_MS or APPLICANT_WRITE_BATCH rows;
+# beyond APPLICANT_WRITE_MAX_QUEUE queued batches, results are not stored.
+APPLICANT_STORE_ENABLED = _env_bool("APPLICANT_STORE_ENABLED", True)
+APPLICANT_STORE_PATH = os.getenv("APPLICANT_STORE_PATH") or None
+APPLICANT_WRITE_BATCH = int(os.getenv("APPLICANT_WRITE_BATCH", "5000"))
+APPLICANT_WRITE_INTERVAL_MS = float(os.getenv("APPLICANT_WRITE_INTERVAL_MS", "200"))
+APPLICANT_WRITE_MAX_QUEUE = int(os.getenv("APPLICANT_WRITE_MAX_QUEUE", "10000"))
+
+# Drift monitoring at /api/monitoring/drift: every scored row updates per-feature
+# sketches that are compared with the live model's training reference profile.
+# A feature drifts moderately at PSI >= DRIFT_PSI_WARN and significantly at
+# PSI >= DRIFT_PSI_ALERT; no status is given before DRIFT_MIN_ROWS rows.
+DRIFT_MONITOR_ENABLED = _env_bool("DRIFT_MONITOR_ENABLED", True)
+DRIFT_MIN_ROWS = int(os.getenv("DRIFT_MIN_ROWS", "500"))
+DRIFT_PSI_WARN = float(os.getenv("DRIFT_PSI_WARN", "0.1"))
+DRIFT_PSI_ALERT = float(os.getenv("DRIFT_PSI_ALERT", "0.25"))
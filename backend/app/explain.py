@@ -0,0 +1,32 @@
+"""
+Precomputes the global explanations served at /api/credit/explainability/global:
+
+    python -m app.explain [--version V] [--chunk-size N] [--workers N]
+
+SHAP values for every training row are computed in parallel chunks and kept as
+memory-mapped arrays next to the model bundle, then summarized (global
+importance, per-risk-tier summaries, dependence-curve bins). python -m app.train
+runs this for each newly trained version.
+"""
+import argparse
+from app.config import TRAIN_WORKERS
+from app.services.explainability import DEFAULT_CHUNK_SIZE
+from app.services.scoring import scoring_service
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m app.explain", description="Precompute global SHAP explanations")
+    parser.add_argument("--version", help="Registered model version (default: the model the API would serve)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per SHAP chunk")
+    parser.add_argument("--workers", type=int, default=TRAIN_WORKERS, help="SHAP processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+
+    if args.version is None and not scoring_service.load():
+        raise SystemExit(scoring_service.load_error)
+    summary = scoring_service.build_global_explanations(args.version, args.chunk_size, args.workers or None)
+    top = ", ".join(f"{item['feature']} {item['mean_abs_shap']:.4f}" for item in summary["global_importance"][:5])
+    print(f"Top features by mean |SHAP|: {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,81 @@
-from fastapi import FastAPI, HTTPException
+import gc
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-import xgboost as xgb
-import numpy as np
-import pandas as pd
-import os
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.api import credit, financial_health, asset_management, assessment, system, admin, applicants, monitoring
+from app.config import MODEL_LOADING, PORTFOLIO_DATA_PATH
+from app.services.scoring import scoring_service, ModelNotReadyError
+from app.services.dispatcher import inference_dispatcher, DispatcherOverloadedError
+from app.services.portfolio import portfolio_store
+from app.services.metrics import metrics, RequestMetricsMiddleware, TimedJSONResponse
+
+# Set by preload() in a gunicorn master; its forked workers skip their own loading
+_preloaded = False
+
+
+def preload():
+    """
+    Loads the credit model and the portfolio data in the gunicorn master,
+    before it forks the workers (gunicorn.conf.py). The workers inherit the
+    loaded booster, the compiled tree arrays and the TreeSHAP tables, and share
+    their pages copy-on-write as long as nobody writes to them.
+    """
+    global _preloaded
+    import xgboost as xgb
+
+    # A single OpenMP thread for the warm-up predictions: a thread pool
+    # created here would not exist in the forked workers.
+    with xgb.config_context(nthread=1):
+        scoring_service.load()
+    # Threads do not survive fork(); the lifespan restarts the shadow scorer in each worker
+    scoring_service.shadow.stop()
+    if PORTFOLIO_DATA_PATH:
+        portfolio_store.load(PORTFOLIO_DATA_PATH)
+    _preloaded = True
+    # Keep the collector from touching (and so copying) the preloaded objects in every worker
+    gc.collect()
+    gc.freeze()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the credit model without blocking worker start. Models are only
+    ever loaded from disk here; training runs offline via `python -m app.train`
+    and new registry versions are hot-swapped in by the registry watcher.
+    """
+    if MODEL_LOADING == "eager":
+        await run_in_threadpool(scoring_service.load)
+    elif MODEL_LOADING == "background":
+        threading.Thread(target=scoring_service.load, name="model-loader", daemon=True).start()
+    # "lazy": the first scoring request loads the model
+    if scoring_service.shadow.model is not None:
+        scoring_service.shadow.start()
+    if PORTFOLIO_DATA_PATH and not _preloaded:
+        # Already-scored data; the dashboard endpoints fill in as it loads
+        threading.Thread(target=portfolio_store.load, args=(PORTFOLIO_DATA_PATH,),
+                         name="portfolio-loader", daemon=True).start()
+    inference_dispatcher.start()
+    scoring_service.applicants.start()
+    scoring_service.watch_registry()
+    yield
+    scoring_service.stop_watching()
+    scoring_service.shadow.stop()
+    inference_dispatcher.stop()
+    # After the dispatcher, so the last scored batches are written
+    scoring_service.applicants.stop()
 
-# Import existing routers if they exist/work, otherwise we can comment them out if they are broken
-# relying on the user's existing imports from the read:
-from app.api import credit, financial_health, asset_management
 
 app = FastAPI(
     title="Sycamore Credit & Asset Intelligence Platform",
     description="Production-grade Fintech ML Platform with XGBoost Integration",
-    version="1.0.1"
+    version="1.0.1",
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse
 )
 
 # CORS
@@ -25,82 +86,57 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMetricsMiddleware)
+
+@app.exception_handler(ModelNotReadyError)
+def model_not_ready_handler(request: Request, exc: ModelNotReadyError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+@app.exception_handler(DispatcherOverloadedError)
+def dispatcher_overloaded_handler(request: Request, exc: DispatcherOverloadedError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
 
 # Routes
 app.include_router(credit.router, prefix="/api/credit", tags=["Credit"])
 app.include_router(financial_health.router, prefix="/api/financial-health", tags=["Financial Health"])
 app.include_router(asset_management.router, prefix="/api/asset-management", tags=["Asset Management"])
+app.include_router(assessment.router, prefix="/api/assessment", tags=["Assessment"])
+app.include_router(system.router, prefix="/api/system", tags=["System"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(applicants.router, prefix="/api/applicants", tags=["Applicants"])
+app.include_router(monitoring.router, prefix="/api/monitoring", tags=["Monitoring"])
 
 @app.get("/")
 def health_check():
     return {"status": "healthy", "service": "Sycamore Backend", "version": "1.0.1"}
 
-# --- XGBoost Demo Integration ---
-
-class PredictionInput(BaseModel):
-    features: List[float]
-
-class PredictionOutput(BaseModel):
-    prediction: float
+@app.get("/healthz", tags=["Probes"])
+def liveness():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
 
-# Placeholder for a loaded model
-model = None
+@app.get("/readyz", tags=["Probes"])
+def readiness():
+    """Readiness: the credit model is loaded and scoring requests can be served."""
+    if scoring_service.ready:
+        return {"status": "ready", "model_version": scoring_service.model_version}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "unavailable" if scoring_service.load_error else "loading",
+                 "detail": scoring_service.load_error}
+    )
 
-@app.on_event("startup")
-def load_model():
-    """
-    On startup, we can verify XGBoost is working by training a dummy model 
-    or loading one from disk.
-    """
-    global model
-    try:
-        # 1. verify we can import and use xgboost
-        print("Verifying XGBoost installation...")
-        
-        # Create dummy data
-        X = np.array([[1, 2], [3, 4], [5, 6], [7, 8]])
-        y = np.array([0, 0, 1, 1])
-        dtrain = xgb.DMatrix(X, label=y)
-        
-        # Train a dummy model
-        params = {'objective': 'binary:logistic', 'eval_metric': 'logloss'}
-        bst = xgb.train(params, dtrain, num_boost_round=5)
-        
-        # Set this as our global "model" for the demo
-        model = bst
-        print("XGBoost verification successful! Dummy model loaded.")
-        
-        # Save model to disk to prove we can (optional)
-        model.save_model("model.json")
-        
-    except Exception as e:
-        print(f"Error initializing XGBoost: {e}")
-        # In a real app, you might want to raise error or just log it
-        pass
-
-@app.post("/api/predict-demo", response_model=PredictionOutput, tags=["Demo"])
-def predict_demo(input_data: PredictionInput):
-    """
-    Sample prediction endpoint using the verified XGBoost model.
-    Expects a list of features (must be length 2 for this dummy model).
-    """
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    
-    if len(input_data.features) != 2:
-        raise HTTPException(status_code=400, detail="Dummy model expects exactly 2 features")
-        
-    try:
-        data = np.array([input_data.features])
-        dtest = xgb.DMatrix(data)
-        prediction = model.predict(dtest)[0]
-        return {"prediction": float(prediction)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/metrics", tags=["Probes"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Request, scoring-stage, cache and dispatcher metrics in Prometheus text format (this worker only)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/api/xgboost-info", tags=["Demo"])
 def xgboost_info():
     """Returns version info to confirm libraries are present."""
+    import xgboost as xgb
+    import numpy as np
+    import pandas as pd
     return {
         "xgboost_version": xgb.__version__,
         "numpy_version": np.__version__,
@@ -1,69 +1,224 @@
-import xgboost as xgb
-import shap
 import pickle
 import os
-import pandas as pd
+import json
+import hashlib
+from datetime import datetime, timezone
 import numpy as np
+from app.models.tree_engine import CompiledTreeEnsemble
+from app.models.tree_shap import FastTreeShap
+
+# Inference engines: "xgboost" calls XGBClassifier.predict_proba, "compiled"
+# scores with the booster's trees exported to NumPy arrays.
+INFERENCE_ENGINES = ("xgboost", "compiled")
+# Maximum allowed |compiled - predict_proba| on the probe rows checked at load
+COMPILED_TOLERANCE = 1e-6
+# The compiled engine targets per-request scoring; above this many rows the
+# multithreaded XGBoost predictor is faster.
+COMPILED_MAX_ROWS = 64
+# Explanation modes: "exact" runs shap.TreeExplainer, "fast" uses the
+# precomputed TreeSHAP tables (falling back to exact when unavailable).
+EXPLANATION_MODES = ("fast", "exact")
+# Maximum allowed |sum(SHAP) + expected_value - margin| for fast TreeSHAP
+FAST_SHAP_TOLERANCE = 1e-4
+# Risk tiers by probability of default: <= 0.25 LOW, <= 0.55 MEDIUM, else HIGH
+DEFAULT_RISK_TIER_THRESHOLDS = [0.25, 0.55]
+
+# Artifact bundle: the booster in XGBoost's native UBJSON format plus a JSON
+# manifest. Bump ARTIFACT_FORMAT_VERSION on incompatible layout changes.
+ARTIFACT_FORMAT_VERSION = 1
+BUNDLE_MODEL_FILE = 'model.ubj'
+BUNDLE_MANIFEST_FILE = 'manifest.json'
 
 class CreditScoringModel:
-    def __init__(self, model_path: str, explainer_path: str):
+    def __init__(self, model_path: str, explainer_path: str, engine: str = "xgboost", bundle_dir: str = None):
+        """
+        bundle_dir holds the versioned artifact bundle written by save(). The
+        pickles at model_path/explainer_path are only read as a fallback for
+        models saved before the bundle format existed.
+        """
+        if engine not in INFERENCE_ENGINES:
+            raise ValueError(f"Unknown inference engine '{engine}', expected one of {INFERENCE_ENGINES}")
         self.model_path = model_path
         self.explainer_path = explainer_path
+        self.bundle_dir = bundle_dir or os.path.splitext(model_path)[0]
+        self.engine = engine
         self.model = None
         self.explainer = None
         self.features = None
+        self.risk_tier_thresholds = list(DEFAULT_RISK_TIER_THRESHOLDS)
+        self.metadata = {}
+        self.compiled = None
+        self.fast_explainer = None
+        # Content hash of the loaded booster; changes whenever load()/set_model() swaps the model
+        self.version = None
+        self._listeners = []
         
-    def train(self, X: pd.DataFrame, y: pd.Series, feature_names: list, params: dict = None):
-        if params is None:
-            params = {
-                'n_estimators': 100, 
-                'max_depth': 4, 
-                'learning_rate': 0.1, 
-                'objective': 'binary:logistic',
-                'random_state': 42
-            }
-            
-        self.model = xgb.XGBClassifier(**params)
-        self.model.fit(X, y)
+    def set_model(self, model, feature_names: list, metadata: dict):
+        """Installs a fitted XGBClassifier, then compiles, versions and saves it."""
+        self.model = model
         self.features = feature_names
-        
-        # Initialize Explainer
-        # TreeExplainer is best for XGBoost
-        self.explainer = shap.TreeExplainer(self.model)
+        self.metadata = metadata
+        # TreeExplainer is built from the booster on first exact explanation
+        self.explainer = None
+        self._compile()
+        self._set_version()
         
         self.save()
         
-    def save(self):
-        with open(self.model_path, 'wb') as f:
-            pickle.dump({'model': self.model, 'features': self.features}, f)
-        
-        with open(self.explainer_path, 'wb') as f:
-            pickle.dump(self.explainer, f)
+    def save(self, bundle_dir: str = None):
+        """
+        Writes the artifact bundle: model.ubj, then manifest.json with its
+        checksum. bundle_dir defaults to the model's own bundle_dir.
+        """
+        bundle_dir = bundle_dir or self.bundle_dir
+        os.makedirs(bundle_dir, exist_ok=True)
+        model_file = os.path.join(bundle_dir, BUNDLE_MODEL_FILE)
+        # Keep the .ubj extension so XGBoost picks the format from the name
+        tmp_model = os.path.splitext(model_file)[0] + '.tmp.ubj'
+        self.model.save_model(tmp_model)
+        with open(tmp_model, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'model_file': BUNDLE_MODEL_FILE,
+            'sha256': checksum,
+            'model_version': self.version,
+            'features': self.features,
+            'thresholds': {'risk_tier': self.risk_tier_thresholds},
+            'training': self.metadata
+        }
+        manifest_file = os.path.join(bundle_dir, BUNDLE_MANIFEST_FILE)
+        with open(manifest_file + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        # Model first, manifest last: a reader never sees a manifest whose
+        # checksum does not match the model next to it.
+        os.replace(tmp_model, model_file)
+        os.replace(manifest_file + '.tmp', manifest_file)
             
     def load(self):
-        if not os.path.exists(self.model_path):
+        if os.path.exists(os.path.join(self.bundle_dir, BUNDLE_MANIFEST_FILE)):
+            self._load_bundle()
+        elif os.path.exists(self.model_path):
+            print(f"No model bundle at {self.bundle_dir}. Falling back to pickle {self.model_path}.")
+            self._load_pickle()
+        else:
             return False
-            
+        
+        self._compile()
+        self._set_version()
+        return True
+
+    def _load_bundle(self):
+        with open(os.path.join(self.bundle_dir, BUNDLE_MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get('format_version', 0) > ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Model bundle format {manifest['format_version']} is newer than supported "
+                f"({ARTIFACT_FORMAT_VERSION})"
+            )
+
+        model_file = os.path.join(self.bundle_dir, manifest['model_file'])
+        with open(model_file, 'rb') as f:
+            raw = f.read()
+        if hashlib.sha256(raw).hexdigest() != manifest['sha256']:
+            raise ValueError(f"Checksum mismatch for {model_file}")
+
+        import xgboost as xgb
+        self.model = xgb.XGBClassifier()
+        self.model.load_model(bytearray(raw))
+        self.features = manifest['features']
+        self.risk_tier_thresholds = manifest.get('thresholds', {}).get('risk_tier', DEFAULT_RISK_TIER_THRESHOLDS)
+        self.metadata = manifest.get('training', {})
+        # Rebuilt from the booster on first exact explanation instead of unpickled
+        self.explainer = None
+
+    def _load_pickle(self):
         with open(self.model_path, 'rb') as f:
             data = pickle.load(f)
             self.model = data['model']
             self.features = data['features']
             
+        self.explainer = None
         if os.path.exists(self.explainer_path):
             with open(self.explainer_path, 'rb') as f:
                 self.explainer = pickle.load(f)
-        
-        return True
+        self.metadata = {'source': os.path.basename(self.model_path)}
+
+    def on_change(self, callback):
+        """Registers callback(version), called whenever load() or train() changes the model."""
+        self._listeners.append(callback)
+
+    def _set_version(self):
+        version = hashlib.sha256(bytes(self.model.get_booster().save_raw('ubj'))).hexdigest()[:16]
+        if version == self.version:
+            return
+        self.version = version
+        for callback in self._listeners:
+            callback(version)
+
+    def _compile(self):
+        """Exports the booster's trees for the compiled engine and fast TreeSHAP."""
+        self.compiled = None
+        self.fast_explainer = None
+        try:
+            trees = CompiledTreeEnsemble.from_booster(self.model.get_booster())
+        except ValueError as e:
+            print(f"Tree export unavailable ({e}). Using XGBoost predict_proba and shap.")
+            return
+
+        probe = trees.probe_rows(len(self.features))
+        try:
+            fast_explainer = FastTreeShap(trees, len(self.features))
+            # SHAP values must add up to the margin of the exported trees
+            gap = np.max(np.abs(
+                fast_explainer.shap_values(probe).sum(axis=1) + fast_explainer.expected_value
+                - trees.predict_margin(probe)
+            ))
+            if gap > FAST_SHAP_TOLERANCE:
+                print(f"Fast TreeSHAP is not additive (gap {gap:.2e}). Using shap.TreeExplainer.")
+            else:
+                self.fast_explainer = fast_explainer
+        except ValueError as e:
+            print(f"Fast TreeSHAP unavailable ({e}). Using shap.TreeExplainer.")
+
+        if self.engine != "compiled":
+            return
+        # Guard against export mismatches: the compiled engine must reproduce
+        # predict_proba before it is used for scoring.
+        diff = np.max(np.abs(trees.predict_proba(probe) - self.model.predict_proba(probe)[:, 1]))
+        if diff > COMPILED_TOLERANCE:
+            print(f"Compiled inference differs from XGBoost by {diff:.2e}. Using XGBoost predict_proba.")
+            return
+        self.compiled = trees
     
-    def predict(self, X: pd.DataFrame):
+    def predict(self, X):
+        """
+        Returns Prob(Default) per row. X is a DataFrame, or a 2D array whose
+        columns already follow self.features.
+        """
         # Ensure column order matches training
-        X_ordered = X[self.features]
+        X_ordered = _select_features(X, self.features)
+        if self.compiled is not None and len(X_ordered) <= COMPILED_MAX_ROWS:
+            return self.compiled.predict_proba(np.asarray(X_ordered, dtype=np.float32))
         # predict_proba returns [prob_0, prob_1]
         probs = self.model.predict_proba(X_ordered)
         return probs[:, 1] # Return Prob(Default)
     
-    def explain(self, X: pd.DataFrame):
-        X_ordered = X[self.features]
+    def explain(self, X, mode: str = "exact"):
+        return self.explain_batch(X, mode)[0]
+
+    def explain_batch(self, X, mode: str = "exact"):
+        """Returns SHAP values for every row of X as an (n_rows, n_features) array."""
+        if mode not in EXPLANATION_MODES:
+            raise ValueError(f"Unknown explanation mode '{mode}', expected one of {EXPLANATION_MODES}")
+        X_ordered = _select_features(X, self.features)
+        if mode == "fast" and self.fast_explainer is not None:
+            return self.fast_explainer.shap_values(np.asarray(X_ordered, dtype=np.float32))
+
+        if self.explainer is None:
+            import shap
+            self.explainer = shap.TreeExplainer(self.model)
         shap_values = self.explainer.shap_values(X_ordered)
         
         # Handling shape differences in shap versions/models
@@ -74,7 +229,21 @@ class CreditScoringModel:
         else:
             sv = shap_values
             
-        if len(sv.shape) > 1:
-            # multiple samples
-            return sv[0]
-        return sv
+        return np.atleast_2d(sv)
+
+
+def _select_features(X, features: list):
+    # DataFrames are reordered by column name; arrays must already follow `features`
+    return X[features] if hasattr(X, 'columns') else X
+
+
+if __name__ == "__main__":
+    # Exports a pickled model to the artifact bundle format:
+    #   python -m app.models.credit_model
+    from app.services.scoring import CREDIT_MODEL_PATH, EXPLAINER_PATH, CREDIT_BUNDLE_DIR
+    model = CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH, bundle_dir=CREDIT_BUNDLE_DIR)
+    model._load_pickle()
+    model._set_version()
+    model.metadata['exported_at'] = datetime.now(timezone.utc).isoformat()
+    model.save()
+    print(f"Exported {CREDIT_MODEL_PATH} to {CREDIT_BUNDLE_DIR} (version {model.version})")
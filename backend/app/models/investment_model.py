@@ -1,9 +1,288 @@
+import hashlib
+import itertools
+import json
+import os
+from datetime import datetime, timezone
+import numpy as np
+from app.services.feature_engineering import FEATURE_COLUMNS, FEATURE_INDEX
+
+RISK_TOLERANCES = ["LOW", "MEDIUM", "HIGH"]
+INVESTMENT_HORIZONS = ["SHORT", "MEDIUM", "LONG"]
+INVESTOR_PERSONAS = ["Capital Preservation", "Income Seeker", "Balanced Investor", "Growth Focused"]
+
+# Allocation keys and the Sycamore fund each maps to on the dashboard:
+# product type, expected annual return range in percent, and risk level
+# (conservative / moderate / aggressive) as listed in its product catalog.
+PRODUCTS = {
+    "money_market": {"product_type": "Money Market", "expected_return": (8, 11), "risk_level": "conservative"},
+    "fixed_income": {"product_type": "Fixed Income", "expected_return": (12, 15), "risk_level": "conservative"},
+    "equities": {"product_type": "Equities", "expected_return": (15, 25), "risk_level": "aggressive"},
+}
+# Portfolio risk score (0-100) is the allocation-weighted score of each product's risk level
+RISK_LEVEL_SCORES = {"conservative": 0, "moderate": 50, "aggressive": 100}
+PRODUCT_KEYS = list(PRODUCTS)
+
+# Capital-market assumptions of the allocation optimizer, per PRODUCTS key:
+# expected annual return (the catalog range midpoint), volatility and correlations
+EXPECTED_RETURNS = np.array([sum(PRODUCTS[k]["expected_return"]) / 200 for k in PRODUCT_KEYS])
+VOLATILITIES = np.array([0.005, 0.08, 0.20])
+CORRELATIONS = np.array([
+    [1.0, 0.0, 0.0],
+    [0.0, 1.0, 0.2],
+    [0.0, 0.2, 1.0],
+])
+COVARIANCE = CORRELATIONS * np.outer(VOLATILITIES, VOLATILITIES)
+# Risk aversion of the mean-variance objective at risk score 0 (most cautious)
+# and 1, interpolated geometrically, then scaled by investment horizon
+MAX_RISK_AVERSION = 30.0
+MIN_RISK_AVERSION = 4.0
+HORIZON_RISK_AVERSION = {"SHORT": 1.5, "MEDIUM": 1.0, "LONG": 0.75}
+# Allocations are solved once per risk-score bucket and horizon
+RISK_BUCKETS = 20
+# Risk score of each tolerance class: the model's expected score is P @ TOLERANCE_SCORES
+TOLERANCE_SCORES = np.array([0.0, 0.5, 1.0])
+
+# Learned risk tolerance: a LightGBM classifier over the engineered features,
+# the credit score and the financial health score. PROFILE_FEATURES are the
+# ones /api/asset-management/recommendation receives; training also sees
+# copies of every row with the other features missing, so the model can
+# score those requests.
+INVESTMENT_FEATURES = FEATURE_COLUMNS + ["credit_score", "financial_health_score"]
+PROFILE_FEATURES = ["LIMIT_BAL", "AGE", "credit_score", "financial_health_score"]
+INVESTMENT_INDEX = {name: i for i, name in enumerate(INVESTMENT_FEATURES)}
+DEFAULT_PARAMS = {
+    'objective': 'multiclass',
+    'num_class': len(RISK_TOLERANCES),
+    'num_leaves': 15,
+    'learning_rate': 0.1,
+    'min_data_in_leaf': 50,
+    'verbosity': -1,
+    'seed': 42
+}
+MAX_ROUNDS = 500
+EARLY_STOPPING_ROUNDS = 20
+
+# Artifact bundle: the booster in LightGBM's text format plus a JSON manifest
+ARTIFACT_FORMAT_VERSION = 1
+BUNDLE_MODEL_FILE = 'model.txt'
+BUNDLE_MANIFEST_FILE = 'manifest.json'
+
+
+def optimize_allocations(risk_aversion: np.ndarray) -> np.ndarray:
+    """
+    Long-only, fully invested mean-variance weights for a batch of investors:
+    row i maximizes mu'w - risk_aversion[i] / 2 * w'Cov w subject to w >= 0
+    and sum(w) = 1. Returns an (n, len(PRODUCT_KEYS)) array of fractions.
+
+    The optimum lies on one support (set of held products). On a fixed
+    support the equality-constrained solution is a + b / risk_aversion, with
+    a and b shared by every investor, so each of the 2^k - 1 supports is
+    solved for the whole batch at once and the best feasible one is kept.
+    """
+    lam = np.asarray(risk_aversion, dtype=np.float64).reshape(-1, 1)
+    n_assets = len(EXPECTED_RETURNS)
+    best = np.full(len(lam), -np.inf)
+    weights = np.zeros((len(lam), n_assets))
+    for size in range(1, n_assets + 1):
+        for support in map(list, itertools.combinations(range(n_assets), size)):
+            inverse = np.linalg.inv(COVARIANCE[np.ix_(support, support)])
+            inv_ones = inverse.sum(axis=1)
+            inv_mu = inverse @ EXPECTED_RETURNS[support]
+            base = inv_ones / inv_ones.sum()
+            tilt = inv_mu - inv_mu.sum() / inv_ones.sum() * inv_ones
+            w = np.zeros((len(lam), n_assets))
+            w[:, support] = base + tilt / lam
+            objective = w @ EXPECTED_RETURNS - lam[:, 0] / 2 * np.einsum('ij,jk,ik->i', w, COVARIANCE, w)
+            better = (w[:, support] >= -1e-12).all(axis=1) & (objective > best)
+            weights[better] = w[better]
+            best[better] = objective[better]
+    return np.clip(weights, 0.0, None)
+
+
+def rules_risk_tolerance(health_scores: np.ndarray) -> np.ndarray:
+    """InvestmentModel.predict_risk_tolerance over an array, as indices into RISK_TOLERANCES."""
+    return np.digitize(health_scores, [50, 75])
+
+
+def _percentages(weights: np.ndarray) -> np.ndarray:
+    # One decimal place, adjusted on the largest holding so every row sums to exactly 100
+    pct = np.round(weights * 100, 1)
+    rows = np.arange(len(pct))
+    largest = pct.argmax(axis=1)
+    pct[rows, largest] = np.round(pct[rows, largest] + 100 - pct.sum(axis=1), 1)
+    return pct
+
+
 class InvestmentModel:
     """
     Asset Management Intelligence Logic.
-    Currently uses deterministic rules based on Credit and Financial Health.
-    Future versions can replace rules with LightGBM models trained on outcomes.
+
+    Risk tolerance comes from a LightGBM classifier trained offline
+    (`python -m app.train_investment`) over INVESTMENT_FEATURES. Until one is
+    saved in bundle_dir, the financial-health rules below decide it. The
+    investment horizon and persona stay rule-based.
+
+    Allocations come from optimize_allocations, solved once per risk-score
+    bucket and horizon when the model is created: a recommendation is a
+    table lookup, whatever the batch size.
     """
+
+    def __init__(self, bundle_dir: str = None):
+        self.bundle_dir = bundle_dir
+        self.model = None
+        self.features = INVESTMENT_FEATURES
+        self.metadata = {}
+        # Content hash of the loaded booster; None while the rules are used
+        self.version = None
+        bucket_scores = (np.arange(RISK_BUCKETS) + 0.5) / RISK_BUCKETS
+        aversion = np.exp(np.log(MAX_RISK_AVERSION) + bucket_scores * np.log(MIN_RISK_AVERSION / MAX_RISK_AVERSION))
+        horizon_scale = np.array([HORIZON_RISK_AVERSION[h] for h in INVESTMENT_HORIZONS])
+        weights = optimize_allocations(np.outer(aversion, horizon_scale).ravel())
+        # (RISK_BUCKETS, len(INVESTMENT_HORIZONS), len(PRODUCT_KEYS)) percentages
+        self.allocation_table = _percentages(weights).reshape(RISK_BUCKETS, len(INVESTMENT_HORIZONS), -1)
+        # The same table as response dicts, shared by every recommendation in a bucket
+        self._allocations = [
+            [dict(zip(PRODUCT_KEYS, row)) for row in bucket.tolist()] for bucket in self.allocation_table
+        ]
+
+    def load(self) -> bool:
+        """Loads the trained classifier from bundle_dir; False (rules in use) if there is none."""
+        manifest_file = os.path.join(self.bundle_dir or '', BUNDLE_MANIFEST_FILE)
+        if not os.path.exists(manifest_file):
+            return False
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+        if manifest.get('format_version', 0) > ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Investment model bundle format {manifest['format_version']} is newer than supported "
+                f"({ARTIFACT_FORMAT_VERSION})"
+            )
+        if manifest['features'] != INVESTMENT_FEATURES or manifest['classes'] != RISK_TOLERANCES:
+            raise ValueError("Investment model was trained on a different feature or class layout")
+        with open(os.path.join(self.bundle_dir, manifest['model_file'])) as f:
+            text = f.read()
+        if hashlib.sha256(text.encode()).hexdigest() != manifest['sha256']:
+            raise ValueError(f"Checksum mismatch for investment model in {self.bundle_dir}")
+
+        import lightgbm as lgb
+        self.model = lgb.Booster(model_str=text)
+        self.metadata = manifest.get('training', {})
+        self.version = manifest['model_version']
+        return True
+
+    def train(self, X: np.ndarray, y: np.ndarray, params: dict = None, labels: str = None) -> dict:
+        """
+        Fits the classifier on X (rows in INVESTMENT_FEATURES order) and y
+        (indices into RISK_TOLERANCES), early-stopped on a stratified 20%
+        hold-out, then saves it to bundle_dir. labels names the label source
+        for the metadata. Returns the training metadata.
+        """
+        import lightgbm as lgb
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score, log_loss
+
+        params = {**DEFAULT_PARAMS, **(params or {})}
+        X_train, X_holdout, y_train, y_holdout = train_test_split(
+            X, y, test_size=0.2, stratify=y, random_state=params['seed']
+        )
+        X_train, y_train = _with_profile_copies(X_train, y_train)
+        X_holdout, y_holdout = _with_profile_copies(X_holdout, y_holdout)
+        train_set = lgb.Dataset(X_train, y_train, feature_name=INVESTMENT_FEATURES, free_raw_data=True)
+        holdout_set = lgb.Dataset(X_holdout, y_holdout, reference=train_set)
+        booster = lgb.train(
+            params, train_set, num_boost_round=MAX_ROUNDS, valid_sets=[holdout_set],
+            callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)]
+        )
+        # Keep only the trees up to the best iteration
+        self.model = lgb.Booster(model_str=booster.model_to_string(num_iteration=booster.best_iteration))
+        probs = self.model.predict(X_holdout)
+        self.metadata = {
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+            'n_samples': int(len(y)),
+            'labels': labels,
+            'class_shares': (np.bincount(y, minlength=len(RISK_TOLERANCES)) / len(y)).round(4).tolist(),
+            'params': params,
+            'num_trees': self.model.current_iteration(),
+            'holdout_accuracy': round(float(accuracy_score(y_holdout, probs.argmax(axis=1))), 4),
+            'holdout_logloss': round(float(log_loss(y_holdout, probs, labels=range(len(RISK_TOLERANCES)))), 4),
+            'lightgbm_version': lgb.__version__
+        }
+        self.save()
+        return self.metadata
+
+    def save(self):
+        os.makedirs(self.bundle_dir, exist_ok=True)
+        text = self.model.model_to_string()
+        checksum = hashlib.sha256(text.encode()).hexdigest()
+        self.version = checksum[:16]
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'model_file': BUNDLE_MODEL_FILE,
+            'sha256': checksum,
+            'model_version': self.version,
+            'features': INVESTMENT_FEATURES,
+            'classes': RISK_TOLERANCES,
+            'training': self.metadata
+        }
+        model_file = os.path.join(self.bundle_dir, BUNDLE_MODEL_FILE)
+        manifest_file = os.path.join(self.bundle_dir, BUNDLE_MANIFEST_FILE)
+        with open(model_file + '.tmp', 'w') as f:
+            f.write(text)
+        with open(manifest_file + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        # Model first, manifest last, as in the credit model bundle
+        os.replace(model_file + '.tmp', model_file)
+        os.replace(manifest_file + '.tmp', manifest_file)
+
+    def risk_scores(self, X: np.ndarray):
+        """
+        Risk tolerance per row of X (INVESTMENT_FEATURES order, NaN where
+        unknown) as (tolerance indices, risk scores in [0, 1]).
+        """
+        model = self.model
+        if model is None:
+            tolerance = rules_risk_tolerance(X[:, INVESTMENT_INDEX["financial_health_score"]])
+            return tolerance, TOLERANCE_SCORES[tolerance]
+        probs = model.predict(X)
+        return probs.argmax(axis=1), probs @ TOLERANCE_SCORES
+
+    def recommend_batch(self, X: np.ndarray) -> dict:
+        """
+        Recommendations for every row of X (INVESTMENT_FEATURES order, NaN
+        where unknown). Returns per-row arrays: risk_tolerance and
+        investment_horizon as indices into RISK_TOLERANCES and
+        INVESTMENT_HORIZONS, risk_bucket, and allocation as percentages
+        (n_rows, len(PRODUCT_KEYS)).
+        """
+        tolerance, score = self.risk_scores(X)
+        bucket = np.minimum((score * RISK_BUCKETS).astype(int), RISK_BUCKETS - 1)
+        # age < 35 LONG, < 50 MEDIUM, else SHORT, as in predict_investment_horizon
+        horizon = len(INVESTMENT_HORIZONS) - 1 - np.digitize(X[:, INVESTMENT_INDEX["AGE"]], [35, 50])
+        return {
+            "risk_tolerance": tolerance,
+            "investment_horizon": horizon,
+            "risk_bucket": bucket,
+            "allocation": self.allocation_table[bucket, horizon]
+        }
+
+    def recommend(self, profile: dict, features: np.ndarray = None) -> dict:
+        """
+        One recommendation. profile holds the PROFILE_FEATURES; features is
+        the applicant's FEATURE_COLUMNS row when the full application is known.
+        """
+        X = np.full((1, len(INVESTMENT_FEATURES)), np.nan)
+        if features is not None:
+            X[0, :len(FEATURE_COLUMNS)] = features
+        for name in PROFILE_FEATURES:
+            if profile.get(name) is not None:
+                X[0, INVESTMENT_INDEX[name]] = profile[name]
+        result = self.recommend_batch(X)
+        bucket, horizon = int(result["risk_bucket"][0]), int(result["investment_horizon"][0])
+        return {
+            "risk_tolerance": RISK_TOLERANCES[result["risk_tolerance"][0]],
+            "investment_horizon": INVESTMENT_HORIZONS[horizon],
+            "portfolio_allocation": self._allocations[bucket][horizon]
+        }
     
     def predict_risk_tolerance(self, financial_health_score: float) -> str:
         if financial_health_score >= 75:
@@ -21,10 +300,26 @@ class InvestmentModel:
         else:
             return "SHORT"
             
-    def recommend_allocation(self, risk_tolerance: str) -> dict:
+    def recommend_allocation(self, risk_tolerance: str, investment_horizon: str = "MEDIUM") -> dict:
+        """Optimized allocation at a tolerance class's risk score."""
+        score = TOLERANCE_SCORES[RISK_TOLERANCES.index(risk_tolerance)]
+        bucket = min(int(score * RISK_BUCKETS), RISK_BUCKETS - 1)
+        return self._allocations[bucket][INVESTMENT_HORIZONS.index(investment_horizon)]
+
+    def predict_investor_persona(self, risk_tolerance: str, investment_horizon: str) -> str:
         if risk_tolerance == "LOW":
-            return {"money_market": 70, "fixed_income": 30, "equities": 0}
-        elif risk_tolerance == "MEDIUM":
-            return {"money_market": 40, "fixed_income": 40, "equities": 20}
+            return "Capital Preservation"
+        elif investment_horizon == "SHORT":
+            return "Income Seeker"
+        elif risk_tolerance == "HIGH":
+            return "Growth Focused"
         else:
-            return {"money_market": 20, "fixed_income": 40, "equities": 40}
+            return "Balanced Investor"
+
+
+def _with_profile_copies(X: np.ndarray, y: np.ndarray):
+    """Appends a copy of every row with all but PROFILE_FEATURES missing."""
+    masked = np.full_like(X, np.nan)
+    profile = [INVESTMENT_INDEX[name] for name in PROFILE_FEATURES]
+    masked[:, profile] = X[:, profile]
+    return np.vstack([X, masked]), np.concatenate([y, y])
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+from app.models.credit_model import BUNDLE_MANIFEST_FILE
+
+# Registry layout under its root directory:
+#   versions/<model_version>/   one artifact bundle per version (model.ubj, manifest.json, metrics.json)
+#   CURRENT                     version served live
+#   SHADOW                      optional version scored in shadow mode
+# Bundles are immutable once added; promotion and rollback only rewrite the
+# pointer files, each replaced atomically so readers never see a partial write.
+VERSIONS_DIR = 'versions'
+CURRENT_POINTER = 'CURRENT'
+SHADOW_POINTER = 'SHADOW'
+STAGING_PREFIX = '.staging-'
+
+
+class UnknownModelVersionError(KeyError):
+    """Raised when a version is not in the registry."""
+
+
+class ModelRegistry:
+    """Versioned credit model bundles in a local directory, with live and shadow pointers."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.versions_dir = os.path.join(root, VERSIONS_DIR)
+
+    def bundle_dir(self, version: str) -> str:
+        path = os.path.join(self.versions_dir, version)
+        # Versions are path components; reject anything that could escape versions/
+        if os.path.basename(version) != version or version.startswith('.') \
+                or not os.path.exists(os.path.join(path, BUNDLE_MANIFEST_FILE)):
+            raise UnknownModelVersionError(version)
+        return path
+
+    def versions(self) -> list:
+        """Registered versions with their training metadata, newest first."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        current, shadow = self.current(), self.shadow()
+        entries = []
+        for version in os.listdir(self.versions_dir):
+            if version.startswith('.'):
+                continue
+            try:
+                with open(os.path.join(self.versions_dir, version, BUNDLE_MANIFEST_FILE)) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            training = manifest.get('training', {})
+            entries.append({
+                'version': version,
+                'trained_at': training.get('trained_at') or training.get('exported_at'),
+                'holdout_auc': training.get('holdout_auc'),
+                'current': version == current,
+                'shadow': version == shadow
+            })
+        return sorted(entries, key=lambda e: e['trained_at'] or '', reverse=True)
+
+    def staging_dir(self) -> str:
+        """A private directory to save a new bundle into before add() publishes it."""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        return tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=self.versions_dir)
+
+    def add(self, staging_dir: str, version: str) -> str:
+        """Publishes a staged bundle as versions/<version> and returns its directory."""
+        target = os.path.join(self.versions_dir, version)
+        if os.path.exists(target):
+            # Versions are content hashes: the same booster is already registered
+            shutil.rmtree(staging_dir)
+        else:
+            os.rename(staging_dir, target)
+        return target
+
+    def current(self):
+        return self._read_pointer(CURRENT_POINTER)
+
+    def shadow(self):
+        return self._read_pointer(SHADOW_POINTER)
+
+    def set_current(self, version: str):
+        self.bundle_dir(version)
+        self._write_pointer(CURRENT_POINTER, version)
+
+    def set_shadow(self, version: str = None):
+        """Points SHADOW at version, or removes it when version is None."""
+        if version is None:
+            try:
+                os.remove(os.path.join(self.root, SHADOW_POINTER))
+            except FileNotFoundError:
+                pass
+            return
+        self.bundle_dir(version)
+        self._write_pointer(SHADOW_POINTER, version)
+
+    def pointers(self) -> tuple:
+        """(CURRENT, SHADOW), read together for change detection."""
+        return self.current(), self.shadow()
+
+    def _read_pointer(self, name: str):
+        try:
+            with open(os.path.join(self.root, name)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, name: str, version: str):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(version + '\n')
+        os.replace(tmp, path)
@@ -0,0 +1,141 @@
+import json
+import numpy as np
+
+
+class CompiledTreeEnsemble:
+    """
+    In-process inference engine for a binary:logistic XGBoost booster.
+    The trees are exported once into flat NumPy arrays (one entry per node,
+    children stored as global node indices) and rows are scored by walking
+    all trees at once, vectorized across trees and rows.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, default_left, cover, roots, max_depth, base_margin):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.default_left = default_left
+        self.cover = cover
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+
+    @classmethod
+    def from_booster(cls, booster):
+        model = json.loads(booster.save_raw(raw_format='json'))
+        learner = model['learner']
+        objective = learner['objective']['name']
+        if objective != 'binary:logistic':
+            raise ValueError(f"Unsupported objective for compiled inference: {objective}")
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError("Compiled inference only supports the gbtree booster")
+
+        trees = learner['gradient_booster']['model']['trees']
+        # Match XGBClassifier.predict_proba, which stops at best_iteration
+        # when the model was trained with early stopping.
+        best_iteration = booster.attr('best_iteration')
+        if best_iteration is not None:
+            num_parallel = int(learner['gradient_booster']['model']['gbtree_model_param']['num_parallel_tree'])
+            trees = trees[:(int(best_iteration) + 1) * num_parallel]
+
+        feature, threshold, left, right, default_left, cover, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if any(tree['split_type']):
+                raise ValueError("Categorical splits are not supported by compiled inference")
+            lc = np.asarray(tree['left_children'], dtype=np.int32)
+            rc = np.asarray(tree['right_children'], dtype=np.int32)
+            own = np.arange(len(lc), dtype=np.int32)
+            is_leaf = lc == -1
+            # Leaves point at themselves so extra traversal steps are no-ops
+            left.append((np.where(is_leaf, own, lc) + offset).astype(np.intp))
+            right.append((np.where(is_leaf, own, rc) + offset).astype(np.intp))
+            feature.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.intp))
+            # For leaf nodes split_conditions holds the leaf value
+            threshold.append(np.asarray(tree['split_conditions'], dtype=np.float32))
+            default_left.append(np.asarray(tree['default_left'], dtype=bool))
+            cover.append(np.asarray(tree['sum_hessian'], dtype=np.float64))
+            roots.append(offset)
+            max_depth = max(max_depth, _tree_depth(lc, rc))
+            offset += len(lc)
+
+        threshold = np.concatenate(threshold)
+        is_leaf = np.concatenate(left) == np.arange(offset)
+        value = np.where(is_leaf, threshold, 0).astype(np.float32)
+
+        base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+        base_margin = float(np.log(base_score / (1 - base_score)))
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=threshold,
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            value=value,
+            default_left=np.concatenate(default_left),
+            cover=np.concatenate(cover),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            base_margin=base_margin
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def is_leaf(self) -> np.ndarray:
+        return self.left == np.arange(len(self.left))
+
+    def leaf_indices(self, X: np.ndarray) -> np.ndarray:
+        """Global leaf index reached by every row in every tree, shape (n_rows, n_trees)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        row_offset = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        has_missing = np.isnan(flat).any()
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            x = flat.take(row_offset + self.feature.take(node))
+            go_left = x < self.threshold.take(node)
+            if has_missing:
+                go_left = np.where(np.isnan(x), self.default_left.take(node), go_left)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        return node
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        return self.value.take(self.leaf_indices(X)).sum(axis=1, dtype=np.float64) + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probability of the positive class, matching XGBClassifier.predict_proba(X)[:, 1]."""
+        return (1.0 / (1.0 + np.exp(-self.predict_margin(X)))).astype(np.float32)
+
+    def probe_rows(self, n_features: int, n_rows: int = 256, seed: int = 0) -> np.ndarray:
+        """
+        Synthetic rows that land on both sides of the split thresholds, used to
+        check the compiled engine against the booster it was exported from.
+        """
+        rng = np.random.default_rng(seed)
+        is_split = ~self.is_leaf
+        X = rng.normal(size=(n_rows, n_features)).astype(np.float32)
+        for f in range(n_features):
+            cuts = self.threshold[is_split & (self.feature == f)]
+            if len(cuts):
+                picks = rng.choice(cuts, size=n_rows)
+                X[:, f] = picks + rng.choice([-1, 0, 1], size=n_rows) * np.maximum(np.abs(picks), 1) * 1e-3
+        return X
+
+
+def _tree_depth(left, right) -> int:
+    max_depth = 0
+    stack = [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if left[node] == -1:
+            max_depth = max(max_depth, depth)
+        else:
+            stack.append((left[node], depth + 1))
+            stack.append((right[node], depth + 1))
+    return max_depth
@@ -0,0 +1,161 @@
+from math import factorial
+import numpy as np
+from app.models.tree_engine import CompiledTreeEnsemble
+
+# Precomputed tables grow as n_leaves * 2^K * K (K = most distinct features on
+# one root-to-leaf path). Deeper models than this budget allows fall back to
+# shap.TreeExplainer.
+MAX_TABLE_BYTES = 256 * 1024 * 1024
+
+
+class FastTreeShap:
+    """
+    Path-dependent TreeSHAP over the flattened arrays of a CompiledTreeEnsemble.
+
+    For one leaf with distinct path features U, the path-dependent game is
+    v * prod_{j in U} (o_j if j in S else z_j), where z_j is the product of
+    cover ratios of the splits on j and o_j is 1 when the row follows every
+    split on j. The Shapley values of that game only depend on which o_j are
+    1, so they are tabulated per leaf for all 2^|U| patterns when the model
+    loads. Explaining rows then reduces to evaluating path conditions,
+    looking up each leaf's table row and summing into feature columns,
+    vectorized across rows and leaves. Results equal shap.TreeExplainer with
+    feature_perturbation="tree_path_dependent" on the margin (log-odds) scale.
+    """
+
+    def __init__(self, ensemble: CompiledTreeEnsemble, n_features: int):
+        self.n_features = n_features
+        paths = _leaf_paths(ensemble)
+        depth = max((len(steps) for _, steps in paths), default=0)
+        n_leaves = len(paths)
+
+        step_feature = np.zeros((n_leaves, max(depth, 1)), dtype=np.intp)
+        step_threshold = np.zeros((n_leaves, max(depth, 1)), dtype=np.float32)
+        step_left = np.zeros((n_leaves, max(depth, 1)), dtype=bool)
+        step_default_left = np.zeros((n_leaves, max(depth, 1)), dtype=bool)
+        # Bit of the step's distinct-feature slot; 0 marks padding steps
+        step_bit = np.zeros((n_leaves, max(depth, 1)), dtype=np.int64)
+        slot_features, slot_zero = [], []
+        leaf_value = np.empty(n_leaves)
+        leaf_weight = np.empty(n_leaves)
+
+        for i, (leaf, steps) in enumerate(paths):
+            slots, zero = [], []
+            for d, (node, went_left, ratio) in enumerate(steps):
+                f = ensemble.feature[node]
+                if f not in slots:
+                    slots.append(f)
+                    zero.append(1.0)
+                s = slots.index(f)
+                zero[s] *= ratio
+                step_feature[i, d] = f
+                step_threshold[i, d] = ensemble.threshold[node]
+                step_left[i, d] = went_left
+                step_default_left[i, d] = ensemble.default_left[node]
+                step_bit[i, d] = 1 << s
+            slot_features.append(slots)
+            slot_zero.append(zero)
+            leaf_value[i] = ensemble.value[leaf]
+            leaf_weight[i] = np.prod(zero) if zero else 1.0
+
+        self.n_slots = max((len(s) for s in slot_features), default=0)
+        n_patterns = 1 << self.n_slots
+        table_bytes = n_leaves * n_patterns * max(self.n_slots, 1) * 8
+        if table_bytes > MAX_TABLE_BYTES:
+            raise ValueError(
+                f"Fast TreeSHAP tables would need {table_bytes / 2**20:.0f} MB "
+                f"({self.n_slots} distinct features per path)"
+            )
+
+        self.step_feature = step_feature
+        self.step_threshold = step_threshold
+        self.step_left = step_left
+        self.step_default_left = step_default_left
+        self.step_bit = step_bit
+        self.table = _shap_tables(slot_zero, leaf_value, self.n_slots).reshape(n_leaves * n_patterns, -1)
+        self.expected_value = float(leaf_value @ leaf_weight) + ensemble.base_margin
+
+        # Group the used (leaf, slot) entries by feature column so contributions
+        # can be summed per feature with one reduceat.
+        width = max(self.n_slots, 1)
+        entry_feature = np.array([f for slots in slot_features for f in slots], dtype=np.intp)
+        entry_index = np.array(
+            [i * width + s for i, slots in enumerate(slot_features) for s in range(len(slots))], dtype=np.intp
+        )
+        order = np.argsort(entry_feature, kind='stable')
+        self.entry_index = entry_index[order]
+        self.segment_features, self.segment_starts = np.unique(entry_feature[order], return_index=True)
+        self.pattern_offset = np.arange(n_leaves) * n_patterns
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        """SHAP values of shape (n_rows, n_features) in log-odds units."""
+        X = np.asarray(X, dtype=np.float32)
+        x = X[:, self.step_feature]
+        satisfied = (x < self.step_threshold) == self.step_left
+        missing = np.isnan(x)
+        if missing.any():
+            satisfied = np.where(missing, self.step_default_left == self.step_left, satisfied)
+
+        failed = np.bitwise_or.reduce(np.where(satisfied, 0, self.step_bit), axis=2)
+        pattern = ~failed & ((1 << self.n_slots) - 1)
+        contributions = self.table[self.pattern_offset + pattern].reshape(X.shape[0], -1)
+        phi = np.zeros((X.shape[0], self.n_features))
+        if len(self.entry_index):
+            phi[:, self.segment_features] = np.add.reduceat(
+                contributions[:, self.entry_index], self.segment_starts, axis=1
+            )
+        return phi
+
+
+def _leaf_paths(ensemble: CompiledTreeEnsemble) -> list:
+    """(leaf, [(node, went_left, cover_ratio), ...]) for every leaf of every tree."""
+    is_leaf = ensemble.is_leaf
+    paths = []
+    for root in ensemble.roots:
+        stack = [(root, [])]
+        while stack:
+            node, steps = stack.pop()
+            if is_leaf[node]:
+                paths.append((node, steps))
+                continue
+            for child, went_left in ((ensemble.left[node], True), (ensemble.right[node], False)):
+                ratio = ensemble.cover[child] / ensemble.cover[node]
+                stack.append((child, steps + [(node, went_left, ratio)]))
+    return paths
+
+
+def _shap_tables(slot_zero: list, leaf_value: np.ndarray, n_slots: int) -> np.ndarray:
+    """
+    Shapley values of every leaf game for every one-pattern, shape
+    (n_leaves, 2^n_slots, n_slots). Pattern bits above a leaf's own slot count
+    are ignored so all leaves share one pattern index.
+    """
+    n_patterns = 1 << n_slots
+    table = np.zeros((len(slot_zero), n_patterns, max(n_slots, 1)))
+    sizes = np.array([len(z) for z in slot_zero])
+
+    for m in range(1, n_slots + 1):
+        sel = np.flatnonzero(sizes == m)
+        if len(sel) == 0:
+            continue
+        z = np.array([slot_zero[i] for i in sel])                                  # (L, m)
+        o = ((np.arange(1 << m)[:, None] >> np.arange(m)) & 1).astype(np.float64)  # (P, m)
+        weights = np.array([factorial(k) * factorial(m - k - 1) / factorial(m) for k in range(m)])
+
+        phi = np.empty((len(sel), 1 << m, m))
+        for i in range(m):
+            # Coefficients of prod_{j != i} (z_j + o_j t): coef[k] sums the
+            # products over coalitions S of size k.
+            coef = np.zeros((len(sel), 1 << m, m))
+            coef[..., 0] = 1
+            for j in range(m):
+                if j == i:
+                    continue
+                shifted = np.zeros_like(coef)
+                shifted[..., 1:] = coef[..., :-1] * o[None, :, j, None]
+                coef = coef * z[:, None, j, None] + shifted
+            phi[..., i] = (o[None, :, i] - z[:, None, i]) * (coef @ weights)
+
+        phi *= leaf_value[sel, None, None]
+        table[sel, :, :m] = phi[:, np.arange(n_patterns) & ((1 << m) - 1), :]
+    return table
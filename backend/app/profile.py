@@ -0,0 +1,27 @@
+"""
+Writes the drift reference profile that /api/monitoring/drift compares live
+traffic with:
+
+    python -m app.profile [--version V]
+
+python -m app.train saves one with every new version; run this for bundles
+trained before reference profiles existed, such as the shipped model.
+"""
+import argparse
+from app.services.scoring import scoring_service
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m app.profile", description="Write a drift reference profile")
+    parser.add_argument("--version", help="Registered model version (default: the model the API would serve)")
+    args = parser.parse_args(argv)
+
+    if args.version is None and not scoring_service.load():
+        raise SystemExit(scoring_service.load_error)
+    profile = scoring_service.build_reference_profile(args.version)
+    print(f"Reference profile of model {profile['model_version']}: {profile['n_rows']} rows, "
+          f"{len(profile['features'])} features")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from app.schemas.credit import Explainability
+
+# Largest page /api/applicants returns
+MAX_PAGE_SIZE = 200
+
+class ApplicantSort(str, Enum):
+    ID = "id"    # newest first with order=desc
+    PROBABILITY_OF_DEFAULT = "probability_of_default"
+    CREDIT_SCORE = "credit_score"
+    LIMIT_BAL = "limit_bal"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class RiskTier(str, Enum):
+    LOW = "LOW"
+    MEDIUM = "MEDIUM"
+    HIGH = "HIGH"
+
+
+# Response models; they document the routes, which return pre-rendered responses.
+class ApplicantRecord(BaseModel):
+    id: int
+    scored_at: str
+    model_version: Optional[str] = None
+    credit_score: int
+    probability_of_default: float
+    risk_tier: str
+    recommended_loan_amount: float
+    recommended_tenor_months: int
+    limit_bal: float
+    age: int
+    sex: Optional[int] = None
+    education: Optional[int] = None
+    marriage: Optional[int] = None
+    avg_bill_amt: Optional[float] = None
+    avg_pay_amt: Optional[float] = None
+    explainability: Optional[Explainability] = None
+
+class ApplicantPage(BaseModel):
+    items: List[ApplicantRecord]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor for the next page; null on the last page")
+    limit: int
+
+class CreditScoreBucket(BaseModel):
+    min: int
+    max: int
+    count: int
+
+class ApplicantSummary(BaseModel):
+    total: int
+    by_risk_tier: Dict[str, int]
+    average_probability_of_default: Optional[float] = None
+    average_credit_score: Optional[float] = None
+    total_recommended_loan_amount: float
+    credit_score_histogram: List[CreditScoreBucket]
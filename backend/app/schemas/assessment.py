@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from app.schemas.credit import CreditScoreResponse
+from app.schemas.financial_health import FinancialHealthResponse
+from app.schemas.asset import AssetRecommendationResponse
+
+class AssessmentResponse(BaseModel):
+    credit: CreditScoreResponse
+    financial_health: FinancialHealthResponse
+    asset_recommendation: AssetRecommendationResponse
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from app.schemas.credit import CreditScoreRequest, MAX_BATCH_SIZE
 
 class AssetManagementRequest(BaseModel):
     # Required inputs for Logic
@@ -13,3 +15,26 @@ class AssetManagementRequest(BaseModel):
     
     # Optional logic if we want to re-verify
     # But for this endpoint, these are sufficient per prompt instructions.
+
+
+class AssetRecommendationResponse(BaseModel):
+    risk_tolerance: str
+    investment_horizon: str
+    portfolio_allocation: Dict[str, float]
+
+
+class PortfolioCustomer(CreditScoreRequest):
+    customer_id: str
+    portfolio_value: float = Field(0, ge=0)
+
+
+class PortfolioIngestRequest(BaseModel):
+    customers: List[PortfolioCustomer] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class SegmentBy(str, Enum):
+    PERSONA = "persona"
+    RISK_TIER = "risk_tier"
+    HEALTH_BAND = "health_band"
+    RISK_TOLERANCE = "risk_tolerance"
+    INVESTMENT_HORIZON = "investment_horizon"
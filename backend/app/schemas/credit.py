@@ -1,4 +1,14 @@
 from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from enum import Enum
+
+# Upper bound on records accepted by a single batch scoring call
+MAX_BATCH_SIZE = 50000
+
+class ExplanationMode(str, Enum):
+    NONE = "none"    # score only, no SHAP factors
+    FAST = "fast"    # precomputed TreeSHAP tables over the exported trees
+    EXACT = "exact"  # shap.TreeExplainer
 
 class CreditScoreRequest(BaseModel):
     LIMIT_BAL: float
@@ -33,3 +43,70 @@ class FinancialHealthRequest(CreditScoreRequest):
     # Could inherit or separate. 
     # Usually financial health needs derived metrics, but we can compute them from raw request.
     pass
+
+class CreditScoreBatchRequest(BaseModel):
+    # Records are validated one by one against CreditScoreRequest so that a
+    # malformed record (including one that is not an object) is reported for
+    # its own index instead of failing the batch.
+    records: List[Any] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+# Response models. They document the routes in OpenAPI; the routes return
+# pre-rendered responses, so results are not re-validated against them.
+class FactorImpact(BaseModel):
+    feature: str
+    impact: float
+
+class Explainability(BaseModel):
+    top_positive_factors: List[FactorImpact]
+    top_negative_factors: List[FactorImpact]
+
+class CreditScoreResponse(BaseModel):
+    credit_score: int
+    probability_of_default: float
+    risk_tier: str
+    recommended_loan_amount: float
+    recommended_tenor_months: int
+    explainability: Optional[Explainability] = None
+    currency: str
+
+class CreditScoreBatchItem(BaseModel):
+    index: int
+    status: str = Field(..., description="ok or error")
+    result: Optional[CreditScoreResponse] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+class CreditScoreBatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[CreditScoreBatchItem]
+
+class FeatureImportance(BaseModel):
+    feature: str
+    mean_abs_shap: float
+    mean_shap: float
+
+class RiskTierExplanation(BaseModel):
+    count: int
+    share: float
+    mean_probability_of_default: Optional[float] = None
+    top_features: List[FeatureImportance]
+
+class DependenceBin(BaseModel):
+    min: float
+    max: float
+    count: int
+    mean_value: float
+    mean_shap: float
+    std_shap: float
+
+class GlobalExplanationResponse(BaseModel):
+    model_version: str
+    computed_at: str
+    n_rows: int
+    features: List[str]
+    global_importance: List[FeatureImportance] = Field(..., description="By mean |SHAP| over the training set")
+    risk_tiers: Dict[str, RiskTierExplanation]
+    dependence: Optional[Dict[str, List[DependenceBin]]] = Field(None, description="SHAP by feature-value bin")
+    job: Dict[str, Any]
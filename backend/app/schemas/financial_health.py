@@ -0,0 +1,65 @@
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, List
+from app.schemas.credit import CreditScoreRequest
+from app.services.scenarios import FIELD_GROUPS
+
+# Upper bounds on a what-if simulation: grid points, and perturbations (grid dimensions)
+MAX_SCENARIOS = 10000
+MAX_PERTURBATIONS = 4
+
+class FinancialHealthResponse(BaseModel):
+    financial_health_score: float = Field(..., description="0 to 100")
+    health_band: str = Field(..., description="Strong, Moderate or Fragile")
+
+
+class PerturbationMode(str, Enum):
+    PERCENT = "percent"    # value * (1 + v / 100)
+    ABSOLUTE = "absolute"  # value + v
+    SET = "set"            # v
+
+class Perturbation(BaseModel):
+    field: str = Field(..., description="A CreditScoreRequest field, or PAY_AMT, BILL_AMT or PAY_STATUS for all six months")
+    mode: PerturbationMode = PerturbationMode.PERCENT
+    values: List[float] = Field(..., min_length=1, max_length=MAX_SCENARIOS)
+
+    @field_validator("field")
+    @classmethod
+    def _known_field(cls, value):
+        if value not in CreditScoreRequest.model_fields and value not in FIELD_GROUPS:
+            raise ValueError(f"must be a CreditScoreRequest field or one of {list(FIELD_GROUPS)}")
+        return value
+
+class ScenarioRequest(BaseModel):
+    applicant: CreditScoreRequest
+    # One grid dimension each; every combination of their values is scored
+    perturbations: List[Perturbation] = Field(..., min_length=1, max_length=MAX_PERTURBATIONS)
+
+    @model_validator(mode="after")
+    def _grid_size(self):
+        size = 1
+        for p in self.perturbations:
+            size *= len(p.values)
+        if size > MAX_SCENARIOS:
+            raise ValueError(f"{size} scenarios requested; at most {MAX_SCENARIOS} are allowed")
+        return self
+
+
+# Response model; documents the route, which returns a pre-rendered response.
+class ScenarioOutcome(BaseModel):
+    credit_score: int
+    probability_of_default: float
+    risk_tier: str
+    financial_health_score: float
+    health_band: str
+
+class ScenarioResponse(BaseModel):
+    model_version: str
+    shape: List[int] = Field(..., description="Values per perturbation; the grids below nest in this order")
+    scenarios: int
+    baseline: ScenarioOutcome = Field(..., description="The applicant without perturbations")
+    credit_score: Any = Field(..., description="Nested lists shaped like the grid")
+    probability_of_default: Any
+    risk_tier: Any
+    financial_health_score: Any
+    health_band: Any
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+# Response models; they document the routes, which return pre-rendered responses.
+class FeatureDrift(BaseModel):
+    feature: str
+    count: int
+    missing: int = Field(..., description="NaN or infinite values")
+    below_training_range: int
+    above_training_range: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    reference_mean: float
+    reference_std: float
+    psi: Optional[float] = Field(None, description="Population stability index against the training bins")
+    ks: Optional[float] = Field(None, description="Largest gap between the binned traffic and training CDFs")
+    status: str = Field(..., description="stable, moderate, significant or insufficient_data")
+
+class DriftReport(BaseModel):
+    model_version: str
+    reference_created_at: Optional[str] = None
+    reference_rows: Optional[int] = None
+    since: str
+    rows: int
+    min_rows: int
+    status: str
+    max_psi: Optional[float] = None
+    drifted_features: List[str]
+    features: List[FeatureDrift]
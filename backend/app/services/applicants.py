@@ -0,0 +1,375 @@
+import base64
+import json
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+from app.services.feature_engineering import FEATURE_INDEX
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'applicants.db')
+# Credit scores are 0-100; histogram buckets of 10 points, 100 counted in the last one
+SCORE_BUCKET_WIDTH = 10
+SCORE_BUCKETS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applicants (
+    id INTEGER PRIMARY KEY,
+    scored_at REAL NOT NULL,
+    model_version TEXT,
+    credit_score INTEGER NOT NULL,
+    probability_of_default REAL NOT NULL,
+    risk_tier TEXT NOT NULL,
+    recommended_loan_amount REAL NOT NULL,
+    recommended_tenor_months INTEGER NOT NULL,
+    limit_bal REAL NOT NULL,
+    age INTEGER NOT NULL,
+    sex INTEGER,
+    education INTEGER,
+    marriage INTEGER,
+    avg_bill_amt REAL,
+    avg_pay_amt REAL,
+    explainability TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_applicants_risk_tier ON applicants (risk_tier, probability_of_default);
+CREATE INDEX IF NOT EXISTS idx_applicants_credit_score ON applicants (credit_score);
+CREATE INDEX IF NOT EXISTS idx_applicants_probability_of_default ON applicants (probability_of_default);
+CREATE INDEX IF NOT EXISTS idx_applicants_limit_bal ON applicants (limit_bal);
+CREATE TABLE IF NOT EXISTS applicant_stats (
+    risk_tier TEXT NOT NULL,
+    score_bucket INTEGER NOT NULL,
+    applicants INTEGER NOT NULL,
+    sum_probability_of_default REAL NOT NULL,
+    sum_credit_score REAL NOT NULL,
+    sum_recommended_loan_amount REAL NOT NULL,
+    PRIMARY KEY (risk_tier, score_bucket)
+) WITHOUT ROWID;
+"""
+
+# Engineered-feature columns copied into each stored row
+FEATURE_FIELDS = {
+    "limit_bal": "LIMIT_BAL", "age": "AGE", "sex": "SEX", "education": "EDUCATION", "marriage": "MARRIAGE",
+    "avg_bill_amt": "avg_bill_amt", "avg_pay_amt": "avg_pay_amt",
+}
+SCORE_FIELDS = ["credit_score", "probability_of_default", "risk_tier", "recommended_loan_amount",
+                "recommended_tenor_months"]
+COLUMNS = ["scored_at", "model_version"] + SCORE_FIELDS + list(FEATURE_FIELDS) + ["explainability"]
+INSERT_SQL = f"INSERT INTO applicants ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+STATS_SQL = """
+INSERT INTO applicant_stats VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (risk_tier, score_bucket) DO UPDATE SET
+    applicants = applicants + excluded.applicants,
+    sum_probability_of_default = sum_probability_of_default + excluded.sum_probability_of_default,
+    sum_credit_score = sum_credit_score + excluded.sum_credit_score,
+    sum_recommended_loan_amount = sum_recommended_loan_amount + excluded.sum_recommended_loan_amount
+"""
+# Columns a page can be sorted by; each has an index, so every page is an index range scan
+SORT_COLUMNS = ("id", "probability_of_default", "credit_score", "limit_bal")
+# Columns with min/max range filters
+RANGE_COLUMNS = ("credit_score", "probability_of_default", "limit_bal")
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a pagination cursor that was not issued for the requested sort."""
+
+
+class ApplicantStore:
+    """
+    SQLite store of scored applicants for the dashboard's applicant views.
+
+    submit() is called on the scoring path and only enqueues the batch's
+    arrays; a background thread writes queued batches in one transaction
+    every APPLICANT_WRITE_INTERVAL_MS (or APPLICANT_WRITE_BATCH rows), and
+    keeps applicant_stats (counts and sums per risk tier and credit-score
+    bucket) current in the same transaction so summaries never scan the
+    table. When the queue is full, batches are dropped rather than slowing
+    scoring down.
+
+    Pages use keyset pagination: the cursor carries the last row's sort
+    value and id, so any page costs the same as the first.
+    """
+
+    def __init__(self, tier_names: list, path: str = None, batch_size: int = 5000, flush_interval: float = 0.2,
+                 max_queue: int = 10000, enabled: bool = True):
+        self.tier_names = tier_names
+        self.path = path or DEFAULT_PATH
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {"submitted": 0, "written": 0, "dropped": 0, "errors": 0}
+        self._counters_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers run while the writer commits
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    # Writing
+
+    def start(self):
+        with self._start_lock:
+            if self.enabled and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="applicant-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Writes what is queued, then stops the writer."""
+        with self._start_lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join(timeout=10)
+                self._thread = None
+
+    def submit(self, features: np.ndarray, model_version: str, scored: dict, explainability: list):
+        """
+        Queues a scored batch: the (n_rows, len(FEATURE_COLUMNS)) feature
+        matrix, score_arrays() output and each row's explainability (None
+        when not computed). A no-op until start().
+        """
+        if self._thread is None:
+            return
+        item = (
+            time.time(), model_version,
+            {name: features[:, FEATURE_INDEX[feature]] for name, feature in FEATURE_FIELDS.items()},
+            {name: scored[name] for name in SCORE_FIELDS},
+            explainability
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._counters_lock:
+                self._counters["dropped"] += len(scored["credit_score"])
+            return
+        with self._counters_lock:
+            self._counters["submitted"] += len(scored["credit_score"])
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            # Collects what arrives within flush_interval into one transaction
+            batch, rows = [item], len(item[3]["credit_score"])
+            deadline = time.monotonic() + self.flush_interval
+            while rows < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                rows += len(item[3]["credit_score"])
+            self._write(batch)
+        # Refreshes the query planner's statistics, as SQLite recommends before closing
+        self._connection().execute("PRAGMA optimize")
+
+    def _write(self, batch: list):
+        records = []
+        tiers, scores, probs, loans = [], [], [], []
+        for scored_at, model_version, features, scored, explainability in batch:
+            tier = scored["risk_tier"]
+            columns = [
+                scored["credit_score"].tolist(),
+                scored["probability_of_default"].tolist(),
+                [self.tier_names[t] for t in tier.tolist()],
+                scored["recommended_loan_amount"].tolist(),
+                scored["recommended_tenor_months"].tolist(),
+                *(features[name].tolist() for name in FEATURE_FIELDS),
+                [json.dumps(e) if e is not None else None for e in explainability]
+            ]
+            records.extend((scored_at, model_version) + row for row in zip(*columns))
+            tiers.append(tier)
+            scores.append(scored["credit_score"])
+            probs.append(scored["probability_of_default"])
+            loans.append(scored["recommended_loan_amount"])
+        stats = _bucket_sums(self.tier_names, np.concatenate(tiers), np.concatenate(scores), np.concatenate(probs),
+                             np.concatenate(loans))
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany(INSERT_SQL, records)
+                conn.executemany(STATS_SQL, stats)
+        except sqlite3.Error as e:
+            print(f"Applicant store: failed to write {len(records)} applicants: {e}")
+            with self._counters_lock:
+                self._counters["errors"] += len(records)
+            return
+        with self._counters_lock:
+            self._counters["written"] += len(records)
+
+    # Reading
+
+    def search(self, sort: str = "id", order: str = "desc", limit: int = 50, cursor: str = None,
+               risk_tier: str = None, ranges: dict = None) -> dict:
+        """
+        One page of applicants. ranges maps a RANGE_COLUMNS name to a
+        (min, max) pair, either end None. Returns the items and the cursor
+        of the next page (None on the last page).
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        where, params = [], []
+        if risk_tier is not None:
+            where.append("risk_tier = ?")
+            params.append(risk_tier)
+        ranges = {column: bounds for column, bounds in (ranges or {}).items() if bounds != (None, None)}
+        for column, (low, high) in ranges.items():
+            if column not in RANGE_COLUMNS:
+                raise ValueError(f"Cannot filter on {column}")
+            # Pages are driven by the sort column's index, which stops after
+            # `limit` matches; "+" keeps SQLite from range-scanning another
+            # column's index and sorting everything it finds instead.
+            target = column if column == sort else f"+{column}"
+            if low is not None:
+                where.append(f"{target} >= ?")
+                params.append(low)
+            if high is not None:
+                where.append(f"{target} <= ?")
+                params.append(high)
+        implied = _implied_range(sort, ranges)
+        if implied is not None:
+            # Narrows the sort index scan; the exact filter above still applies
+            where.append(f"{sort} BETWEEN ? AND ?")
+            params.extend(implied)
+        direction = "DESC" if order == "desc" else "ASC"
+        if cursor is not None:
+            value, last_id = _decode_cursor(cursor, sort)
+            op = "<" if order == "desc" else ">"
+            if sort == "id":
+                where.append(f"id {op} ?")
+                params.append(last_id)
+            else:
+                where.append(f"({sort}, id) {op} (?, ?)")
+                params.extend([value, last_id])
+        order_by = f"{sort} {direction}" if sort == "id" else f"{sort} {direction}, id {direction}"
+        sql = (f"SELECT id, {', '.join(COLUMNS)} FROM applicants"
+               f"{' WHERE ' + ' AND '.join(where) if where else ''} ORDER BY {order_by} LIMIT ?")
+        # One extra row tells whether there is a next page
+        rows = self._connection().execute(sql, params + [limit + 1]).fetchall()
+        items = [_record(row) for row in rows[:limit]]
+        next_cursor = _encode_cursor(sort, items[-1]) if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+    def get(self, applicant_id: int):
+        row = self._connection().execute(
+            f"SELECT id, {', '.join(COLUMNS)} FROM applicants WHERE id = ?", (applicant_id,)
+        ).fetchone()
+        return _record(row) if row is not None else None
+
+    def summary(self, risk_tier: str = None) -> dict:
+        """Dashboard aggregates from applicant_stats, optionally for one risk tier."""
+        sql = "SELECT risk_tier, score_bucket, applicants, sum_probability_of_default, sum_credit_score, " \
+              "sum_recommended_loan_amount FROM applicant_stats"
+        params = []
+        if risk_tier is not None:
+            sql += " WHERE risk_tier = ?"
+            params.append(risk_tier)
+        by_tier = dict.fromkeys(self.tier_names if risk_tier is None else [risk_tier], 0)
+        histogram = [0] * SCORE_BUCKETS
+        total = sum_pd = sum_score = sum_loan = 0
+        for tier, bucket, count, pd_sum, score_sum, loan_sum in self._connection().execute(sql, params):
+            by_tier[tier] += count
+            histogram[bucket] += count
+            total += count
+            sum_pd += pd_sum
+            sum_score += score_sum
+            sum_loan += loan_sum
+        return {
+            "total": total,
+            "by_risk_tier": by_tier,
+            "average_probability_of_default": round(sum_pd / total, 6) if total else None,
+            "average_credit_score": round(sum_score / total, 2) if total else None,
+            "total_recommended_loan_amount": round(sum_loan, 2),
+            "credit_score_histogram": [
+                {"min": b * SCORE_BUCKET_WIDTH,
+                 "max": 100 if b == SCORE_BUCKETS - 1 else (b + 1) * SCORE_BUCKET_WIDTH - 1,
+                 "count": count}
+                for b, count in enumerate(histogram)
+            ]
+        }
+
+    def stats(self) -> dict:
+        with self._counters_lock:
+            return {"path": self.path, "running": self._thread is not None, "queue_depth": self._queue.qsize(),
+                    **self._counters}
+
+
+def _bucket_sums(tier_names: list, tiers: np.ndarray, scores: np.ndarray, probs: np.ndarray, loans: np.ndarray) -> list:
+    # applicant_stats increments for one written batch, one row per (tier, bucket) present
+    buckets = np.minimum(scores // SCORE_BUCKET_WIDTH, SCORE_BUCKETS - 1)
+    keys = tiers * SCORE_BUCKETS + buckets
+    size = len(tier_names) * SCORE_BUCKETS
+    counts = np.bincount(keys, minlength=size)
+    sums = [np.bincount(keys, weights=w, minlength=size) for w in (probs, scores, loans)]
+    return [
+        (tier_names[k // SCORE_BUCKETS], int(k % SCORE_BUCKETS), int(counts[k]),
+         float(sums[0][k]), float(sums[1][k]), float(sums[2][k]))
+        for k in np.flatnonzero(counts).tolist()
+    ]
+
+
+def _implied_range(sort: str, ranges: dict):
+    # credit_score is rint((1 - probability_of_default) * 100) (ScoringService.score_arrays),
+    # so a range on either one bounds the other. Bounds are widened, never narrowed.
+    if sort == "probability_of_default" and "credit_score" in ranges:
+        low, high = ranges["credit_score"]
+        return (1 - (high + 0.5) / 100 - 1e-9 if high is not None else 0.0,
+                1 - (low - 0.5) / 100 + 1e-9 if low is not None else 1.0)
+    if sort == "credit_score" and "probability_of_default" in ranges:
+        low, high = ranges["probability_of_default"]
+        return (math.floor((1 - high) * 100) if high is not None else 0,
+                math.ceil((1 - low) * 100) if low is not None else 100)
+    return None
+
+
+def _record(row) -> dict:
+    record = dict(zip(["id"] + COLUMNS, row))
+    record["scored_at"] = datetime.fromtimestamp(record["scored_at"], timezone.utc).isoformat()
+    record["explainability"] = json.loads(record["explainability"]) if record["explainability"] else None
+    return record
+
+
+def _encode_cursor(sort: str, record: dict) -> str:
+    payload = json.dumps([sort, record[sort], record["id"]]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _is_integer(value) -> bool:
+    # SQLite integers are signed 64-bit; JSON booleans are not ids
+    return isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63
+
+
+def _decode_cursor(cursor: str, sort: str):
+    # The payload comes from the client, so its shape and types are checked
+    # before any of it is bound into the query
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise InvalidCursorError("Malformed cursor")
+    if not isinstance(payload, list) or len(payload) != 3:
+        raise InvalidCursorError("Malformed cursor")
+    cursor_sort, value, last_id = payload
+    if cursor_sort != sort:
+        raise InvalidCursorError(f"Cursor was not issued for sort={sort}")
+    # Every sort column is numeric
+    numeric = _is_integer(value) or (isinstance(value, float) and math.isfinite(value))
+    if not _is_integer(last_id) or not numeric:
+        raise InvalidCursorError("Malformed cursor")
+    return value, last_id
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from app.services.metrics import metrics
+from app.config import (
+    RESULT_CACHE_ENABLED, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_DISK_PATH
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Version for results that depend on no model (e.g. financial health). Model
+# changes never drop them; the TTL still applies.
+STATIC_VERSION = "static"
+
+
+class ResultCache:
+    """
+    Bounded LRU + TTL cache for endpoint results, shared by the routers in
+    app/api. Keys are a SHA-256 over the endpoint namespace, the loaded model
+    version and the canonical JSON of the request, so a changed model never
+    serves stale results. An optional SQLite file keeps warm entries across
+    worker restarts.
+
+    Cached values are returned as-is and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 900, disk_path: str = None,
+                 enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries = OrderedDict()  # key -> (expires_at, version, value)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "disk_hits": 0}
+        self._disk = None
+        if enabled and disk_path:
+            self._open_disk(disk_path)
+            # A SQLite connection must not be used across fork(); forked
+            # serving workers (gunicorn.conf.py) open their own
+            os.register_at_fork(after_in_child=lambda: self._open_disk(disk_path))
+
+    def _open_disk(self, disk_path: str):
+        self._disk = sqlite3.connect(disk_path, check_same_thread=False, timeout=5)
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, version TEXT, expires_at REAL, value TEXT)"
+        )
+        self._disk.commit()
+
+    @staticmethod
+    def make_key(namespace: str, payload, version: str) -> str:
+        if orjson is not None:
+            canonical = orjson.dumps([namespace, version, payload], option=orjson.OPT_SORT_KEYS)
+        else:
+            canonical = json.dumps([namespace, version, payload], sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.sha256(canonical).hexdigest()
+
+    def get_or_compute(self, namespace: str, payload, version: str, compute):
+        """
+        Returns (value, hit). On a miss, compute() is called outside the lock
+        and its result stored. Nothing is cached while version is None, i.e.
+        before the model has loaded, since such entries could never be hit again.
+        """
+        if not self.enabled or version is None:
+            return compute(), False
+        key = self.make_key(namespace, payload, version)
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.set(key, version, value)
+        return value, False
+
+    async def get_or_compute_async(self, namespace: str, payload, version: str, compute):
+        """get_or_compute for async handlers; compute is a coroutine function."""
+        if not self.enabled or version is None:
+            return await compute(), False
+        key = self.make_key(namespace, payload, version)
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = await compute()
+        self.set(key, version, value)
+        return value, False
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[2]
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT version, expires_at, value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[2])
+                    self._store(key, row[0], value, row[1])
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, version: str, value):
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, version, value, expires_at)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO results (key, version, expires_at, value) VALUES (?, ?, ?, ?)",
+                    (key, version, expires_at, json.dumps(value))
+                )
+                self._disk.commit()
+
+    def _store(self, key, version, value, expires_at):
+        # Caller holds the lock
+        self._entries[key] = (expires_at, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def retain_version(self, version: str):
+        """Drops every entry computed by a model version other than `version`, except STATIC_VERSION ones."""
+        with self._lock:
+            stale = [k for k, entry in self._entries.items() if entry[1] not in (version, STATIC_VERSION)]
+            for k in stale:
+                del self._entries[k]
+            if self._disk is not None:
+                self._disk.execute(
+                    "DELETE FROM results WHERE version NOT IN (?, ?) OR expires_at <= ?",
+                    (version, STATIC_VERSION, time.time())
+                )
+                self._disk.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM results")
+                self._disk.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": self._disk is not None,
+                **self._counters,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0
+            }
+
+
+result_cache = ResultCache(
+    max_entries=RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+    disk_path=RESULT_CACHE_DISK_PATH,
+    enabled=RESULT_CACHE_ENABLED
+)
+
+
+def _cache_collector():
+    stats = result_cache.stats()
+    return [
+        ("result_cache_events_total", "counter", "Result cache lookups and removals by outcome.",
+         [({"event": event}, stats[event]) for event in ("hits", "misses", "disk_hits", "evictions", "expirations")]),
+        ("result_cache_entries", "gauge", "Entries held in the in-memory result cache.", [({}, stats["entries"])])
+    ]
+
+
+metrics.register_collector(_cache_collector)
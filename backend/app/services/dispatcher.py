@@ -0,0 +1,197 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    DISPATCHER_ENABLED, DISPATCHER_WINDOW_MS, DISPATCHER_MAX_BATCH, DISPATCHER_WORKERS, DISPATCHER_MAX_QUEUE
+)
+from app.services.scoring import scoring_service
+from app.services.metrics import metrics
+
+# Recent queue waits kept for the percentiles in stats()
+WAIT_SAMPLES = 10000
+
+queue_wait = metrics.histogram(
+    "dispatcher_queue_wait_seconds", "Time requests wait in the inference queue before scoring."
+)
+batch_size = metrics.histogram(
+    "dispatcher_batch_size", "Requests scored per dispatcher batch.", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+
+class DispatcherOverloadedError(RuntimeError):
+    """Raised when the inference queue is full."""
+
+
+class InferenceDispatcher:
+    """
+    Micro-batching front end for single-applicant credit scoring.
+
+    Async handlers enqueue one request each and await a future. Dedicated
+    inference threads take the first queued request, keep collecting for up
+    to window_ms or until max_batch requests are gathered, and score the
+    whole batch with one feature-engineering pass and one predict call
+    (grouped by explanation mode). The window is skipped while traffic is
+    sequential, and a window of 0 only batches requests that are already
+    waiting. Results equal ScoringService.predict_credit_score.
+    """
+
+    def __init__(self, window_ms: float = 2.0, max_batch: int = 64, workers: int = 1, max_queue: int = 1024,
+                 enabled: bool = True):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.workers = workers
+        self.enabled = enabled
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._counters = {"requests": 0, "rejected": 0, "batches": 0, "rows": 0, "errors": 0}
+
+    def start(self):
+        with self._start_lock:
+            if self._threads or not self.enabled:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"inference-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        with self._start_lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join(timeout=5)
+            self._threads = []
+
+    async def score(self, record: dict, explanation: str, timings: dict = None) -> dict:
+        """
+        Scores one applicant through the batching queue. The result carries
+        _derived_features like predict_credit_score. timings receives the
+        queue wait plus the stage timings of the batch the request ran in.
+        """
+        if not self.enabled:
+            return await run_in_threadpool(scoring_service.predict_credit_score, record, explanation, timings)
+        self.start()
+        future = Future()
+        try:
+            self._queue.put_nowait((record, explanation, future, time.perf_counter(), timings))
+        except queue.Full:
+            with self._stats_lock:
+                self._counters["rejected"] += 1
+            raise DispatcherOverloadedError(f"Inference queue is full ({self._queue.maxsize} requests)")
+        with self._stats_lock:
+            self._counters["requests"] += 1
+        return await asyncio.wrap_future(future)
+
+    def _run(self):
+        last_batch = 1
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stopping = False
+            # Wait out the window only under load: after a single-request batch
+            # with nothing else queued it would add latency without batching.
+            window = self.window if last_batch > 1 or not self._queue.empty() else 0
+            deadline = time.perf_counter() + window
+            while len(batch) < self.max_batch:
+                try:
+                    remaining = deadline - time.perf_counter()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._score_batch(batch)
+            last_batch = len(batch)
+            if stopping:
+                return
+
+    def _score_batch(self, batch: list):
+        # Skip requests whose caller has gone away (cancelled futures)
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        waits = [(started - enqueued) * 1000 for _, _, _, enqueued, _ in batch]
+        if metrics.enabled:
+            for wait_ms in waits:
+                queue_wait.observe(wait_ms / 1000)
+            batch_size.observe(len(batch))
+        with self._stats_lock:
+            self._waits.extend(waits)
+            self._counters["batches"] += 1
+            self._counters["rows"] += len(batch)
+
+        by_mode = {}
+        for item, wait_ms in zip(batch, waits):
+            by_mode.setdefault(item[1], []).append((item, wait_ms))
+        for explanation, items in by_mode.items():
+            timings = {}
+            try:
+                results = scoring_service.predict_credit_scores(
+                    [record for (record, *_), _ in items], explanation, timings, include_features=True
+                )
+            except Exception as e:
+                with self._stats_lock:
+                    self._counters["errors"] += 1
+                for (_, _, future, _, _), _ in items:
+                    future.set_exception(e)
+                continue
+            for ((_, _, future, _, request_timings), wait_ms), result in zip(items, results):
+                if request_timings is not None:
+                    request_timings.update({"queue": wait_ms, **timings})
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            waits = np.array(self._waits) if self._waits else np.zeros(1)
+            batches = self._counters["batches"]
+            return {
+                "enabled": self.enabled,
+                "window_ms": self.window * 1000,
+                "max_batch": self.max_batch,
+                "workers": self.workers,
+                "max_queue": self._queue.maxsize,
+                "queue_depth": self._queue.qsize(),
+                **self._counters,
+                "mean_batch_size": round(self._counters["rows"] / batches, 2) if batches else 0.0,
+                "queue_wait_ms": {
+                    "p50": round(float(np.percentile(waits, 50)), 3),
+                    "p95": round(float(np.percentile(waits, 95)), 3),
+                    "p99": round(float(np.percentile(waits, 99)), 3),
+                    "max": round(float(waits.max()), 3)
+                }
+            }
+
+
+inference_dispatcher = InferenceDispatcher(
+    window_ms=DISPATCHER_WINDOW_MS,
+    max_batch=DISPATCHER_MAX_BATCH,
+    workers=DISPATCHER_WORKERS,
+    max_queue=DISPATCHER_MAX_QUEUE,
+    enabled=DISPATCHER_ENABLED
+)
+
+
+def _dispatcher_collector():
+    stats = inference_dispatcher.stats()
+    return [
+        ("dispatcher_requests_total", "counter", "Dispatcher requests by outcome.",
+         [({"outcome": "accepted"}, stats["requests"]), ({"outcome": "rejected"}, stats["rejected"]),
+          ({"outcome": "error"}, stats["errors"])]),
+        ("dispatcher_queue_depth", "gauge", "Requests waiting in the inference queue.", [({}, stats["queue_depth"])])
+    ]
+
+
+metrics.register_collector(_dispatcher_collector)
@@ -0,0 +1,253 @@
+"""
+Drift and data-quality monitoring of scoring traffic against the training data.
+
+Training saves a reference profile in each model bundle (reference_profile.json):
+per feature, the training mean, standard deviation and range, and the share of
+training rows in each of up to PROFILE_BINS quantile bins. DriftMonitor keeps
+fixed-size sketches of the rows the live model scores - running mean and
+variance, counts on the reference bins, missing and out-of-range counts - and
+compares them with the reference using the population stability index (PSI)
+and a Kolmogorov-Smirnov statistic over the binned distributions. Memory does
+not grow with traffic; the sketches start over whenever the live model changes.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timezone
+import numpy as np
+from app.models.credit_model import CreditScoringModel
+from app.services.feature_engineering import FEATURE_COLUMNS
+
+PROFILE_FILE = 'reference_profile.json'
+# Quantile bins per feature; features with at most this many distinct training
+# values get one bin per value
+PROFILE_BINS = 10
+# Floor for empty bin shares, which would make PSI infinite
+PSI_EPSILON = 1e-4
+
+
+def build_reference_profile(df, model_version: str) -> dict:
+    """Profile of the training frame df over the FEATURE_COLUMNS it holds."""
+    features = {}
+    for name in FEATURE_COLUMNS:
+        if name not in df.columns:
+            continue
+        column = np.asarray(df[name], dtype=np.float64)
+        column = column[np.isfinite(column)]
+        cuts = _bin_cuts(column)
+        counts = np.bincount(np.searchsorted(cuts, column, side='right'), minlength=len(cuts) + 1)
+        features[name] = {
+            "mean": float(column.mean()),
+            "std": float(column.std()),
+            "min": float(column.min()),
+            "max": float(column.max()),
+            "cuts": cuts.tolist(),
+            "proportions": (counts / len(column)).tolist()
+        }
+    return {
+        "model_version": model_version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "n_rows": int(len(df)),
+        "features": features
+    }
+
+
+def _bin_cuts(column: np.ndarray) -> np.ndarray:
+    """Interior bin boundaries; bin k holds cuts[k-1] <= x < cuts[k]."""
+    values = np.unique(column)
+    if len(values) <= PROFILE_BINS:
+        return (values[:-1] + values[1:]) / 2
+    return np.unique(np.quantile(column, np.linspace(0, 1, PROFILE_BINS + 1)[1:-1]))
+
+
+def save_reference_profile(profile: dict, bundle_dir: str):
+    path = os.path.join(bundle_dir, PROFILE_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def load_reference_profile(model: CreditScoringModel):
+    """The model's reference profile, or None if its bundle has none."""
+    path = os.path.join(model.bundle_dir, PROFILE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        profile = json.load(f)
+    return profile if profile.get('model_version') == model.version else None
+
+
+class DriftMonitor:
+    """
+    Streaming per-feature sketches of scored rows. observe() summarizes each
+    scored batch in a few vectorized NumPy passes outside the lock, then
+    merges the summary into the running totals under it (Chan et al.'s
+    parallel update for mean and variance).
+    """
+
+    def __init__(self, min_rows: int = 500, psi_warn: float = 0.1, psi_alert: float = 0.25, enabled: bool = True):
+        self.min_rows = min_rows
+        self.psi_warn = psi_warn
+        self.psi_alert = psi_alert
+        self.enabled = enabled
+        self.version = None
+        self._reference = None
+        self._lock = threading.Lock()
+
+    def _set_reference(self, model: CreditScoringModel):
+        # Called under the lock, once per model change
+        self.version = model.version
+        try:
+            profile = load_reference_profile(model)
+        except Exception as e:
+            print(f"Reference profile of model {model.version} could not be loaded: {e}")
+            profile = None
+        if profile is None:
+            self._reference = None
+            return
+        features = list(profile["features"])
+        reference = [profile["features"][f] for f in features]
+        n_bins = max(len(r["proportions"]) for r in reference)
+        # Cuts padded with +inf to a common width: a row's bin is the number of cuts <= its value
+        cuts = np.full((len(features), n_bins - 1), np.inf)
+        expected = np.zeros((len(features), n_bins))
+        for j, r in enumerate(reference):
+            cuts[j, :len(r["cuts"])] = r["cuts"]
+            expected[j, :len(r["proportions"])] = r["proportions"]
+        # observe() reads these without the lock, so they are swapped in as one object
+        self._reference = {
+            "profile": profile,
+            "features": features,
+            "columns": np.array([FEATURE_COLUMNS.index(f) for f in features]),
+            "cuts": cuts,
+            "expected": expected,
+            "valid_bins": np.arange(n_bins) < np.array([[len(r["proportions"])] for r in reference]),
+            "low": np.array([r["min"] for r in reference]),
+            "high": np.array([r["max"] for r in reference])
+        }
+        self._reset()
+
+    def _reset(self):
+        n_features, n_bins = self._reference["expected"].shape
+        self.since = datetime.now(timezone.utc).isoformat()
+        self.rows = 0
+        self._count = np.zeros(n_features)
+        self._mean = np.zeros(n_features)
+        self._m2 = np.zeros(n_features)
+        self._bins = np.zeros((n_features, n_bins))
+        self._missing = np.zeros(n_features)
+        self._below = np.zeros(n_features)
+        self._above = np.zeros(n_features)
+
+    def reset(self):
+        """Starts the sketches over, e.g. after a known change in the applicant population."""
+        with self._lock:
+            if self._reference is not None:
+                self._reset()
+
+    def observe(self, features: np.ndarray, model: CreditScoringModel):
+        """Adds a scored (n_rows, len(FEATURE_COLUMNS)) matrix to the sketches of `model`'s traffic."""
+        if not self.enabled:
+            return
+        if model.version != self.version:
+            with self._lock:
+                if model.version != self.version:
+                    self._set_reference(model)
+        ref = self._reference
+        if ref is None:
+            return
+        x = features[:, ref["columns"]]
+        finite = np.isfinite(x)
+        count = finite.sum(axis=0)
+        if finite.all():
+            mean = x.mean(axis=0)
+            m2 = ((x - mean) ** 2).sum(axis=0)
+        else:
+            x = np.where(finite, x, 0.0)
+            mean = np.divide(x.sum(axis=0), count, out=np.zeros(len(count)), where=count > 0)
+            m2 = (((x - mean) ** 2) * finite).sum(axis=0)
+        n_features, n_bins = ref["expected"].shape
+        idx = (x[:, :, None] >= ref["cuts"]).sum(axis=2) + np.arange(n_features) * n_bins
+        # Non-finite values are counted as missing, not binned
+        bins = np.bincount(idx[finite], minlength=n_features * n_bins).reshape(n_features, n_bins)
+        below = ((x < ref["low"]) & finite).sum(axis=0)
+        above = ((x > ref["high"]) & finite).sum(axis=0)
+
+        with self._lock:
+            if self._reference is not ref:
+                return
+            total = self._count + count
+            delta = mean - self._mean
+            share = np.divide(count, total, out=np.zeros(len(count)), where=total > 0)
+            self._mean += delta * share
+            self._m2 += m2 + delta ** 2 * self._count * share
+            self._count = total
+            self._bins += bins
+            self._missing += len(x) - count
+            self._below += below
+            self._above += above
+            self.rows += len(x)
+
+    def _status(self, psi: float) -> str:
+        if psi >= self.psi_alert:
+            return "significant"
+        return "moderate" if psi >= self.psi_warn else "stable"
+
+    def report(self, model: CreditScoringModel):
+        """Drift of `model`'s traffic so far against its reference profile, or None without a profile."""
+        with self._lock:
+            if model.version != self.version:
+                self._set_reference(model)
+            ref = self._reference
+            if ref is None:
+                return None
+            rows = self.rows
+            count = self._count.copy()
+            mean = self._mean.copy()
+            m2 = self._m2.copy()
+            bins = self._bins.copy()
+            missing, below, above = self._missing.copy(), self._below.copy(), self._above.copy()
+            since = self.since
+
+        observed = np.divide(bins, count[:, None], out=np.zeros_like(bins), where=count[:, None] > 0)
+        expected = np.maximum(ref["expected"], PSI_EPSILON)
+        actual = np.maximum(observed, PSI_EPSILON)
+        psi = np.where(ref["valid_bins"], (actual - expected) * np.log(actual / expected), 0.0).sum(axis=1)
+        ks = np.abs(np.cumsum(observed, axis=1) - np.cumsum(ref["expected"], axis=1)).max(axis=1)
+        std = np.sqrt(np.divide(m2, count, out=np.zeros_like(m2), where=count > 0))
+        enough = rows >= self.min_rows
+
+        features = []
+        profile = ref["profile"]
+        for j, name in enumerate(ref["features"]):
+            reference = profile["features"][name]
+            observed_any = count[j] > 0
+            features.append({
+                "feature": name,
+                "count": int(count[j]),
+                "missing": int(missing[j]),
+                "below_training_range": int(below[j]),
+                "above_training_range": int(above[j]),
+                "mean": round(float(mean[j]), 6) if observed_any else None,
+                "std": round(float(std[j]), 6) if observed_any else None,
+                "reference_mean": round(reference["mean"], 6),
+                "reference_std": round(reference["std"], 6),
+                "psi": round(float(psi[j]), 6) if observed_any else None,
+                "ks": round(float(ks[j]), 6) if observed_any else None,
+                "status": self._status(psi[j]) if enough and observed_any else "insufficient_data"
+            })
+        features.sort(key=lambda item: -(item["psi"] or 0.0))
+        max_psi = features[0]["psi"] if features and rows else None
+        return {
+            "model_version": profile["model_version"],
+            "reference_created_at": profile.get("created_at"),
+            "reference_rows": profile.get("n_rows"),
+            "since": since,
+            "rows": rows,
+            "min_rows": self.min_rows,
+            "status": self._status(max_psi) if enough and max_psi is not None else "insufficient_data",
+            "max_psi": max_psi,
+            "drifted_features": [f["feature"] for f in features
+                                 if f["status"] in ("moderate", "significant")],
+            "features": features
+        }
@@ -0,0 +1,216 @@
+"""
+Global explanations of a credit model version, precomputed offline:
+
+    python -m app.explain [--version V] [--chunk-size N] [--workers N]
+
+SHAP values of every training row are computed in chunks by a process pool
+and written into memory-mapped .npy files in the model bundle's
+explanations/ directory. The job then reduces them to summary.json: global
+mean-absolute importance, per-risk-tier summaries and dependence-curve bins,
+which /api/credit/explainability/global serves without running SHAP.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+from app.models.credit_model import CreditScoringModel
+
+EXPLANATIONS_DIR = 'explanations'
+FEATURES_FILE = 'features.npy'
+SHAP_FILE = 'shap_values.npy'
+PROBABILITY_FILE = 'probability_of_default.npy'
+SUMMARY_FILE = 'summary.json'
+DEFAULT_CHUNK_SIZE = 5000
+# Quantile bins per feature for dependence curves; discrete features get fewer
+DEPENDENCE_BINS = 20
+# Features listed per risk tier, by mean |SHAP| within the tier
+TIER_TOP_FEATURES = 5
+
+# Model loaded once per worker process by _init_worker
+_worker_model = {}
+
+
+def explanations_dir(model: CreditScoringModel) -> str:
+    return os.path.join(model.bundle_dir, EXPLANATIONS_DIR)
+
+
+def load_global_explanations(model: CreditScoringModel):
+    """The model's precomputed summary, or None if the job has not run for this version."""
+    path = os.path.join(explanations_dir(model), SUMMARY_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        summary = json.load(f)
+    # A bundle directory reused by another version must not serve stale results
+    return summary if summary.get('model_version') == model.version else None
+
+
+def _init_worker(model_path: str, explainer_path: str, bundle_dir: str):
+    model = CreditScoringModel(model_path, explainer_path, bundle_dir=bundle_dir)
+    if not model.load():
+        raise RuntimeError(f"No model at {bundle_dir}")
+    # One XGBoost thread per process; the pool provides the parallelism
+    model.model.set_params(n_jobs=1)
+    _worker_model['model'] = model
+
+
+def _explain_chunk(output_dir: str, start: int, stop: int):
+    # Reads its rows from the features memmap and writes its slice of the
+    # output memmaps in place; nothing but the row range crosses processes.
+    model = _worker_model['model']
+    X = np.load(os.path.join(output_dir, FEATURES_FILE), mmap_mode='r')[start:stop]
+    shap_values = np.load(os.path.join(output_dir, SHAP_FILE), mmap_mode='r+')
+    probs = np.load(os.path.join(output_dir, PROBABILITY_FILE), mmap_mode='r+')
+    shap_values[start:stop] = model.explain_batch(X, "fast")
+    probs[start:stop] = model.predict(X)
+    shap_values.flush()
+    probs.flush()
+    return stop - start
+
+
+def build_global_explanations(model: CreditScoringModel, X: np.ndarray, tier_names: list, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          workers: int = None) -> dict:
+    """
+    Computes and stores the global explanations of `model` over X, a
+    (n_rows, n_features) array in model.features order. Returns the summary.
+    """
+    start = time.perf_counter()
+    output_dir = explanations_dir(model)
+    os.makedirs(output_dir, exist_ok=True)
+    # summary.json marks a complete run; remove it first so an interrupted
+    # rebuild never serves a summary next to half-written arrays
+    summary_path = os.path.join(output_dir, SUMMARY_FILE)
+    if os.path.exists(summary_path):
+        os.remove(summary_path)
+
+    n_rows, n_features = X.shape
+    features = np.lib.format.open_memmap(os.path.join(output_dir, FEATURES_FILE), mode='w+', dtype=np.float32,
+                                         shape=X.shape)
+    features[:] = X
+    features.flush()
+    for name, shape in ((SHAP_FILE, (n_rows, n_features)), (PROBABILITY_FILE, (n_rows,))):
+        np.lib.format.open_memmap(os.path.join(output_dir, name), mode='w+', dtype=np.float32, shape=shape).flush()
+
+    workers = workers or os.cpu_count() or 1
+    ranges = [(first, min(first + chunk_size, n_rows)) for first in range(0, n_rows, chunk_size)]
+    init_args = (model.model_path, model.explainer_path, model.bundle_dir)
+    if workers == 1:
+        _worker_model['model'] = model
+        for first, stop in ranges:
+            _explain_chunk(output_dir, first, stop)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            list(pool.map(_explain_chunk, *zip(*[(output_dir, first, stop) for first, stop in ranges])))
+    shap_seconds = time.perf_counter() - start
+
+    summary = summarize(
+        model, features, np.load(os.path.join(output_dir, SHAP_FILE), mmap_mode='r'),
+        np.load(os.path.join(output_dir, PROBABILITY_FILE), mmap_mode='r'), tier_names, chunk_size
+    )
+    summary['job'] = {
+        'chunk_size': chunk_size,
+        'workers': workers,
+        'shap_seconds': round(shap_seconds, 2),
+        'total_seconds': round(time.perf_counter() - start, 2)
+    }
+    with open(summary_path + '.tmp', 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(summary_path + '.tmp', summary_path)
+    print(f"Global explanations for model {model.version}: {n_rows} rows in {summary['job']['total_seconds']}s "
+          f"with {workers} worker(s), written to {output_dir}")
+    return summary
+
+
+def summarize(model: CreditScoringModel, X: np.ndarray, shap_values: np.ndarray, probs: np.ndarray,
+              tier_names: list, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Reduces memory-mapped SHAP values chunk by chunk; memory use does not grow with the row count."""
+    n_rows, n_features = X.shape
+    n_tiers = len(tier_names)
+    edges, discrete = zip(*[_bin_edges(np.asarray(X[:, j])) for j in range(n_features)])
+    n_bins = [len(e) - 1 for e in edges]
+
+    tier_count = np.zeros(n_tiers)
+    tier_prob = np.zeros(n_tiers)
+    tier_abs = np.zeros((n_tiers, n_features))
+    tier_sum = np.zeros((n_tiers, n_features))
+    # Per feature and bin: rows, sum of feature values, sum and sum of squares of SHAP
+    bins = [np.zeros((4, b)) for b in n_bins]
+
+    for first in range(0, n_rows, chunk_size):
+        x = np.asarray(X[first:first + chunk_size], dtype=np.float64)
+        sv = np.asarray(shap_values[first:first + chunk_size], dtype=np.float64)
+        p = np.asarray(probs[first:first + chunk_size], dtype=np.float64)
+        tiers = np.digitize(p, model.risk_tier_thresholds, right=True)
+        tier_count += np.bincount(tiers, minlength=n_tiers)
+        tier_prob += np.bincount(tiers, weights=p, minlength=n_tiers)
+        for t in range(n_tiers):
+            rows = tiers == t
+            tier_abs[t] += np.abs(sv[rows]).sum(axis=0)
+            tier_sum[t] += sv[rows].sum(axis=0)
+        for j in range(n_features):
+            idx = np.clip(np.searchsorted(edges[j], x[:, j], side='right') - 1, 0, n_bins[j] - 1)
+            for k, weights in enumerate((None, x[:, j], sv[:, j], sv[:, j] ** 2)):
+                bins[j][k] += np.bincount(idx, weights=weights, minlength=n_bins[j])
+
+    total_abs = tier_abs.sum(axis=0)
+    total_sum = tier_sum.sum(axis=0)
+    importance = [
+        {"feature": f, "mean_abs_shap": round(total_abs[j] / n_rows, 6), "mean_shap": round(total_sum[j] / n_rows, 6)}
+        for j, f in enumerate(model.features)
+    ]
+    importance.sort(key=lambda item: -item["mean_abs_shap"])
+
+    risk_tiers = {}
+    for t, name in enumerate(tier_names):
+        count = tier_count[t]
+        factors = [
+            {"feature": f, "mean_abs_shap": round(tier_abs[t, j] / count, 6),
+             "mean_shap": round(tier_sum[t, j] / count, 6)}
+            for j, f in enumerate(model.features)
+        ] if count else []
+        factors.sort(key=lambda item: -item["mean_abs_shap"])
+        risk_tiers[name] = {
+            "count": int(count),
+            "share": round(count / n_rows, 4),
+            "mean_probability_of_default": round(tier_prob[t] / count, 6) if count else None,
+            "top_features": factors[:TIER_TOP_FEATURES]
+        }
+
+    dependence = {}
+    for j, f in enumerate(model.features):
+        count, value_sum, shap_sum, shap_sq = bins[j]
+        curve = []
+        for b in np.flatnonzero(count).tolist():
+            mean = shap_sum[b] / count[b]
+            curve.append({
+                "min": float(edges[j][b]),
+                "max": float(edges[j][b] if discrete[j] else edges[j][b + 1]),
+                "count": int(count[b]),
+                "mean_value": round(value_sum[b] / count[b], 6),
+                "mean_shap": round(mean, 6),
+                "std_shap": round(float(np.sqrt(max(shap_sq[b] / count[b] - mean ** 2, 0.0))), 6)
+            })
+        dependence[f] = curve
+
+    return {
+        "model_version": model.version,
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+        "n_rows": int(n_rows),
+        "features": list(model.features),
+        "global_importance": importance,
+        "risk_tiers": risk_tiers,
+        "dependence": dependence
+    }
+
+
+def _bin_edges(column: np.ndarray):
+    """
+    Returns (edges, discrete). Features with at most DEPENDENCE_BINS distinct
+    values get one bin per value; others get quantile bins.
+    """
+    values = np.unique(column)
+    if len(values) <= DEPENDENCE_BINS:
+        return np.append(values, values[-1]), True
+    return np.unique(np.quantile(column, np.linspace(0, 1, DEPENDENCE_BINS + 1))), False
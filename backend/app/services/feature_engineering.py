@@ -1,74 +1,182 @@
-import pandas as pd
 import numpy as np
+from app.config import FEATURE_ENGINE_JIT
+from app.schemas.credit import CreditScoreRequest
 
-def compute_features(df: pd.DataFrame) -> pd.DataFrame:
+# Raw inputs in CreditScoreRequest field order. Feature matrices are laid out
+# as RAW_FEATURES followed by DERIVED_FEATURES.
+RAW_FEATURES = list(CreditScoreRequest.model_fields)
+DERIVED_FEATURES = [
+    'avg_bill_amt', 'avg_pay_amt', 'credit_utilization', 'payment_consistency',
+    'late_payment_count', 'severe_delinquency', 'cashflow_volatility', 'ratio_volatility'
+]
+FEATURE_COLUMNS = RAW_FEATURES + DERIVED_FEATURES
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+BILL_COLS = [f'BILL_AMT{i}' for i in range(1, 7)]
+PAY_AMT_COLS = [f'PAY_AMT{i}' for i in range(1, 7)]
+# Standard UCI dataset columns for history: PAY_0, PAY_2, PAY_3, PAY_4, PAY_5, PAY_6
+PAY_STATUS_COLS = ['PAY_0', 'PAY_2', 'PAY_3', 'PAY_4', 'PAY_5', 'PAY_6']
+
+_LIMIT = FEATURE_INDEX['LIMIT_BAL']
+_BILL = np.array([FEATURE_INDEX[c] for c in BILL_COLS])
+_PAY_AMT = np.array([FEATURE_INDEX[c] for c in PAY_AMT_COLS])
+_PAY_STATUS = np.array([FEATURE_INDEX[c] for c in PAY_STATUS_COLS])
+_INT_FEATURES = ['late_payment_count', 'severe_delinquency']
+# Columns compute_features cannot do without
+_REQUIRED_COLUMNS = ['LIMIT_BAL'] + BILL_COLS + PAY_AMT_COLS
+
+
+def records_to_matrix(records: list) -> np.ndarray:
+    """
+    Packs request dicts into a contiguous float64 array in RAW_FEATURES order.
+    """
+    return np.array([[r[c] for c in RAW_FEATURES] for r in records], dtype=np.float64)
+
+
+def compute_feature_matrix(raw: np.ndarray) -> np.ndarray:
+    """
+    Computes the derived features for a raw (n_rows, len(RAW_FEATURES)) array.
+    Returns a new (n_rows, len(FEATURE_COLUMNS)) float64 array holding the raw
+    inputs followed by the derived features.
+    """
+    raw = np.ascontiguousarray(raw, dtype=np.float64)
+    out = np.empty((raw.shape[0], len(FEATURE_COLUMNS)), dtype=np.float64)
+    out[:, :len(RAW_FEATURES)] = raw
+    _derive(raw, out[:, len(RAW_FEATURES):])
+    return out
+
+
+class FeatureRow:
+    """
+    Read-only view of one applicant's row in a feature matrix, addressed by
+    FEATURE_COLUMNS name. Nothing is copied or converted until a value is
+    read, so attaching rows to scoring results costs one small object each.
+    """
+    __slots__ = ("_matrix", "_index")
+
+    def __init__(self, matrix: np.ndarray, index: int):
+        self._matrix = matrix
+        self._index = index
+
+    def get(self, name: str, default: float = None) -> float:
+        column = FEATURE_INDEX.get(name)
+        if column is None:
+            return default
+        return float(self._matrix[self._index, column])
+
+    def __getitem__(self, name: str) -> float:
+        return float(self._matrix[self._index, FEATURE_INDEX[name]])
+
+    def to_dict(self) -> dict:
+        return dict(zip(FEATURE_COLUMNS, self._matrix[self._index].tolist()))
+
+    def values(self) -> np.ndarray:
+        """The row in FEATURE_COLUMNS order, as a view into the matrix."""
+        return self._matrix[self._index]
+
+
+def compute_features(df: "pd.DataFrame") -> "pd.DataFrame":
     """
     Computes required features for credit scoring and financial health.
     Works on a Pandas DataFrame (even if single row).
+    Thin wrapper over compute_feature_matrix kept for training and callers
+    that work with frames.
     """
+    # Only the amount columns feed the derived features. Other missing columns
+    # are filled with 0 and not added to the frame: demographics are unused,
+    # and a missing PAY_x status counts as "paid duly", which neither adds to
+    # late_payment_count nor sets severe_delinquency.
+    missing = [c for c in _REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise KeyError(f"Missing required columns: {missing}")
+    raw = df.reindex(columns=RAW_FEATURES, fill_value=0).to_numpy(dtype=np.float64)
+
     df = df.copy()
+    df[DERIVED_FEATURES] = compute_feature_matrix(raw)[:, len(RAW_FEATURES):]
+    df[_INT_FEATURES] = df[_INT_FEATURES].astype(int)
+    return df
 
-    # 1. Average Bill Amount
-    bill_cols = [f'BILL_AMT{i}' for i in range(1, 7)]
-    df['avg_bill_amt'] = df[bill_cols].mean(axis=1)
-
-    # 2. Average Payment Amount
-    pay_amt_cols = [f'PAY_AMT{i}' for i in range(1, 7)]
-    df['avg_pay_amt'] = df[pay_amt_cols].mean(axis=1)
-
-    # 3. Credit Utilization Ratio
-    # Clamp to [0, 1.5]
-    # Handle division by zero if LIMIT_BAL is 0 (unlikely but safe to handle)
-    df['credit_utilization'] = df['avg_bill_amt'] / df['LIMIT_BAL'].replace(0, 1)
-    df['credit_utilization'] = df['credit_utilization'].clip(0, 1.5)
-
-    # 4. Payment Consistency Ratio
-    # sum(PAY_AMT) / sum(BILL_AMT)
-    # Clamp to [0, 2]
-    sum_pay = df[pay_amt_cols].sum(axis=1)
-    sum_bill = df[bill_cols].sum(axis=1)
-    # Avoid division by zero
-    df['payment_consistency'] = sum_pay / sum_bill.replace(0, 1)
-    df['payment_consistency'] = df['payment_consistency'].clip(0, 2)
-
-    # 5. Late Payment Count
-    # count(PAY_0...PAY_6 where value > 0)
-    # Note: Dataset usually has PAY_0, PAY_2, PAY_3, PAY_4, PAY_5, PAY_6.
-    # The prompt says PAY_0...PAY_6. I will use the columns available in the dataframe that start with PAY_ and are single digit integers mostly.
-    # Standard UCI dataset columns for history: PAY_0, PAY_2, PAY_3, PAY_4, PAY_5, PAY_6
-    pay_status_cols = ['PAY_0', 'PAY_2', 'PAY_3', 'PAY_4', 'PAY_5', 'PAY_6']
-    
-    # Check if cols exist, otherwise adjust (e.g. if preprocessing renamed them)
-    # For now assume standard names.
-    # In case the input is missing some cols (inference), we assume they are provided.
-    
-    # We filter only those that exist in df
-    existing_pay_cols = [c for c in pay_status_cols if c in df.columns]
-    
-    df['late_payment_count'] = (df[existing_pay_cols] > 0).sum(axis=1)
-
-    # 6. Severe Delinquency Flag
-    # 1 if any(PAY_X >= 3) else 0
-    df['severe_delinquency'] = (df[existing_pay_cols] >= 3).any(axis=1).astype(int)
-
-    # 7. Cashflow Volatility
-    # std(BILL_AMT1...BILL_AMT6)
-    df['cashflow_volatility'] = df[bill_cols].std(axis=1)
-
-    # 8. Payment-to-Bill Ratio Volatility
-    # monthly_ratios = PAY_AMTX / max(BILL_AMTX, 1)
-    # ratio_volatility = std(monthly_ratios)
-    
-    # varying X from 1 to 6
-    ratio_vals = []
-    for i in range(1, 7):
-        b_col = f'BILL_AMT{i}'
-        p_col = f'PAY_AMT{i}'
-        # usage of max(BILL, 1) to avoid zero div
-        # In pandas: .apply or vector operation
-        ratio_vals.append(df[p_col] / df[b_col].apply(lambda x: max(x, 1)))
-    
-    ratio_df = pd.concat(ratio_vals, axis=1)
-    df['ratio_volatility'] = ratio_df.std(axis=1)
 
-    return df
+def _derive_numpy(raw: np.ndarray, out: np.ndarray):
+    limit = raw[:, _LIMIT]
+    bills = raw[:, _BILL]
+    pays = raw[:, _PAY_AMT]
+    status = raw[:, _PAY_STATUS]
+
+    # 1. Average Bill Amount / 2. Average Payment Amount
+    sum_bill = bills.sum(axis=1)
+    sum_pay = pays.sum(axis=1)
+    avg_bill = sum_bill / 6
+    out[:, 0] = avg_bill
+    out[:, 1] = sum_pay / 6
+
+    # 3. Credit Utilization Ratio, clamped to [0, 1.5]
+    out[:, 2] = np.clip(avg_bill / np.where(limit == 0, 1, limit), 0, 1.5)
+
+    # 4. Payment Consistency Ratio: sum(PAY_AMT) / sum(BILL_AMT), clamped to [0, 2]
+    out[:, 3] = np.clip(sum_pay / np.where(sum_bill == 0, 1, sum_bill), 0, 2)
+
+    # 5. Late Payment Count / 6. Severe Delinquency Flag
+    out[:, 4] = (status > 0).sum(axis=1)
+    out[:, 5] = (status >= 3).any(axis=1)
+
+    # 7. Cashflow Volatility: std(BILL_AMT1...BILL_AMT6)
+    out[:, 6] = bills.std(axis=1, ddof=1)
+
+    # 8. Payment-to-Bill Ratio Volatility: std(PAY_AMTX / max(BILL_AMTX, 1))
+    out[:, 7] = (pays / np.maximum(bills, 1)).std(axis=1, ddof=1)
+
+
+def _derive_rows(raw, out):
+    # Fused single pass per row; same arithmetic order as _derive_numpy so the
+    # two paths give identical results.
+    for r in range(raw.shape[0]):
+        sum_bill = 0.0
+        sum_pay = 0.0
+        late = 0
+        severe = 0
+        for j in range(6):
+            sum_bill += raw[r, _BILL[j]]
+            sum_pay += raw[r, _PAY_AMT[j]]
+            status = raw[r, _PAY_STATUS[j]]
+            if status > 0:
+                late += 1
+            if status >= 3:
+                severe = 1
+        avg_bill = sum_bill / 6
+
+        ratio_sum = 0.0
+        for j in range(6):
+            ratio_sum += raw[r, _PAY_AMT[j]] / max(raw[r, _BILL[j]], 1.0)
+        ratio_mean = ratio_sum / 6
+
+        bill_sq = 0.0
+        ratio_sq = 0.0
+        for j in range(6):
+            d = raw[r, _BILL[j]] - avg_bill
+            bill_sq += d * d
+            d = raw[r, _PAY_AMT[j]] / max(raw[r, _BILL[j]], 1.0) - ratio_mean
+            ratio_sq += d * d
+
+        limit = raw[r, _LIMIT]
+        if limit == 0:
+            limit = 1.0
+        consistency_base = sum_bill if sum_bill != 0 else 1.0
+
+        out[r, 0] = avg_bill
+        out[r, 1] = sum_pay / 6
+        out[r, 2] = min(max(avg_bill / limit, 0.0), 1.5)
+        out[r, 3] = min(max(sum_pay / consistency_base, 0.0), 2.0)
+        out[r, 4] = late
+        out[r, 5] = severe
+        out[r, 6] = np.sqrt(bill_sq / 5)
+        out[r, 7] = np.sqrt(ratio_sq / 5)
+
+
+_derive = _derive_numpy
+if FEATURE_ENGINE_JIT:
+    try:
+        import numba
+        _derive = numba.njit(cache=True)(_derive_rows)
+    except ImportError:
+        print("FEATURE_ENGINE_JIT is set but numba is not installed. Using NumPy feature engine.")
@@ -0,0 +1,267 @@
+import asyncio
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse
+from app.config import METRICS_ENABLED
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Latency buckets in seconds, from 100 us to 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   5.0, 10.0)
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class Histogram:
+    """Cumulative Prometheus histogram keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}  # label values -> [count per bucket..., count above the last bound, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues):
+        series = self._series.get(labelvalues)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labelvalues, [0] * (len(self.buckets) + 2))
+        # Counts are stored per bucket (the last bucket is +Inf) and made cumulative on render
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series[i] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for labelvalues, values in sorted(series.items(), key=lambda item: tuple(map(str, item[0]))):
+            labels = _format_labels(self.labelnames, labelvalues)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {cumulative}')
+            braces = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{braces} {values[-1]}")
+            lines.append(f"{self.name}_count{braces} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text exposition format.
+    Histograms are updated on the request path; counters owned by other
+    components (cache, dispatcher, model) are read by collectors at scrape
+    time, so they cost nothing per request. Each worker process reports its
+    own values.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms = []
+        self._collectors = []
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple = (),
+                  buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        histogram = Histogram(name, help_text, labelnames, buckets)
+        self._histograms.append(histogram)
+        return histogram
+
+    def register_collector(self, collect):
+        """collect() returns [(name, type, help, [(labels dict, value), ...]), ...]."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for collect in self._collectors:
+            for name, kind, help_text, samples in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_text = _format_labels(tuple(labels), tuple(labels.values()))
+                    lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = MetricsRegistry(enabled=METRICS_ENABLED)
+
+request_latency = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+stage_latency = metrics.histogram(
+    "scoring_stage_duration_seconds", "Latency of scoring pipeline stages.", ("stage", "model_version")
+)
+
+
+def set_model_version(version: str):
+    """on_change callback of CreditScoringModel; labels subsequent stage timings."""
+    stage_timer.model_version = version
+
+
+class stage_timer:
+    """
+    Times a scoring stage into scoring_stage_duration_seconds. Works as a
+    context manager (`with stage_timer("predict", timings):`) or as a method
+    decorator (`@stage_timer("financial_health")`). When a timings dict is
+    given, the stage's duration in ms is also written into it, which is what
+    the Server-Timing headers report.
+    """
+    __slots__ = ("stage", "timings", "_start")
+    # Kept current by set_model_version so every stage is labelled with the loaded model
+    model_version = None
+
+    def __init__(self, stage: str, timings: dict = None):
+        self.stage = stage
+        self.timings = timings
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        if self.timings is not None:
+            self.timings[self.stage] = elapsed * 1000
+        if metrics.enabled:
+            stage_latency.observe(elapsed, self.stage, stage_timer.model_version)
+        return False
+
+    def __call__(self, fn):
+        stage = self.stage
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    Default response class. Renders with orjson (which also takes NumPy
+    scalars and arrays) when it is installed, and reports JSON rendering as
+    the "serialize" stage. Routes that return an instance directly skip
+    FastAPI's jsonable_encoder and response-model validation.
+    """
+
+    def render(self, content) -> bytes:
+        with stage_timer("serialize"):
+            if orjson is None:
+                return super().render(content)
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# perf_counter() at which the current request entered its TimedRoute handler
+_handler_start = ContextVar("handler_start", default=None)
+
+
+def _observe_validation():
+    start = _handler_start.get()
+    if start is not None and metrics.enabled:
+        stage_latency.observe(time.perf_counter() - start, "validation", stage_timer.model_version)
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class reporting request parsing as the "validation" stage: the time
+    from entering the route handler to calling the endpoint, which covers
+    reading the body and validating parameters and the body against the
+    route's pydantic models. Used by the scoring routers
+    (`APIRouter(route_class=TimedRoute)`).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            @wraps(endpoint)
+            async def timed_endpoint(*args, **kw):
+                _observe_validation()
+                return await endpoint(*args, **kw)
+        else:
+            @wraps(endpoint)
+            def timed_endpoint(*args, **kw):
+                _observe_validation()
+                return endpoint(*args, **kw)
+        super().__init__(path, timed_endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            token = _handler_start.set(time.perf_counter())
+            try:
+                return await handler(request)
+            finally:
+                _handler_start.reset(token)
+        return timed_handler
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware observing per-route latency; routes are labelled by template, not raw path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.enabled:
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_latency.observe(time.perf_counter() - start, scope["method"], _route_template(scope), status[0])
+
+
+def _route_template(scope) -> str:
+    # Unmatched paths share one label so scanners cannot blow up cardinality;
+    # path parameter values are put back as {name}.
+    if scope.get("route") is None:
+        return "unmatched"
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+
+def process_collector():
+    samples = []
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * _PAGE_SIZE
+        samples.append(("process_resident_memory_bytes", "gauge", "Resident set size in bytes.", [({}, rss)]))
+    except OSError:
+        pass
+    cpu = os.times()
+    samples.append(("process_cpu_seconds_total", "counter", "User and system CPU time in seconds.",
+                    [({}, cpu.user + cpu.system)]))
+    return samples
+
+
+metrics.register_collector(process_collector)
@@ -0,0 +1,432 @@
+import glob
+import os
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+from app.config import PORTFOLIO_DATA_PATH, PORTFOLIO_ID_COLUMN, PORTFOLIO_VALUE_COLUMN
+from app.models.investment_model import (
+    InvestmentModel, RISK_TOLERANCES, INVESTMENT_HORIZONS, INVESTOR_PERSONAS, PRODUCTS, PRODUCT_KEYS, RISK_LEVEL_SCORES
+)
+from app.services.scoring import RISK_TIERS, HEALTH_BANDS
+
+# Dashboard risk levels for the LOW / MEDIUM / HIGH risk tolerances
+RISK_LEVELS = ["conservative", "moderate", "aggressive"]
+LIQUIDITY_NEEDS = {"SHORT": "High", "MEDIUM": "Medium", "LONG": "Low"}
+ALLOCATION_COLUMNS = [f"allocation_{k}" for k in PRODUCT_KEYS]
+
+# Categorical columns, stored as int8 codes into these labels. Every group-by
+# below is over one of them; persona is derived from tolerance and horizon.
+CATEGORIES = {
+    "risk_tier": RISK_TIERS,
+    "health_band": HEALTH_BANDS,
+    "risk_tolerance": RISK_TOLERANCES,
+    "investment_horizon": INVESTMENT_HORIZONS,
+    "persona": INVESTOR_PERSONAS,
+}
+# Per-customer quantities kept summed per group of every category
+METRICS = ["customers", "investors", "portfolio_value", "credit_score", "financial_health_score", "risk_score",
+           "expected_return"] + [f"value_{k}" for k in PRODUCT_KEYS]
+_M = {name: i for i, name in enumerate(METRICS)}
+
+_RISK_WEIGHTS = np.array([RISK_LEVEL_SCORES[PRODUCTS[k]["risk_level"]] for k in PRODUCT_KEYS], dtype=np.float32)
+_RETURN_MIN = np.array([PRODUCTS[k]["expected_return"][0] for k in PRODUCT_KEYS], dtype=np.float32)
+_RETURN_MAX = np.array([PRODUCTS[k]["expected_return"][1] for k in PRODUCT_KEYS], dtype=np.float32)
+_PERSONA_TABLE = np.array([
+    [INVESTOR_PERSONAS.index(InvestmentModel().predict_investor_persona(tolerance, horizon))
+     for horizon in INVESTMENT_HORIZONS]
+    for tolerance in RISK_TOLERANCES
+], dtype=np.int8)
+
+# Non-cash holdings above this share of a portfolio raise a concentration alert
+CONCENTRATION_THRESHOLD = 60.0
+# Money-market share of a portfolio: below WARNING is a warning, below CRITICAL critical
+LIQUIDITY_WARNING = 0.3
+LIQUIDITY_CRITICAL = 0.15
+HISTORY_DAYS = 90
+INITIAL_CAPACITY = 1024
+
+
+class PortfolioStore:
+    """
+    Columnar in-memory store of scored customers for the asset-management
+    dashboard. Each field is a NumPy array indexed by row; customers are
+    upserted by id in batches (bulk-scoring output or the ingestion
+    endpoint).
+
+    Distributions, allocation totals and segment breakdowns are kept as
+    running per-group sums: an upsert subtracts the replaced rows'
+    contributions and adds the new ones with one bincount per category, so
+    reads cost nothing per customer. Lists that need a scan (alerts) are
+    computed on first read after a change and reused until the next one.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._lock = threading.RLock()
+        self._index = {}
+        self.size = 0
+        self.generation = 0
+        self._ids = np.empty(capacity, dtype=object)
+        self._codes = {name: np.zeros(capacity, dtype=np.int8) for name in CATEGORIES}
+        self._credit_score = np.zeros(capacity, dtype=np.int16)
+        self._probability_of_default = np.zeros(capacity)
+        self._health_score = np.zeros(capacity)
+        self._value = np.zeros(capacity, dtype=np.float64)
+        self._allocation = np.zeros((capacity, len(PRODUCT_KEYS)), dtype=np.float32)
+        self._scored_at = np.zeros(capacity, dtype=np.float64)
+        self._sums = {name: np.zeros((len(labels), len(METRICS))) for name, labels in CATEGORIES.items()}
+        self._history = {}
+        self._views = {}
+        self.loading = False
+        self.load_error = None
+
+    # Ingestion
+
+    def ingest(self, frame: "pd.DataFrame", id_column: str = PORTFOLIO_ID_COLUMN,
+               value_column: str = PORTFOLIO_VALUE_COLUMN) -> int:
+        """
+        Upserts scored customers from a frame in app.batch.score_frame's
+        output layout plus an id column and an optional portfolio value
+        column (0 when absent). Returns the number of customers upserted.
+        """
+        if id_column not in frame.columns:
+            raise ValueError(f"Missing customer id column '{id_column}'")
+        # Later rows win when a batch repeats a customer
+        frame = frame.drop_duplicates(subset=id_column, keep='last')
+        ids = frame[id_column].astype(str).to_numpy()
+        codes = {name: _encode(frame[name], CATEGORIES[name]) for name in CATEGORIES if name != "persona"}
+        codes["persona"] = _PERSONA_TABLE[codes["risk_tolerance"], codes["investment_horizon"]]
+        allocation = frame[ALLOCATION_COLUMNS].to_numpy(dtype=np.float32)
+        values = (frame[value_column].to_numpy(dtype=np.float64) if value_column in frame.columns
+                  else np.zeros(len(frame)))
+        credit_score = frame["credit_score"].to_numpy(dtype=np.int16)
+        probability_of_default = frame["probability_of_default"].to_numpy(dtype=np.float64)
+        health_score = frame["financial_health_score"].to_numpy(dtype=np.float64)
+
+        with self._lock:
+            rows, existed = self._locate(ids)
+            self._accumulate(rows[existed], -1)
+            for name, column in codes.items():
+                self._codes[name][rows] = column
+            self._credit_score[rows] = credit_score
+            self._probability_of_default[rows] = probability_of_default
+            self._health_score[rows] = health_score
+            self._value[rows] = values
+            self._allocation[rows] = allocation
+            self._scored_at[rows] = time.time()
+            self._accumulate(rows, 1)
+            self.generation += 1
+            self._views = {}
+            self._record_history()
+        return len(rows)
+
+    def load(self, path: str = PORTFOLIO_DATA_PATH) -> int:
+        """Loads a bulk-scoring output directory (part-*.parquet), or a single Parquet or CSV file."""
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, 'part-*.parquet')))
+        else:
+            files = [path]
+        import pandas as pd
+
+        self.loading = True
+        total = 0
+        try:
+            for file in files:
+                frame = pd.read_parquet(file) if file.endswith('.parquet') else pd.read_csv(file)
+                total += self.ingest(frame)
+            self.load_error = None
+        except Exception as e:
+            self.load_error = f"Failed to load portfolio data from {path}: {e}"
+            print(self.load_error)
+        finally:
+            self.loading = False
+        print(f"Portfolio store: {total} customers loaded from {path}.")
+        return total
+
+    def _locate(self, ids: np.ndarray):
+        # Caller holds the lock. Returns each id's row (new ids get fresh rows)
+        # and whether the row already held that customer.
+        rows = np.empty(len(ids), dtype=np.int64)
+        existed = np.zeros(len(ids), dtype=bool)
+        size = self.size
+        for i, customer_id in enumerate(ids):
+            row = self._index.get(customer_id)
+            if row is None:
+                row = self._index[customer_id] = size
+                size += 1
+            else:
+                existed[i] = True
+            rows[i] = row
+        self._reserve(size)
+        new_rows = rows[~existed]
+        self._ids[new_rows] = ids[~existed]
+        self.size = size
+        return rows, existed
+
+    def _reserve(self, size: int):
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_ids", "_credit_score", "_probability_of_default", "_health_score", "_value",
+                     "_allocation", "_scored_at"):
+            setattr(self, name, _grown(getattr(self, name), capacity))
+        self._codes = {name: _grown(column, capacity) for name, column in self._codes.items()}
+
+    def _accumulate(self, rows: np.ndarray, sign: int):
+        # Adds (sign=1) or removes (sign=-1) the rows' contributions to every group sum
+        if not len(rows):
+            return
+        allocation = self._allocation[rows]
+        values = self._value[rows]
+        contributions = np.empty((len(rows), len(METRICS)))
+        contributions[:, _M["customers"]] = 1
+        contributions[:, _M["investors"]] = values > 0
+        contributions[:, _M["portfolio_value"]] = values
+        contributions[:, _M["credit_score"]] = self._credit_score[rows]
+        contributions[:, _M["financial_health_score"]] = self._health_score[rows]
+        contributions[:, _M["risk_score"]] = allocation @ _RISK_WEIGHTS / 100
+        contributions[:, _M["expected_return"]] = allocation @ ((_RETURN_MIN + _RETURN_MAX) / 2) / 100
+        first_value = _M[f"value_{PRODUCT_KEYS[0]}"]
+        contributions[:, first_value:first_value + len(PRODUCT_KEYS)] = allocation * values[:, None] / 100
+        for name, labels in CATEGORIES.items():
+            codes = self._codes[name][rows]
+            sums = self._sums[name]
+            for m in range(len(METRICS)):
+                sums[:, m] += sign * np.bincount(codes, weights=contributions[:, m], minlength=len(labels))
+
+    def _record_history(self):
+        # Caller holds the lock. Last total AUM of each day.
+        today = datetime.now(timezone.utc).date().isoformat()
+        self._history[today] = float(self._sums["risk_tier"][:, _M["portfolio_value"]].sum())
+        for day in sorted(self._history)[:-HISTORY_DAYS]:
+            del self._history[day]
+
+    def _view(self, key, compute):
+        # Scan-based results, cached until the next ingest
+        with self._lock:
+            generation = self.generation
+            view = self._views.get(key)
+            if view is not None:
+                return view
+        view = compute()
+        with self._lock:
+            if self.generation == generation:
+                self._views[key] = view
+        return view
+
+    # Dashboard reads
+
+    def _totals(self) -> list:
+        with self._lock:
+            return self._sums["risk_tier"].sum(axis=0).tolist()
+
+    def aum(self) -> dict:
+        totals = self._totals()
+        with self._lock:
+            history = [{"date": day, "value": round(value, 2)} for day, value in sorted(self._history.items())]
+        total = totals[_M["portfolio_value"]]
+        investors = int(round(totals[_M["investors"]]))
+        # Growth since the oldest snapshot kept
+        start = history[0]["value"] if len(history) > 1 else 0.0
+        return {
+            "totalAUM": round(total, 2),
+            "aumGrowth": round((total - start) / start * 100, 2) if start else 0.0,
+            "activeInvestors": investors,
+            "averagePortfolioSize": round(total / investors, 2) if investors else 0.0,
+            "productDistribution": [
+                {
+                    "productType": PRODUCTS[key]["product_type"],
+                    "value": round(totals[_M[f"value_{key}"]], 2),
+                    "percentage": round(totals[_M[f"value_{key}"]] / total * 100, 2) if total else 0.0
+                }
+                for key in PRODUCT_KEYS
+            ],
+            "aumHistory": history,
+            "customers": int(round(totals[_M["customers"]]))
+        }
+
+    def distribution(self, category: str) -> dict:
+        with self._lock:
+            counts = self._sums[category][:, _M["customers"]].round().astype(int).tolist()
+        return dict(zip(CATEGORIES[category], counts))
+
+    def risk_metrics(self, limit: int = 20) -> dict:
+        totals = self._totals()
+        customers = totals[_M["customers"]]
+        tolerance = self.distribution("risk_tolerance")
+        return {
+            "averageRiskScore": round(totals[_M["risk_score"]] / customers, 2) if customers else 0.0,
+            "riskDistribution": {level: tolerance[t] for level, t in zip(RISK_LEVELS, RISK_TOLERANCES)},
+            "concentrationAlerts": self._view(("concentration", limit), lambda: self._concentration_alerts(limit)),
+            "liquidityStressIndicators": self._view(("liquidity", limit), lambda: self._liquidity_indicators(limit)),
+            "creditRiskTierDistribution": self.distribution("risk_tier"),
+            "healthBandDistribution": self.distribution("health_band"),
+            "investmentHorizonDistribution": self.distribution("investment_horizon")
+        }
+
+    def segments(self, by: str = "persona") -> list:
+        """Per-group count, AUM, average portfolio risk and expected return, credit and health scores."""
+        with self._lock:
+            sums = self._sums[by].tolist()
+        out = []
+        for label, row in zip(CATEGORIES[by], sums):
+            count = row[_M["customers"]]
+            out.append({
+                "segment": label,
+                "count": int(round(count)),
+                "totalAUM": round(row[_M["portfolio_value"]], 2),
+                "averageRiskScore": round(row[_M["risk_score"]] / count, 2) if count else 0.0,
+                "averageReturns": round(row[_M["expected_return"]] / count, 2) if count else 0.0,
+                "averageCreditScore": round(row[_M["credit_score"]] / count, 2) if count else 0.0,
+                "averageFinancialHealthScore": round(row[_M["financial_health_score"]] / count, 2) if count else 0.0
+            })
+        return out
+
+    def _rows(self, offset: int, limit: int) -> np.ndarray:
+        with self._lock:
+            return np.arange(offset, min(offset + limit, self.size))
+
+    def _row_of(self, customer_id: str):
+        with self._lock:
+            return self._index.get(customer_id)
+
+    def profiles(self, offset: int = 0, limit: int = 100) -> dict:
+        rows = self._rows(offset, limit)
+        return {"total": self.size, "offset": offset, "items": [self._profile(r) for r in rows.tolist()]}
+
+    def profile(self, customer_id: str):
+        row = self._row_of(customer_id)
+        return None if row is None else self._profile(row)
+
+    def recommendations(self, offset: int = 0, limit: int = 100) -> dict:
+        rows = self._rows(offset, limit)
+        return {"total": self.size, "offset": offset, "items": [self._recommendation(r) for r in rows.tolist()]}
+
+    def recommendation(self, customer_id: str):
+        row = self._row_of(customer_id)
+        return None if row is None else self._recommendation(row)
+
+    def _profile(self, row: int) -> dict:
+        customer_id = self._ids[row]
+        return {
+            "id": f"inv-{customer_id}",
+            "customerId": customer_id,
+            "financialHealthScore": float(self._health_score[row]),
+            "healthBand": HEALTH_BANDS[self._codes["health_band"][row]],
+            "riskTolerance": RISK_LEVELS[self._codes["risk_tolerance"][row]],
+            "investorPersona": INVESTOR_PERSONAS[self._codes["persona"][row]],
+            "investmentHorizon": INVESTMENT_HORIZONS[self._codes["investment_horizon"][row]],
+            "creditScore": int(self._credit_score[row]),
+            "riskTier": RISK_TIERS[self._codes["risk_tier"][row]],
+            "probabilityOfDefault": float(self._probability_of_default[row]),
+            "portfolioValue": float(self._value[row]),
+            "updatedAt": _iso(self._scored_at[row])
+        }
+
+    def _recommendation(self, row: int) -> dict:
+        customer_id = self._ids[row]
+        allocation = self._allocation[row].astype(np.float64)
+        percentages = _percent(allocation)
+        value = float(self._value[row])
+        horizon = INVESTMENT_HORIZONS[self._codes["investment_horizon"][row]]
+        return {
+            "id": f"rec-{customer_id}",
+            "customerId": customer_id,
+            "suggestedAllocation": [
+                {
+                    "productType": PRODUCTS[key]["product_type"],
+                    "percentage": pct,
+                    "currentValue": round(value * pct / 100, 2),
+                    "targetPercentage": pct
+                }
+                for key, pct in zip(PRODUCT_KEYS, percentages)
+            ],
+            "expectedReturnRange": {
+                "min": round(float(allocation @ _RETURN_MIN) / 100, 2),
+                "max": round(float(allocation @ _RETURN_MAX) / 100, 2)
+            },
+            "overallRiskLevel": RISK_LEVELS[self._codes["risk_tolerance"][row]],
+            "investmentHorizon": horizon,
+            "liquidityNeeds": LIQUIDITY_NEEDS[horizon],
+            "generatedAt": _iso(self._scored_at[row]),
+            "status": "pending"
+        }
+
+    def _snapshot(self):
+        with self._lock:
+            size = self.size
+            return self._ids[:size], self._allocation[:size], self._value[:size]
+
+    def _concentration_alerts(self, limit: int) -> list:
+        ids, allocation, values = self._snapshot()
+        # Cash (money market) holdings are not a concentration risk
+        holdings = allocation[:, 1:]
+        product = holdings.argmax(axis=1)
+        concentration = holdings[np.arange(len(holdings)), product]
+        flagged = np.flatnonzero(concentration > CONCENTRATION_THRESHOLD)
+        # Largest exposures first
+        exposure = concentration[flagged] * values[flagged]
+        flagged = flagged[np.argsort(-exposure, kind='stable')[:limit]]
+        alerts = []
+        for row in flagged.tolist():
+            key = PRODUCT_KEYS[1 + product[row]]
+            share = _percent(concentration[row])
+            alerts.append({
+                "id": f"alert-{ids[row]}-{key}",
+                "customerId": ids[row],
+                "productType": PRODUCTS[key]["product_type"],
+                "concentration": share,
+                "threshold": CONCENTRATION_THRESHOLD,
+                "severity": "high" if share >= 80 else "medium" if share >= 70 else "low"
+            })
+        return alerts
+
+    def _liquidity_indicators(self, limit: int) -> list:
+        ids, allocation, values = self._snapshot()
+        ratio = allocation[:, 0] / 100
+        stressed = np.flatnonzero((ratio < LIQUIDITY_WARNING) & (values > 0))
+        # Least liquid first, larger portfolios first among equals
+        order = np.lexsort((-values[stressed], ratio[stressed]))[:limit]
+        indicators = []
+        for row in stressed[order].tolist():
+            liquidity_ratio = _percent(allocation[row, 0]) / 100
+            indicators.append({
+                "id": f"liquidity-{ids[row]}",
+                "customerId": ids[row],
+                "liquidAssets": round(float(values[row]) * liquidity_ratio, 2),
+                "totalAssets": float(values[row]),
+                "liquidityRatio": round(liquidity_ratio, 4),
+                "status": "critical" if liquidity_ratio < LIQUIDITY_CRITICAL else "warning"
+            })
+        return indicators
+
+
+def _percent(values):
+    # Allocations are stored as float32; the investment model gives them to one
+    # decimal, so rounding drops float32 noise such as 5.800000190734863
+    return np.round(np.asarray(values, dtype=np.float64), 2).tolist()
+
+
+def _encode(labels: "pd.Series", categories: list) -> np.ndarray:
+    import pandas as pd
+
+    codes = pd.Categorical(labels, categories=categories).codes
+    if (codes < 0).any():
+        unknown = sorted(set(labels[codes < 0].astype(str)))
+        raise ValueError(f"Unknown {labels.name} values {unknown}, expected one of {categories}")
+    return codes.astype(np.int8)
+
+
+def _grown(column: np.ndarray, capacity: int) -> np.ndarray:
+    out = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+    out[:len(column)] = column
+    return out
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+portfolio_store = PortfolioStore()
@@ -0,0 +1,53 @@
+"""
+What-if scenarios for one applicant. Each perturbation is one axis of a grid
+of changes to the raw inputs; expand_scenarios turns the applicant and the
+grid into a raw-feature matrix with one row per grid point, so the whole
+grid is scored in a single vectorized pass.
+"""
+import numpy as np
+from app.schemas.credit import CreditScoreRequest
+from app.services.feature_engineering import (
+    records_to_matrix, RAW_FEATURES, BILL_COLS, PAY_AMT_COLS, PAY_STATUS_COLS
+)
+
+# Perturbation fields that stand for all six months at once
+FIELD_GROUPS = {
+    "PAY_AMT": PAY_AMT_COLS,
+    "BILL_AMT": BILL_COLS,
+    "PAY_STATUS": PAY_STATUS_COLS
+}
+# Integer inputs (AGE, categories, PAY_x statuses) are rounded after perturbing
+_INT_COLUMNS = np.array([RAW_FEATURES.index(f) for f, info in CreditScoreRequest.model_fields.items()
+                         if info.annotation is int])
+
+
+def field_columns(field: str) -> list:
+    """RAW_FEATURES indices changed by a perturbation of field."""
+    return [RAW_FEATURES.index(c) for c in FIELD_GROUPS.get(field, [field])]
+
+
+def expand_scenarios(record: dict, perturbations: list):
+    """
+    Raw (1 + n_scenarios, len(RAW_FEATURES)) matrix: the unchanged applicant,
+    then the grid in C order (the last perturbation varies fastest). Each
+    perturbation is a dict with field, mode ("percent", "absolute" or "set")
+    and values; perturbations of the same field apply in order. Returns the
+    matrix and the grid shape.
+    """
+    base = records_to_matrix([record])[0]
+    shape = tuple(len(p["values"]) for p in perturbations)
+    grids = np.meshgrid(*[np.asarray(p["values"], dtype=np.float64) for p in perturbations], indexing='ij')
+    n = int(np.prod(shape))
+    raw = np.tile(base, (1 + n, 1))
+    grid = raw[1:]
+    for p, values in zip(perturbations, grids):
+        columns = field_columns(p["field"])
+        values = values.reshape(-1, 1)
+        if p["mode"] == "percent":
+            grid[:, columns] *= 1 + values / 100
+        elif p["mode"] == "absolute":
+            grid[:, columns] += values
+        else:
+            grid[:, columns] = values
+    grid[:, _INT_COLUMNS] = np.rint(grid[:, _INT_COLUMNS])
+    return raw, shape
@@ -1,30 +1,284 @@
 import os
-import pandas as pd
+import threading
 import numpy as np
-from app.services.feature_engineering import compute_features
-from app.utils.preprocessing import load_and_preprocess_data
+from app.services.feature_engineering import (
+    compute_features, compute_feature_matrix, records_to_matrix, FeatureRow, FEATURE_INDEX, FEATURE_COLUMNS,
+    RAW_FEATURES
+)
 from app.models.credit_model import CreditScoringModel
-from app.models.investment_model import InvestmentModel
+from app.models.investment_model import (
+    InvestmentModel, INVESTMENT_FEATURES, INVESTMENT_INDEX, RISK_TOLERANCES, rules_risk_tolerance
+)
+from app.models.registry import ModelRegistry
+from app.services.cache import result_cache
+from app.services.metrics import metrics, stage_timer, set_model_version
+from app.services.shadow import ShadowScorer
+from app.services.applicants import ApplicantStore
+from app.services.scenarios import expand_scenarios
+from app.services.drift import DriftMonitor, build_reference_profile, save_reference_profile
+from app.services.explainability import (
+    build_global_explanations, load_global_explanations, DEFAULT_CHUNK_SIZE as EXPLAIN_CHUNK_SIZE
+)
+from app.config import (
+    CREDIT_INFERENCE_ENGINE, CREDIT_EXPLANATION_MODE, MODEL_REGISTRY_DIR, INVESTMENT_MODEL_DIR, MODEL_WATCH_INTERVAL_SECONDS,
+    SHADOW_SAMPLE_RATE, SHADOW_MAX_QUEUE, APPLICANT_STORE_ENABLED, APPLICANT_STORE_PATH, APPLICANT_WRITE_BATCH,
+    APPLICANT_WRITE_INTERVAL_MS, APPLICANT_WRITE_MAX_QUEUE, DRIFT_MONITOR_ENABLED, DRIFT_MIN_ROWS, DRIFT_PSI_WARN,
+    DRIFT_PSI_ALERT
+)
 
 # Paths
 MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models', 'saved_models')
 CREDIT_MODEL_PATH = os.path.join(MODEL_DIR, 'credit_xgboost.pkl')
 EXPLAINER_PATH = os.path.join(MODEL_DIR, 'shap_explainer.pkl')
+CREDIT_BUNDLE_DIR = os.path.join(MODEL_DIR, 'credit_xgboost')
+# Risk-tolerance classifier (python -m app.train_investment); rules are used while absent
+INVESTMENT_BUNDLE_DIR = INVESTMENT_MODEL_DIR or os.path.join(MODEL_DIR, 'investment_lgbm')
+# Trained versions and the CURRENT/SHADOW pointers. Until CURRENT is set the
+# bundle shipped in CREDIT_BUNDLE_DIR is served.
+REGISTRY_DIR = MODEL_REGISTRY_DIR or os.path.join(MODEL_DIR, 'registry')
 
-if not os.path.exists(MODEL_DIR):
-    os.makedirs(MODEL_DIR)
+# Tier thresholds come with the model (CreditScoringModel.risk_tier_thresholds)
+RISK_TIERS = ["LOW", "MEDIUM", "HIGH"]
+LOAN_MULTIPLIERS = np.array([1.5, 0.8, 0.2])
+TENOR_MONTHS = np.array([36, 24, 12])
+# Financial health bands: Strong from 80, Moderate from 50, Fragile below
+HEALTH_BANDS = ["Strong", "Moderate", "Fragile"]
+HEALTH_BAND_THRESHOLDS = [80, 50]
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when a request needs the credit model before it has been loaded."""
 
 class ScoringService:
-    def __init__(self):
-        self.credit_model = CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH)
-        self.investment_model = InvestmentModel()
-        
-        # Initialize
-        if not self.credit_model.load():
-            print("Credit Model not found. Training from scratch...")
-            self.train_credit_model()
+    def __init__(self, engine: str = CREDIT_INFERENCE_ENGINE, registry_dir: str = REGISTRY_DIR):
+        self.engine = engine
+        self.registry = ModelRegistry(registry_dir)
+        self.credit_model = self._new_credit_model(CREDIT_BUNDLE_DIR)
+        self.investment_model = InvestmentModel(INVESTMENT_BUNDLE_DIR)
+        # Cached results are keyed on the model version; drop other versions on every change
+        self.credit_model.on_change(result_cache.retain_version)
+        self.credit_model.on_change(set_model_version)
+        # Candidate model scoring a share of live traffic in the background
+        self.shadow = ShadowScorer(RISK_TIERS, SHADOW_SAMPLE_RATE, SHADOW_MAX_QUEUE)
+        # Scored applicants for the dashboard, written in the background once started
+        self.applicants = ApplicantStore(
+            RISK_TIERS, APPLICANT_STORE_PATH, APPLICANT_WRITE_BATCH, APPLICANT_WRITE_INTERVAL_MS / 1000,
+            APPLICANT_WRITE_MAX_QUEUE, enabled=APPLICANT_STORE_ENABLED
+        )
+        # Feature distributions of live traffic against the training data
+        self.drift = DriftMonitor(DRIFT_MIN_ROWS, DRIFT_PSI_WARN, DRIFT_PSI_ALERT, enabled=DRIFT_MONITOR_ENABLED)
+        self._watcher = None
+        self._watch_stop = threading.Event()
+        # Serializes swaps with pointer updates so the watcher never undoes an admin change
+        self._registry_lock = threading.RLock()
+        # Registry version that last failed to load; the watcher does not retry it
+        self._failed_version = None
+        # The model is loaded by load(), called from the app lifespan or lazily
+        # by the first scoring request. Serving never trains.
+        self.load_error = None
+        self._load_lock = threading.Lock()
+
+    def load(self) -> bool:
+        """
+        Loads the registry's CURRENT version, or the shipped bundle while the
+        registry has none. Returns False (and sets load_error) if unavailable.
+        """
+        with self._load_lock:
+            if self.ready:
+                return True
+            try:
+                current = self.registry.current()
+                if current is not None:
+                    self._install(self._load_version(current))
+                found = self.ready or self.credit_model.load()
+            except Exception as e:
+                self.load_error = f"Failed to load credit model: {e}"
+                print(self.load_error)
+                return False
+            if not found:
+                self.load_error = (
+                    f"No credit model found in {MODEL_DIR}. Train one offline with `python -m app.train`."
+                )
+                print(self.load_error)
+                return False
+            self.load_error = None
+            print(f"Credit model {self.credit_model.version} loaded.")
+            self._load_investment_model()
+        shadow = self.registry.shadow()
+        if shadow is not None:
+            try:
+                self.set_shadow(shadow)
+            except Exception as e:
+                print(f"Shadow model {shadow} could not be loaded: {e}")
+        return True
+
+    def _load_investment_model(self):
+        try:
+            if self.investment_model.load():
+                print(f"Investment model {self.investment_model.version} loaded.")
+        except Exception as e:
+            print(f"Investment model could not be loaded ({e}). Using risk tolerance rules.")
+
+    def _new_credit_model(self, bundle_dir: str) -> CreditScoringModel:
+        return CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH, engine=self.engine, bundle_dir=bundle_dir)
+
+    def _load_version(self, version: str) -> CreditScoringModel:
+        """Loads a registry version into a new model object, warmed up and ready to serve."""
+        model = self._new_credit_model(self.registry.bundle_dir(version))
+        if not model.load():
+            raise ValueError(f"Model bundle {version} is incomplete")
+        if model.version != version:
+            raise ValueError(f"Model bundle {version} holds model {model.version}")
+        # First-request costs (XGBoost predictor setup, exact SHAP explainer) are paid here
+        probe = np.zeros((1, len(model.features)), dtype=np.float32)
+        model.predict(probe)
+        if CREDIT_EXPLANATION_MODE != "none":
+            model.explain_batch(probe, CREDIT_EXPLANATION_MODE)
+        return model
+
+    def _install(self, model: CreditScoringModel):
+        # A single reference assignment: requests already holding the previous
+        # model finish on it, new ones get this one.
+        self.credit_model = model
+        for callback in (result_cache.retain_version, set_model_version):
+            model.on_change(callback)
+            callback(model.version)
+
+    def activate(self, version: str, persist: bool = False) -> str:
+        """
+        Hot-swaps the live model for a registry version without interrupting
+        requests. persist also points the registry's CURRENT at it, which
+        moves every other worker through their watchers.
+        """
+        with self._registry_lock, self._load_lock:
+            previous = self.credit_model.version
+            try:
+                model = self._load_version(version)
+            except Exception:
+                self._failed_version = version
+                raise
+            if persist:
+                self.registry.set_current(version)
+            self._install(model)
+            self._failed_version = None
+            self.load_error = None
+        print(f"Credit model {previous} replaced by {model.version}.")
+        return model.version
+
+    def set_shadow(self, version: str = None, persist: bool = False):
+        """
+        Scores a share of live traffic with a registry version in the
+        background; None stops it. persist also updates the registry's SHADOW.
+        """
+        with self._registry_lock:
+            model = self._load_version(version) if version is not None else None
+            if persist:
+                self.registry.set_shadow(version)
+            self.shadow.set_model(model)
+        print(f"Shadow model set to {version}." if version else "Shadow scoring stopped.")
+
+    def sync_registry(self):
+        """Brings the live and shadow models in line with the registry's CURRENT and SHADOW pointers."""
+        with self._registry_lock:
+            self._sync_registry()
+
+    def _sync_registry(self):
+        current, shadow = self.registry.pointers()
+        if current is not None and current != self.model_version and current != self._failed_version:
+            try:
+                self.activate(current)
+            except Exception as e:
+                print(f"Could not activate model {current} from the registry: {e}")
+        if shadow != self.shadow.version:
+            try:
+                self.set_shadow(shadow)
+            except Exception as e:
+                print(f"Could not load shadow model {shadow} from the registry: {e}")
+                # Stop comparing against a model the registry no longer points at
+                self.shadow.set_model(None)
+
+    def watch_registry(self, interval: float = MODEL_WATCH_INTERVAL_SECONDS):
+        """Starts a thread that polls the registry pointers every interval seconds (0 = off)."""
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._watch_stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._watch_stop.set()
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._watch_stop.wait(interval):
+            # Wait for the initial load before following the pointers
+            if self.ready:
+                self.sync_registry()
+
+    @property
+    def ready(self) -> bool:
+        # version is set last, once the model is compiled and servable
+        return self.credit_model.version is not None
+
+    def _require_model(self):
+        # Blocks behind an in-flight background load, or loads lazily
+        if not self.ready and not self.load():
+            raise ModelNotReadyError(self.load_error or "Credit model is not loaded yet")
+
+    @property
+    def model_version(self):
+        return self.credit_model.version
+
+    @property
+    def investment_model_version(self) -> str:
+        """Version of the risk-tolerance classifier, or "rules" while none is loaded."""
+        return self.investment_model.version or "rules"
+
+    def train_credit_model(self, **search_options):
+        """
+        Retrains the credit model; search_options (trials, folds, workers,
+        force) go to training.train_and_promote. Returns its metrics report.
+        """
+        from app.services.training import train_and_promote
+
+        # The incumbent is the registry's CURRENT version, not just the shipped bundle
+        self.load()
+        df, y, final_cols = self._training_data()
+        # Train: hyperparameter search + CV, registered and promoted only if it beats the current model
+        return train_and_promote(self.credit_model, df, y, final_cols, self.registry, **search_options)
+
+    def train_investment_model(self, label_column: str = "risk_tolerance", params: dict = None) -> dict:
+        """
+        Trains the risk-tolerance classifier on the training data, scored by
+        the live credit model. Labels come from label_column (RISK_TOLERANCES
+        values) when the data has it, else from the financial-health rules.
+        Returns the training metadata.
+        """
+        self._require_model()
+        df, _, _ = self._training_data()
+        features = compute_feature_matrix(df.reindex(columns=RAW_FEATURES, fill_value=0).to_numpy(dtype=np.float64))
+        X = np.empty((len(features), len(INVESTMENT_FEATURES)))
+        X[:, :len(FEATURE_COLUMNS)] = features
+        X[:, INVESTMENT_INDEX["credit_score"]] = self.score_arrays(features)["credit_score"]
+        X[:, INVESTMENT_INDEX["financial_health_score"]] = self.financial_health_arrays(features)["financial_health_score"]
+        if label_column in df.columns:
+            y = df[label_column].map({name: i for i, name in enumerate(RISK_TOLERANCES)})
+            if y.isna().any():
+                raise ValueError(f"{label_column} must only hold {RISK_TOLERANCES}")
+            y, labels = y.to_numpy(dtype=int), label_column
+        else:
+            print(f"No {label_column} column in the training data; labelling with the financial-health rules.")
+            y, labels = rules_risk_tolerance(X[:, INVESTMENT_INDEX["financial_health_score"]]), "rules"
+        model = InvestmentModel(self.investment_model.bundle_dir)
+        metadata = model.train(X, y, params, labels)
+        self.investment_model = model
+        return {**metadata, "model_version": model.version}
+
+    def _training_data(self):
+        """Training frame with engineered features, its target and the model's feature columns."""
+        from app.utils.preprocessing import load_and_preprocess_data
 
-    def train_credit_model(self):
         # 1. Load Data
         df = load_and_preprocess_data()
         
@@ -48,68 +302,199 @@ class ScoringService:
         
         final_cols = [c for c in feature_cols if c in df.columns]
         
-        X = df[final_cols]
         y = df[target]
-        
-        # Train
-        self.credit_model.train(X, y, final_cols)
-        print("Model trained and saved.")
+        return df, y, final_cols
+
+    def build_global_explanations(self, version: str = None, chunk_size: int = None, workers: int = None) -> dict:
+        """
+        Precomputes SHAP values and their global summaries over the training
+        data for a registered version (default: the live model). See
+        app.services.explainability.
+        """
+        if version is not None:
+            model = self._load_version(version)
+        else:
+            self._require_model()
+            model = self.credit_model
+        df, _, _ = self._training_data()
+        X = np.ascontiguousarray(df[model.features], dtype=np.float32)
+        return build_global_explanations(model, X, RISK_TIERS, chunk_size or EXPLAIN_CHUNK_SIZE, workers)
+
+    def build_reference_profile(self, version: str = None) -> dict:
+        """
+        (Re)writes the drift reference profile of a registered version (default:
+        the live model) from the training data. Training writes it for every
+        new version; this covers bundles trained before profiles existed.
+        """
+        if version is not None:
+            model = self._load_version(version)
+        else:
+            self._require_model()
+            model = self.credit_model
+        df, _, _ = self._training_data()
+        profile = build_reference_profile(df, model.version)
+        save_reference_profile(profile, model.bundle_dir)
+        return profile
+
+    def drift_report(self):
+        """Drift of live traffic against the live model's reference profile, or None without one."""
+        self._require_model()
+        return self.drift.report(self.credit_model)
+
+    def global_explanations(self):
+        """Precomputed global explanations of the live model, or None if not computed for it."""
+        self._require_model()
+        model = self.credit_model
+        summary, _ = result_cache.get_or_compute(
+            "global_explanations", {}, model.version, lambda: load_global_explanations(model)
+        )
+        return summary
+
+    def predict_credit_score(self, input_features: dict, explanation: str = CREDIT_EXPLANATION_MODE,
+                             timings: dict = None):
+        """
+        Scores one applicant. explanation is "none", "fast" or "exact"; when a
+        timings dict is passed, per-stage latencies in ms are written into it.
+        """
+        return self.predict_credit_scores([input_features], explanation, timings, include_features=True)[0]
+
+    def predict_credit_scores(self, records: list, explanation: str = CREDIT_EXPLANATION_MODE,
+                              timings: dict = None, include_features: bool = False):
+        """
+        Scores many applicants at once. Feature engineering, prediction and
+        SHAP each run a single time over the whole matrix. include_features
+        adds each row's engineered features as "_derived_features" (a
+        FeatureRow over the batch matrix).
+        """
+        if not records:
+            return []
+        # Compute derived features on the raw array
+        with stage_timer("features", timings):
+            features = compute_feature_matrix(records_to_matrix(records))
+        results = self._score_matrix(features, explanation, timings)
+        if include_features:
+            for i, result in enumerate(results):
+                result["_derived_features"] = FeatureRow(features, i)
+        return results
+
+    def score_arrays(self, features: np.ndarray, model: CreditScoringModel = None) -> dict:
+        """
+        Columnar credit scoring for a (n_rows, len(FEATURE_COLUMNS)) matrix.
+        Returns a dict of per-row arrays; risk_tier holds indices into RISK_TIERS.
+        model defaults to the live credit model.
+        """
+        self._require_model()
+        model = model or self.credit_model
+        # Model inputs in training column order
+        X = features[:, [FEATURE_INDEX[f] for f in model.features]]
 
-    def predict_credit_score(self, input_features: dict):
-        # Convert dict to DataFrame
-        df = pd.DataFrame([input_features])
-        
-        # Compute derived features
-        df_processed = compute_features(df)
-        
         # Predict Prob
-        pd_prob = self.credit_model.predict(df_processed)[0]
+        pd_probs = model.predict(X)
         
         # Logic
-        credit_score = int(round((1 - pd_prob) * 100))
-        
-        if pd_prob <= 0.25:
-            risk_tier = "LOW"
-        elif pd_prob <= 0.55:
-            risk_tier = "MEDIUM"
-        else:
-            risk_tier = "HIGH"
-            
-        limit = input_features.get('LIMIT_BAL', 0)
-        if risk_tier == "LOW":
-            rec_loan = limit * 1.5
-            tenure = 36
-        elif risk_tier == "MEDIUM":
-            rec_loan = limit * 0.8
-            tenure = 24
-        else:
-            rec_loan = limit * 0.2
-            tenure = 12
+        tier_idx = np.digitize(pd_probs, model.risk_tier_thresholds, right=True)
+        return {
+            "model_inputs": X,
+            "credit_score": np.rint((1 - pd_probs) * 100).astype(int),
+            "probability_of_default": pd_probs,
+            "risk_tier": tier_idx,
+            "recommended_loan_amount": features[:, FEATURE_INDEX['LIMIT_BAL']] * LOAN_MULTIPLIERS[tier_idx],
+            "recommended_tenor_months": TENOR_MONTHS[tier_idx]
+        }
+
+    def _score_matrix(self, features: np.ndarray, explanation: str = CREDIT_EXPLANATION_MODE,
+                      timings: dict = None):
+        self._require_model()
+        # One model for the whole batch, even if a hot-swap happens meanwhile
+        model = self.credit_model
+        with stage_timer("predict", timings):
+            scored = self.score_arrays(features, model)
+        self.shadow.submit(features, model.version, scored["probability_of_default"], scored["risk_tier"])
+        self.drift.observe(features, model)
+        X = scored["model_inputs"]
+        pd_probs = scored["probability_of_default"]
+        credit_scores = scored["credit_score"]
+        tier_idx = scored["risk_tier"]
+        rec_loans = scored["recommended_loan_amount"]
+        tenures = scored["recommended_tenor_months"]
             
         # Explainability
-        shap_values = self.credit_model.explain(df_processed)
-        feature_names = self.credit_model.features
-        
-        feature_impact = dict(zip(feature_names, shap_values))
-        sorted_impact = sorted(feature_impact.items(), key=lambda x: x[1], reverse=True)
-        
-        top_positive = [{"feature": k, "impact": float(v)} for k, v in sorted_impact[:3] if v > 0]
-        top_negative = [{"feature": k, "impact": float(v)} for k, v in sorted_impact[-3:] if v < 0]
+        explainability = [None] * len(pd_probs)
+        if explanation != "none":
+            with stage_timer("explain", timings):
+                shap_values = model.explain_batch(X, explanation)
+                top_positive, top_negative = self._top_factors(shap_values, model.features)
+                explainability = [
+                    {"top_positive_factors": pos, "top_negative_factors": neg}
+                    for pos, neg in zip(top_positive, top_negative)
+                ]
+        self.applicants.submit(features, model.version, scored, explainability)
+
+        return [
+            {
+                "credit_score": int(credit_scores[i]),
+                "probability_of_default": float(pd_probs[i]),
+                "risk_tier": RISK_TIERS[tier_idx[i]],
+                "recommended_loan_amount": float(rec_loans[i]),
+                "recommended_tenor_months": int(tenures[i]),
+                "explainability": explainability[i]
+            }
+            for i in range(len(pd_probs))
+        ]
+
+    def _top_factors(self, shap_values: np.ndarray, feature_names: list, k: int = 3):
+        """
+        Picks the k largest positive and k largest negative SHAP impacts per row.
+        Ordering matches a stable descending sort of each row.
+        """
+        order = np.argsort(-shap_values, axis=1, kind='stable')
+        pos_idx = order[:, :k]
+        neg_idx = order[:, -k:]
+        pos_vals = np.take_along_axis(shap_values, pos_idx, axis=1)
+        neg_vals = np.take_along_axis(shap_values, neg_idx, axis=1)
+
+        top_positive = [
+            [{"feature": feature_names[j], "impact": float(v)} for j, v in zip(idx, vals) if v > 0]
+            for idx, vals in zip(pos_idx, pos_vals)
+        ]
+        top_negative = [
+            [{"feature": feature_names[j], "impact": float(v)} for j, v in zip(idx, vals) if v < 0]
+            for idx, vals in zip(neg_idx, neg_vals)
+        ]
+        return top_positive, top_negative
+
+    def assess_applicant(self, input_features: dict, explanation: str = CREDIT_EXPLANATION_MODE,
+                         timings: dict = None):
+        """
+        Credit score, financial health and asset recommendation in one pass.
+        Feature engineering runs once; financial health reuses the credit
+        result's _derived_features.
+        """
+        return self.complete_assessment(input_features, self.predict_credit_score(input_features, explanation, timings))
 
+    def complete_assessment(self, input_features: dict, credit: dict):
+        """Adds financial health and asset recommendation to a credit result carrying _derived_features."""
+        features = credit.pop("_derived_features")
+        health = self.calculate_financial_health(features)
+        asset = self.get_asset_recommendation({
+            "financial_health_score": health["financial_health_score"],
+            "credit_score": credit["credit_score"],
+            "risk_tier": credit["risk_tier"],
+            "LIMIT_BAL": input_features.get("LIMIT_BAL", 0),
+            "AGE": input_features.get("AGE", 30)
+        }, features.values())
         return {
-            "credit_score": credit_score,
-            "probability_of_default": float(pd_prob),
-            "risk_tier": risk_tier,
-            "recommended_loan_amount": float(rec_loan),
-            "recommended_tenor_months": tenure,
-            "explainability": {
-                "top_positive_factors": top_positive,
-                "top_negative_factors": top_negative
-            },
-            "_derived_features": df_processed.iloc[0].to_dict()
+            "credit": credit,
+            "financial_health": health,
+            "asset_recommendation": asset
         }
 
+    @stage_timer("financial_health")
     def calculate_financial_health(self, features: dict):
+        """
+        features: engineered features by name, as a dict or a FeatureRow.
+        financial_health_arrays is the columnar version for feature matrices.
+        """
         lpc = features.get('late_payment_count', 0)
         cu = features.get('credit_utilization', 0)
         # Note: API might pass 'cashflow_volatility' directly or we computed it.
@@ -134,18 +519,113 @@ class ScoringService:
             "health_band": band
         }
     
-    def get_asset_recommendation(self, profile: dict):
-        fhs = profile.get('financial_health_score', 0)
-        age = profile.get('AGE', 30)
-        
-        risk = self.investment_model.predict_risk_tolerance(fhs)
-        horizon = self.investment_model.predict_investment_horizon(age)
-        alloc = self.investment_model.recommend_allocation(risk)
-            
+    def financial_health_arrays(self, features: np.ndarray) -> dict:
+        """
+        Columnar calculate_financial_health for a (n_rows, len(FEATURE_COLUMNS))
+        matrix, with identical results. health_band holds indices into HEALTH_BANDS.
+        """
+        lpc = features[:, FEATURE_INDEX['late_payment_count']]
+        cu = features[:, FEATURE_INDEX['credit_utilization']]
+        cv = features[:, FEATURE_INDEX['cashflow_volatility']]
+        aba = features[:, FEATURE_INDEX['avg_bill_amt']]
+        aba = np.where(aba == 0, 1, aba)
+        pc = features[:, FEATURE_INDEX['payment_consistency']]
+
+        score = np.clip(100 - (lpc * 10) - (cu * 25) - ((cv / aba) * 20) + (pc * 20), 0, 100)
         return {
-            "risk_tolerance": risk,
-            "investment_horizon": horizon,
-            "portfolio_allocation": alloc
+            "financial_health_score": _round2(score),
+            "health_band": np.digitize(score, HEALTH_BAND_THRESHOLDS)
+        }
+
+    @stage_timer("simulation")
+    def simulate_scenarios(self, record: dict, perturbations: list) -> dict:
+        """
+        Scores a grid of what-if changes to one applicant's inputs (see
+        expand_scenarios) in one pass: feature engineering, the credit model
+        and financial health each run once over every scenario. Results are
+        nested lists shaped like the grid, next to the unchanged applicant's
+        baseline. Scenarios are hypothetical, so they are kept out of the
+        shadow, drift and applicant-store traffic.
+        """
+        self._require_model()
+        model = self.credit_model
+        raw, shape = expand_scenarios(record, perturbations)
+        features = compute_feature_matrix(raw)
+        scored = self.score_arrays(features, model)
+        health = self.financial_health_arrays(features)
+        columns = {
+            "credit_score": scored["credit_score"],
+            "probability_of_default": scored["probability_of_default"],
+            "risk_tier": np.array(RISK_TIERS)[scored["risk_tier"]],
+            "financial_health_score": health["financial_health_score"],
+            "health_band": np.array(HEALTH_BANDS)[health["health_band"]]
         }
+        return {
+            "model_version": model.version,
+            "shape": list(shape),
+            "scenarios": int(np.prod(shape)),
+            "baseline": {name: values[0].item() for name, values in columns.items()},
+            **{name: values[1:].reshape(shape).tolist() for name, values in columns.items()}
+        }
+
+    @stage_timer("asset_recommendation")
+    def get_asset_recommendation(self, profile: dict, features: np.ndarray = None):
+        """
+        profile holds LIMIT_BAL, AGE, credit_score and financial_health_score;
+        features is the applicant's FEATURE_COLUMNS row when it is known.
+        """
+        return self.investment_model.recommend(profile, features)
+
+    def recommend_assets(self, features: np.ndarray, credit_scores: np.ndarray, health_scores: np.ndarray) -> dict:
+        """Columnar asset recommendations for a feature matrix; see InvestmentModel.recommend_batch."""
+        X = np.empty((len(features), len(INVESTMENT_FEATURES)))
+        X[:, :len(FEATURE_COLUMNS)] = features
+        X[:, INVESTMENT_INDEX["credit_score"]] = credit_scores
+        X[:, INVESTMENT_INDEX["financial_health_score"]] = health_scores
+        return self.investment_model.recommend_batch(X)
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    round(value, 2) for every element. np.round scales by 100 first, which
+    rounds some values the other way; here the scaling error is recovered
+    exactly (Dekker's product) to settle values that land on a half.
+    """
+    scaled = values * 100
+    split = values * 134217729.0
+    high = split - (split - values)
+    error = (high * 100 - scaled) + (values - high) * 100
+    rounded = np.rint(scaled)
+    remainder = scaled - rounded
+    rounded += (remainder == 0.5) & (error > 0)
+    rounded -= (remainder == -0.5) & (error < 0)
+    return rounded / 100
 
 scoring_service = ScoringService()
+
+
+def _model_collector():
+    version = scoring_service.model_version
+    shadow = scoring_service.shadow.stats()
+    return [("credit_model_info", "gauge", "Loaded credit model; 1 when ready.",
+             [({"model_version": version or "", "engine": scoring_service.credit_model.engine},
+               1 if version else 0)]),
+            ("shadow_rows_total", "counter", "Rows sampled for the shadow model by outcome.",
+             [({"outcome": outcome}, shadow[outcome]) for outcome in ("scored", "dropped", "errors")]),
+            ("shadow_tier_disagreements_total", "counter", "Shadow-scored rows whose risk tier differs from live.",
+             [({}, shadow["tier_disagreements"])])]
+
+
+def _drift_collector():
+    if not scoring_service.ready:
+        return []
+    report = scoring_service.drift.report(scoring_service.credit_model)
+    if report is None or not report["rows"]:
+        return []
+    return [("drift_rows", "gauge", "Rows in the drift sketches of the live model.", [({}, report["rows"])]),
+            ("feature_drift_psi", "gauge", "Population stability index of a feature against the training data.",
+             [({"feature": f["feature"]}, f["psi"]) for f in report["features"] if f["psi"] is not None])]
+
+
+metrics.register_collector(_model_collector)
+metrics.register_collector(_drift_collector)
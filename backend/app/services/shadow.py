@@ -0,0 +1,126 @@
+import queue
+import threading
+import numpy as np
+from app.services.feature_engineering import FEATURE_INDEX
+from app.services.metrics import metrics
+
+probability_difference = metrics.histogram(
+    "shadow_probability_difference", "Absolute difference between shadow and live probability of default.",
+    ("shadow_version",), buckets=(0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+)
+
+
+class ShadowScorer:
+    """
+    Scores a sample of live traffic with a candidate model, off the request
+    path. submit() only draws the sample and enqueues the feature rows; a
+    background thread scores them with the shadow model and logs every row
+    whose risk tier differs from the live result. When the queue is full,
+    samples are dropped rather than slowing requests down.
+    """
+
+    def __init__(self, tier_names: list, sample_rate: float = 0.1, max_queue: int = 1000):
+        self.tier_names = tier_names
+        self.sample_rate = sample_rate
+        self.model = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    @property
+    def version(self):
+        model = self.model
+        return model.version if model is not None else None
+
+    def set_model(self, model):
+        """Installs the shadow model (None turns shadow scoring off) and resets the comparison stats."""
+        with self._stats_lock:
+            self.model = model
+            self._reset_stats()
+        if model is not None:
+            self.start()
+
+    def _reset_stats(self):
+        self._counters = {"sampled": 0, "scored": 0, "dropped": 0, "errors": 0, "tier_disagreements": 0}
+        self._diff_sum = 0.0
+        self._diff_max = 0.0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._start_lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join(timeout=5)
+                self._thread = None
+
+    def submit(self, features: np.ndarray, live_version: str, live_probs: np.ndarray, live_tiers: np.ndarray):
+        """Samples rows of a scored (n_rows, len(FEATURE_COLUMNS)) matrix for shadow scoring."""
+        model = self.model
+        if model is None or self.sample_rate <= 0:
+            return
+        rows = np.flatnonzero(np.random.random_sample(len(live_probs)) < self.sample_rate)
+        if not len(rows):
+            return
+        try:
+            self._queue.put_nowait((model, features[rows], live_version, live_probs[rows], live_tiers[rows]))
+        except queue.Full:
+            with self._stats_lock:
+                self._counters["dropped"] += len(rows)
+            return
+        with self._stats_lock:
+            self._counters["sampled"] += len(rows)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self._compare(*item)
+
+    def _compare(self, model, features, live_version, live_probs, live_tiers):
+        try:
+            probs = model.predict(features[:, [FEATURE_INDEX[f] for f in model.features]])
+        except Exception as e:
+            print(f"Shadow model {model.version} failed to score {len(features)} rows: {e}")
+            with self._stats_lock:
+                self._counters["errors"] += len(features)
+            return
+        tiers = np.digitize(probs, model.risk_tier_thresholds, right=True)
+        diffs = np.abs(probs - live_probs)
+        for i in np.flatnonzero(tiers != live_tiers):
+            print(f"Shadow model {model.version} disagrees with live {live_version}: "
+                  f"{self.tier_names[live_tiers[i]]} -> {self.tier_names[tiers[i]]} "
+                  f"(PD {live_probs[i]:.4f} -> {probs[i]:.4f})")
+        if metrics.enabled:
+            for diff in diffs.tolist():
+                probability_difference.observe(diff, model.version)
+        with self._stats_lock:
+            # Stats only describe the current shadow model
+            if model is not self.model:
+                return
+            self._counters["scored"] += len(diffs)
+            self._counters["tier_disagreements"] += int(np.count_nonzero(tiers != live_tiers))
+            self._diff_sum += float(diffs.sum())
+            self._diff_max = max(self._diff_max, float(diffs.max()))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            scored = self._counters["scored"]
+            return {
+                "version": self.version,
+                "sample_rate": self.sample_rate,
+                "queue_depth": self._queue.qsize(),
+                **self._counters,
+                "tier_agreement": round(1 - self._counters["tier_disagreements"] / scored, 4) if scored else None,
+                "probability_difference": {
+                    "mean": round(self._diff_sum / scored, 6) if scored else None,
+                    "max": round(self._diff_max, 6)
+                }
+            }
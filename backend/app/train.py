@@ -0,0 +1,36 @@
+"""
+Offline training entry point. The API only loads saved models, so run this
+(or ship a trained bundle) before starting the server:
+
+    python -m app.train [--trials N] [--folds K] [--workers N] [--force] [--skip-explain]
+
+Runs a cross-validated hyperparameter search, refits the best candidate and
+promotes it only if it beats the current model on a hold-out split. The new
+version's global explanations are then precomputed (see app.explain).
+"""
+import argparse
+from app.config import TRAIN_SEARCH_TRIALS, TRAIN_CV_FOLDS, TRAIN_WORKERS
+from app.services.scoring import scoring_service
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m app.train", description="Train the credit model")
+    parser.add_argument("--trials", type=int, default=TRAIN_SEARCH_TRIALS, help="Hyperparameter trials")
+    parser.add_argument("--folds", type=int, default=TRAIN_CV_FOLDS, help="Cross-validation folds")
+    parser.add_argument("--workers", type=int, default=TRAIN_WORKERS, help="CV processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="Promote even if the incumbent scores better")
+    parser.add_argument("--skip-explain", action="store_true", help="Do not precompute global explanations")
+    args = parser.parse_args(argv)
+
+    report = scoring_service.train_credit_model(
+        trials=args.trials, folds=args.folds, workers=args.workers, force=args.force
+    )
+    print(f"Hold-out AUC {report['holdout']['auc']:.4f}, logloss {report['holdout']['logloss']:.4f}, "
+          f"{report['train_seconds']}s, peak RSS {report['peak_rss_mb']['main']} MB "
+          f"(workers {report['peak_rss_mb']['workers']} MB)")
+    if not args.skip_explain:
+        scoring_service.build_global_explanations(report['model_version'], workers=args.workers or None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Offline training of the risk-tolerance classifier behind the asset
+recommendations:
+
+    python -m app.train_investment [--label-column risk_tolerance]
+
+Scores the training data with the live credit model, then fits a LightGBM
+classifier over the engineered features, credit score and financial health
+score, saved to app/models/saved_models/investment_lgbm. Labels come from
+the label column (LOW/MEDIUM/HIGH) when the training data has one, else from
+the financial-health rules. Serving workers load it on their next start.
+"""
+import argparse
+from app.services.scoring import scoring_service
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m app.train_investment",
+                                     description="Train the risk-tolerance classifier")
+    parser.add_argument("--label-column", default="risk_tolerance", help="Training-data column holding the labels")
+    args = parser.parse_args(argv)
+
+    if not scoring_service.load():
+        raise SystemExit(scoring_service.load_error)
+    metadata = scoring_service.train_investment_model(args.label_column)
+    print(f"Investment model {metadata['model_version']} ({metadata['labels']} labels): {metadata['num_trees']} "
+          f"trees, hold-out accuracy {metadata['holdout_accuracy']:.4f}, logloss {metadata['holdout_logloss']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,154 @@
-import pandas as pd
+import hashlib
+import json
 import os
+import shutil
+import numpy as np
+import pandas as pd
+from app.config import TRAINING_DATA_PATH, DATA_CACHE_DIR
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+DATA_PATH = TRAINING_DATA_PATH or os.path.join(DATA_DIR, 'default-of-credit-card-clients.xls')
+CACHE_DIR = DATA_CACHE_DIR or os.path.join(DATA_DIR, '.cache')
+# Bump when the cached layout or the normalization below changes
+CACHE_FORMAT_VERSION = 1
+SOURCE_FORMATS = ('.xls', '.xlsx', '.csv', '.parquet')
+
+# Narrowest dtypes tried per column family; a column keeps its parsed dtype
+# if the cast would change any value.
+_SMALL_INT_COLS = ['SEX', 'EDUCATION', 'MARRIAGE', 'PAY_0', 'PAY_2', 'PAY_3', 'PAY_4', 'PAY_5', 'PAY_6',
+                   'default_payment_next_month']
+_AMOUNT_COLS = ['LIMIT_BAL'] + [f'BILL_AMT{i}' for i in range(1, 7)] + [f'PAY_AMT{i}' for i in range(1, 7)]
 
-DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'default-of-credit-card-clients.xls')
 
-def load_and_preprocess_data():
+def load_and_preprocess_data(path: str = None, use_cache: bool = True) -> pd.DataFrame:
     """
     Loads the dataset, drops ID, and returns a raw DataFrame.
+
+    The source may be the UCI spreadsheet, a CSV or a Parquet file. The
+    first load parses it once and writes one memory-mapped .npy file per
+    column under CACHE_DIR, keyed by the source file's SHA-256; later loads
+    map those files without parsing or copying. Amounts are float32 and
+    small categorical/status columns int8 whenever that is lossless.
     """
-    if not os.path.exists(DATA_PATH):
-        raise FileNotFoundError(f"Dataset not found at {DATA_PATH}")
-
-    # The UCI dataset often has the header on the second row (index 1), with index 0 describing the data types or X1, X2 etc.
-    # Let's verify this by trying to read it. But to be safe, standard loading often works with header=1.
-    # However, if it's the raw file, row 0 is "ID", "LIMIT_BAL"... but sometimes row 0 is "X1", "X2" and row 1 is "ID"...
-    # Let's try to read with header=1 first as that's common for this specific file structure from UCI.
-    # Actually, looking at common versions:
-    # Row 0: "ID", "LIMIT_BAL", ...
-    # Row 1: 1, 20000, ...
-    
-    # We will try to read it. If "ID" is in columns, we drop it.
+    path = path or DATA_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found at {path}")
+    if not use_cache:
+        return _downcast(_normalize(_read_source(path)))
+
+    cache_dir = _cache_dir(path)
+    if not os.path.exists(os.path.join(cache_dir, 'columns.json')):
+        _write_cache(_downcast(_normalize(_read_source(path))), cache_dir)
+    return _read_cache(cache_dir)
+
+
+def _read_source(path: str) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SOURCE_FORMATS:
+        raise ValueError(f"Unsupported dataset format '{ext}', expected one of {SOURCE_FORMATS}")
+    if ext == '.csv':
+        return pd.read_csv(path)
+    if ext == '.parquet':
+        return pd.read_parquet(path)
+
+    # The UCI spreadsheet has either the column names on row 0, or a row of
+    # X1, X2, ... labels above them. Parse once without a header and locate
+    # the row holding "ID"/"LIMIT_BAL".
     try:
-        df = pd.read_excel(DATA_PATH, header=1) # Often header is on row 1 (index 1) which contains names like LIMIT_BAL
-        if 'ID' not in df.columns:
-             # Maybe header was row 0
-             df = pd.read_excel(DATA_PATH, header=0)
+        raw = pd.read_excel(path, header=None)
     except Exception as e:
         raise ValueError(f"Error reading Excel file: {e}")
+    header_row = 0
+    for i in range(min(len(raw), 5)):
+        labels = {str(v).strip().upper() for v in raw.iloc[i]}
+        if 'ID' in labels or 'LIMIT_BAL' in labels:
+            header_row = i
+            break
+    df = raw.iloc[header_row + 1:].reset_index(drop=True)
+    df.columns = [str(c).strip() for c in raw.iloc[header_row]]
+    return df.apply(pd.to_numeric)
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    # Standardize column names to upper case
+    df.columns = [c.upper() for c in df.columns]
 
     # Drop ID if exists
     if 'ID' in df.columns:
         df = df.drop(columns=['ID'])
-        
-    # Also standardize column names to upper case just in case
-    df.columns = [c.upper() for c in df.columns]
-    
-    # Rename 'PAY_0' to 'PAY_1' if necessary? No, prompt uses PAY_0...PAY_6.
-    # But usually dataset has PAY_0, PAY_2,...
-    # Let's keep strict to dataset.
-    
-    # Target variable: "default payment next month" -> rename to "DEFAULT_PAYMENT_NEXT_MONTH" or something simple if needed.
-    # Or keep as is but easier to reference.
-    # Prompt says Target variable: `default payment next month`.
-    # Code below will usually use 'target'.
-    
+
+    # Target variable: "default payment next month" -> default_payment_next_month
     rename_dict = {}
     for col in df.columns:
         if 'default' in col.lower() and 'payment' in col.lower():
             rename_dict[col] = 'default_payment_next_month'
-            
     if rename_dict:
         df = df.rename(columns=rename_dict)
+    return df
 
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col in _SMALL_INT_COLS:
+            target = np.int8
+        elif col in _AMOUNT_COLS:
+            target = np.float32
+        elif col == 'AGE':
+            target = np.int16
+        else:
+            continue
+        with np.errstate(invalid='ignore'):
+            cast = values.astype(target)
+        if np.array_equal(cast, values):
+            df[col] = cast
     return df
+
+
+def _source_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_dir(path: str) -> str:
+    name = os.path.basename(path)
+    return os.path.join(CACHE_DIR, f"{name}-v{CACHE_FORMAT_VERSION}-{_source_hash(path)[:16]}")
+
+
+def _write_cache(df: pd.DataFrame, cache_dir: str):
+    # Build in a temp dir and rename so readers never see a partial cache
+    tmp_dir = cache_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    columns = []
+    for i, col in enumerate(df.columns):
+        if df[col].dtype == object:
+            raise ValueError(f"Column '{col}' is not numeric and cannot be cached")
+        file_name = f"{i:03d}.npy"
+        np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(df[col].to_numpy()))
+        columns.append({'name': col, 'file': file_name, 'dtype': str(df[col].dtype)})
+    with open(os.path.join(tmp_dir, 'columns.json'), 'w') as f:
+        json.dump({'format_version': CACHE_FORMAT_VERSION, 'rows': len(df), 'columns': columns}, f, indent=2)
+
+    # Caches of older versions of the same source file are stale now
+    prefix = os.path.basename(cache_dir).rsplit('-v', 1)[0] + '-v'
+    for name in os.listdir(CACHE_DIR):
+        stale = os.path.join(CACHE_DIR, name)
+        if name.startswith(prefix) and stale not in (cache_dir, tmp_dir):
+            shutil.rmtree(stale, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+
+
+def _read_cache(cache_dir: str) -> pd.DataFrame:
+    with open(os.path.join(cache_dir, 'columns.json')) as f:
+        layout = json.load(f)
+    # Read-only memory maps; pandas wraps them without copying
+    arrays = {
+        c['name']: np.load(os.path.join(cache_dir, c['file']), mmap_mode='r')
+        for c in layout['columns']
+    }
+    return pd.DataFrame(arrays, copy=False)
@@ -0,0 +1,107 @@
+"""
+Query latency of the applicant store behind /api/applicants.
+
+    python -m benchmarks.bench_applicants [--rows 1000000] [--path /tmp/applicants-bench.db]
+
+Fills a fresh SQLite store with synthetic scored applicants through the
+writer's batch path, then reports p50/p95 latency of first pages, deep
+keyset pages, filtered pages and summaries.
+"""
+import argparse
+import os
+import statistics
+import time
+import numpy as np
+from app.services.applicants import ApplicantStore
+from app.services.feature_engineering import FEATURE_COLUMNS, FEATURE_INDEX
+from app.services.scoring import RISK_TIERS
+
+WRITE_BATCH = 50000
+QUERIES = 200
+
+
+def synthetic_batch(n: int, rng: np.random.Generator):
+    features = np.zeros((n, len(FEATURE_COLUMNS)))
+    features[:, FEATURE_INDEX["LIMIT_BAL"]] = rng.integers(1, 100, n) * 10000
+    features[:, FEATURE_INDEX["AGE"]] = rng.integers(21, 75, n)
+    probs = rng.beta(2, 3, n)
+    tiers = np.digitize(probs, [0.3, 0.6], right=True)
+    scored = {
+        "credit_score": np.rint((1 - probs) * 100).astype(int),
+        "probability_of_default": probs,
+        "risk_tier": tiers,
+        "recommended_loan_amount": features[:, FEATURE_INDEX["LIMIT_BAL"]] * np.array([1.5, 0.8, 0.2])[tiers],
+        "recommended_tenor_months": np.array([36, 24, 12])[tiers],
+    }
+    return (time.time(), "bench", {name: features[:, FEATURE_INDEX[f]] for name, f in
+                                   (("limit_bal", "LIMIT_BAL"), ("age", "AGE"), ("sex", "SEX"),
+                                    ("education", "EDUCATION"), ("marriage", "MARRIAGE"),
+                                    ("avg_bill_amt", "avg_bill_amt"), ("avg_pay_amt", "avg_pay_amt"))},
+            scored, [None] * n)
+
+
+def _latencies(fn, n: int = QUERIES) -> tuple:
+    runs = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        runs.append((time.perf_counter() - start) * 1000)
+    runs.sort()
+    return statistics.median(runs), runs[int(len(runs) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--path", default="/tmp/applicants-bench.db")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.path + suffix):
+            os.remove(args.path + suffix)
+    store = ApplicantStore(RISK_TIERS, args.path)
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for first in range(0, args.rows, WRITE_BATCH):
+        store._write([synthetic_batch(min(WRITE_BATCH, args.rows - first), rng)])
+    elapsed = time.perf_counter() - start
+    print(f"wrote {args.rows} applicants in {elapsed:.1f} s ({args.rows / elapsed:,.0f} rows/s)")
+    store._connection().execute("ANALYZE")
+
+    # Cursors deep into each ordering
+    deep = {}
+    for sort in ("id", "probability_of_default", "credit_score", "limit_bal"):
+        cursor = None
+        for _ in range(20):
+            cursor = store.search(sort, "desc", 200, cursor)["next_cursor"]
+        deep[sort] = cursor
+
+    cases = {
+        "newest, first page": lambda i: store.search("id", "desc", 50),
+        "riskiest, first page": lambda i: store.search("probability_of_default", "desc", 50),
+        "riskiest, page 21": lambda i: store.search("probability_of_default", "desc", 50,
+                                                    deep["probability_of_default"]),
+        "credit score, page 21": lambda i: store.search("credit_score", "desc", 50, deep["credit_score"]),
+        "limit, page 21": lambda i: store.search("limit_bal", "desc", 50, deep["limit_bal"]),
+        "HIGH tier by PD": lambda i: store.search("probability_of_default", "desc", 50, risk_tier="HIGH"),
+        "LOW tier by limit": lambda i: store.search("limit_bal", "desc", 50, risk_tier="LOW"),
+        "score 60-70 by PD": lambda i: store.search(
+            "probability_of_default", "asc", 50, ranges={"credit_score": (60, 70)}),
+        "limit 500k+ by score": lambda i: store.search(
+            "credit_score", "desc", 50, ranges={"limit_bal": (500000, None)}),
+        "PD 0.30-0.31 by limit": lambda i: store.search(
+            "limit_bal", "desc", 50, ranges={"probability_of_default": (0.3, 0.31)}),
+        "HIGH, score <= 30, newest": lambda i: store.search(
+            "id", "desc", 50, risk_tier="HIGH", ranges={"credit_score": (None, 30)}),
+        "max page (200)": lambda i: store.search("id", "desc", 200),
+        "by id": lambda i: store.get(1 + i * 997),
+        "summary": lambda i: store.summary(),
+        "summary, HIGH tier": lambda i: store.summary("HIGH"),
+    }
+    for name, fn in cases.items():
+        p50, p95 = _latencies(fn)
+        print(f"  {name:24s} p50 {p50:7.2f} ms   p95 {p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
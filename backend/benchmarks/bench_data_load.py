@@ -0,0 +1,61 @@
+"""
+Training-data load: parsing the source vs. the columnar .npy cache.
+
+    python -m benchmarks.bench_data_load [SOURCE]
+
+SOURCE defaults to the UCI spreadsheet (DATA_PATH); when that is absent a
+synthetic 30,000-row CSV in the same layout is used. The cache is written
+to a temporary directory, and the cached frame is checked value-for-value
+against a plain parse of the source.
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from app.utils import preprocessing
+from benchmarks.bench_features import sample_records
+
+
+def synthetic_source(directory: str, n: int = 30000) -> str:
+    df = pd.DataFrame(sample_records(n))
+    df.insert(0, 'ID', np.arange(1, n + 1))
+    df['default payment next month'] = np.random.default_rng(0).integers(0, 2, n)
+    path = os.path.join(directory, 'synthetic-credit-clients.csv')
+    df.to_csv(path, index=False)
+    return path
+
+
+def _median_ms(fn, runs: int = 5) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        preprocessing.CACHE_DIR = os.path.join(tmp, 'cache')
+        source = sys.argv[1] if len(sys.argv) > 1 else preprocessing.DATA_PATH
+        if not os.path.exists(source):
+            source = synthetic_source(tmp)
+
+        start = time.perf_counter()
+        cached = preprocessing.load_and_preprocess_data(source)
+        first_ms = (time.perf_counter() - start) * 1000
+        parsed = preprocessing._normalize(preprocessing._read_source(source))
+        assert list(parsed.columns) == list(cached.columns)
+        for col in parsed.columns:
+            np.testing.assert_array_equal(parsed[col].to_numpy(), cached[col].to_numpy())
+        print(f"parity ok on {len(cached)} rows from {os.path.basename(source)}")
+
+        parse_ms = _median_ms(lambda: preprocessing.load_and_preprocess_data(source, use_cache=False))
+        cache_ms = _median_ms(lambda: preprocessing.load_and_preprocess_data(source))
+        parsed_kb = parsed.memory_usage(deep=True).sum() / 1024
+        cached_kb = cached.memory_usage(deep=True).sum() / 1024
+        print(f"  parse source  {parse_ms:9.1f} ms   {parsed_kb:9.0f} KB")
+        print(f"  first load    {first_ms:9.1f} ms   (parse + write cache)")
+        print(f"  cached load   {cache_ms:9.1f} ms   {cached_kb:9.0f} KB (memory-mapped)")
@@ -0,0 +1,47 @@
+"""
+Parity check and micro-benchmark for fast TreeSHAP explanations.
+
+    python -m benchmarks.bench_explain
+
+Checks that FastTreeShap matches shap.TreeExplainer (path-dependent, log-odds)
+on sampled applicants, then times the "fast" and "exact" explanation modes.
+"""
+import time
+import numpy as np
+from app.models.credit_model import CreditScoringModel
+from app.services.feature_engineering import compute_feature_matrix, records_to_matrix, FEATURE_INDEX
+from app.services.scoring import CREDIT_MODEL_PATH, EXPLAINER_PATH
+from benchmarks.bench_features import sample_records
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    model = CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH)
+    model.load()
+    if model.fast_explainer is None:
+        raise SystemExit("Fast TreeSHAP tables could not be built for this model")
+
+    features = compute_feature_matrix(records_to_matrix(sample_records(2000)))
+    X = features[:, [FEATURE_INDEX[f] for f in model.features]]
+    diff = np.max(np.abs(model.explain_batch(X, "fast") - model.explain_batch(X, "exact")))
+    print(f"max |fast - exact| SHAP over {len(X)} rows: {diff:.2e}")
+    assert diff < 1e-5
+
+    print(f"{'rows':>7} {'exact':>12} {'fast':>12}   (ms per call)")
+    for n in (1, 100, 2000):
+        repeat = max(3, 500 // n)
+        sub = X[:n]
+        exact_t = _time(lambda: model.explain_batch(sub, "exact"), repeat)
+        fast_t = _time(lambda: model.explain_batch(sub, "fast"), repeat)
+        print(f"{n:>7} {exact_t * 1e3:>12.3f} {fast_t * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark for the NumPy feature engine.
+
+    python -m benchmarks.bench_features
+
+Times the original per-request pandas pipeline, compute_features,
+compute_feature_matrix and the numba kernel (when numba is installed) at
+several batch sizes. Their parity is tested in tests/test_feature_engineering.py.
+"""
+import time
+import numpy as np
+import pandas as pd
+from app.services.feature_engineering import (
+    compute_features, compute_feature_matrix, records_to_matrix, _derive_rows, DERIVED_FEATURES
+)
+
+
+def reference_compute_features(df: pd.DataFrame) -> pd.DataFrame:
+    # The original pandas implementation, timed as the baseline.
+    df = df.copy()
+    bill_cols = [f'BILL_AMT{i}' for i in range(1, 7)]
+    pay_amt_cols = [f'PAY_AMT{i}' for i in range(1, 7)]
+    df['avg_bill_amt'] = df[bill_cols].mean(axis=1)
+    df['avg_pay_amt'] = df[pay_amt_cols].mean(axis=1)
+    df['credit_utilization'] = df['avg_bill_amt'] / df['LIMIT_BAL'].replace(0, 1)
+    df['credit_utilization'] = df['credit_utilization'].clip(0, 1.5)
+    sum_pay = df[pay_amt_cols].sum(axis=1)
+    sum_bill = df[bill_cols].sum(axis=1)
+    df['payment_consistency'] = sum_pay / sum_bill.replace(0, 1)
+    df['payment_consistency'] = df['payment_consistency'].clip(0, 2)
+    pay_status_cols = ['PAY_0', 'PAY_2', 'PAY_3', 'PAY_4', 'PAY_5', 'PAY_6']
+    existing_pay_cols = [c for c in pay_status_cols if c in df.columns]
+    df['late_payment_count'] = (df[existing_pay_cols] > 0).sum(axis=1)
+    df['severe_delinquency'] = (df[existing_pay_cols] >= 3).any(axis=1).astype(int)
+    df['cashflow_volatility'] = df[bill_cols].std(axis=1)
+    ratio_vals = []
+    for i in range(1, 7):
+        b_col = f'BILL_AMT{i}'
+        p_col = f'PAY_AMT{i}'
+        ratio_vals.append(df[p_col] / df[b_col].apply(lambda x: max(x, 1)))
+    ratio_df = pd.concat(ratio_vals, axis=1)
+    df['ratio_volatility'] = ratio_df.std(axis=1)
+    return df
+
+
+def sample_records(n: int, seed: int = 42) -> list:
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n):
+        r = {
+            'LIMIT_BAL': float(rng.choice([0, rng.integers(1, 100) * 10000])),
+            'AGE': int(rng.integers(21, 75)),
+            'SEX': int(rng.integers(1, 3)),
+            'EDUCATION': int(rng.integers(1, 5)),
+            'MARRIAGE': int(rng.integers(1, 4)),
+        }
+        for c in ['PAY_0', 'PAY_2', 'PAY_3', 'PAY_4', 'PAY_5', 'PAY_6']:
+            r[c] = int(rng.integers(-2, 9))
+        zero_bills = rng.random() < 0.05
+        for i in range(1, 7):
+            r[f'BILL_AMT{i}'] = 0.0 if zero_bills else float(rng.integers(-5000, 300000))
+            r[f'PAY_AMT{i}'] = float(rng.integers(0, 50000))
+        records.append(r)
+    return records
+
+
+def _numba_kernel():
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_derive_rows)
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run_benchmark(sizes=(1, 100, 10000)):
+    kernel = _numba_kernel()
+    print(f"{'rows':>7} {'pandas ref':>12} {'wrapper':>12} {'numpy':>12} {'numba':>12}   (ms per call)")
+    for n in sizes:
+        records = sample_records(n)
+        df = pd.DataFrame(records)
+        raw = records_to_matrix(records)
+        repeat = max(3, 2000 // n)
+        ref_t = _time(lambda: reference_compute_features(df), repeat)
+        wrap_t = _time(lambda: compute_features(df), repeat)
+        np_t = _time(lambda: compute_feature_matrix(raw), repeat)
+        numba_t = float('nan')
+        if kernel is not None:
+            out = np.empty((n, len(DERIVED_FEATURES)))
+            numba_t = _time(lambda: kernel(raw, out), repeat)
+        print(f"{n:>7} {ref_t * 1e3:>12.3f} {wrap_t * 1e3:>12.3f} {np_t * 1e3:>12.3f} {numba_t * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,81 @@
+"""
+Allocation optimizer and asset-recommendation latency.
+
+    python -m benchmarks.bench_investment [--investors 1000000]
+
+Checks optimize_allocations against a brute-force search over a 0.1% grid
+of long-only weights, times one solve for a whole batch of investors, and
+times InvestmentModel.recommend (one profile, as behind
+/api/asset-management/recommendation) and recommend_batch with whichever
+risk-tolerance model is installed (trained classifier or rules).
+"""
+import argparse
+import time
+import numpy as np
+from app.models.investment_model import (
+    InvestmentModel, COVARIANCE, EXPECTED_RETURNS, INVESTMENT_FEATURES, INVESTMENT_INDEX, optimize_allocations
+)
+from app.services.scoring import INVESTMENT_BUNDLE_DIR
+
+GRID_STEP = 0.001
+
+
+def _objective(w: np.ndarray, risk_aversion: float) -> np.ndarray:
+    return w @ EXPECTED_RETURNS - risk_aversion / 2 * np.einsum('ij,jk,ik->i', w, COVARIANCE, w)
+
+
+def check_optimizer():
+    steps = np.arange(0, 1 + GRID_STEP / 2, GRID_STEP)
+    a, b = np.meshgrid(steps, steps, indexing='ij')
+    keep = a + b <= 1 + 1e-9
+    grid = np.column_stack([a[keep], b[keep], 1 - a[keep] - b[keep]])
+    worst = 0.0
+    aversions = np.geomspace(0.5, 100, 25)
+    solved = optimize_allocations(aversions)
+    for lam, w in zip(aversions, solved):
+        # The solver's objective must be at least the best grid point's
+        gap = _objective(grid, lam).max() - _objective(w[None], lam)[0]
+        worst = max(worst, gap)
+    print(f"optimizer vs {len(grid)}-point grid: worst objective shortfall {worst:.2e} "
+          f"(weights sum to 1 within {np.abs(solved.sum(axis=1) - 1).max():.1e})")
+    assert worst <= 1e-12
+
+
+def _ms(fn, repeat: int = 5) -> float:
+    fn()
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return min(runs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--investors", type=int, default=1000000)
+    args = parser.parse_args()
+
+    check_optimizer()
+    rng = np.random.default_rng(0)
+    aversion = rng.uniform(1, 50, args.investors)
+    print(f"optimize_allocations, {args.investors} investors: {_ms(lambda: optimize_allocations(aversion)):.1f} ms")
+
+    model = InvestmentModel(INVESTMENT_BUNDLE_DIR)
+    source = f"classifier {model.version}" if model.load() else "rules"
+    profile = {"LIMIT_BAL": 200000, "AGE": 41, "credit_score": 71, "financial_health_score": 62.0}
+    start = time.perf_counter()
+    for _ in range(10000):
+        model.recommend(profile)
+    print(f"recommend, one profile ({source}): {(time.perf_counter() - start) / 10000 * 1e6:.1f} us")
+
+    n = min(args.investors, 100000)
+    X = rng.normal(size=(n, len(INVESTMENT_FEATURES)))
+    X[:, INVESTMENT_INDEX["AGE"]] = rng.integers(21, 75, n)
+    X[:, INVESTMENT_INDEX["financial_health_score"]] = rng.uniform(0, 100, n)
+    X[:, INVESTMENT_INDEX["credit_score"]] = rng.integers(0, 101, n)
+    print(f"recommend_batch, {n} rows ({source}): {_ms(lambda: model.recommend_batch(X), 3):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Cold-start comparison of the model artifact formats.
+
+    python -m benchmarks.bench_model_load
+
+Each measurement runs in a fresh interpreter so import caches and warm
+allocations do not flatter either format. Reports the time spent in
+reading the artifact (model + explainer) and in the full CreditScoringModel.load(),
+which also builds the compiled trees and fast TreeSHAP tables.
+"""
+import json
+import subprocess
+import sys
+import statistics
+
+SNIPPET = """
+import json, time
+from app.models.credit_model import CreditScoringModel
+from app.services.scoring import CREDIT_MODEL_PATH, EXPLAINER_PATH, CREDIT_BUNDLE_DIR
+bundle_dir = CREDIT_BUNDLE_DIR if {use_bundle} else '/nonexistent'
+model = CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH, bundle_dir=bundle_dir)
+start = time.perf_counter()
+if {read_only}:
+    model._load_bundle() if {use_bundle} else model._load_pickle()
+else:
+    model.load()
+print(json.dumps({{"ms": (time.perf_counter() - start) * 1000}}))
+"""
+
+
+def measure(use_bundle: bool, read_only: bool, runs: int = 5) -> float:
+    times = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", SNIPPET.format(use_bundle=use_bundle, read_only=read_only)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        times.append(json.loads(out.strip().splitlines()[-1])["ms"])
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    for name, use_bundle in (("pickle", False), ("bundle", True)):
+        read = measure(use_bundle, read_only=True)
+        load = measure(use_bundle, read_only=False)
+        print(f"{name:>7}: artifact read {read:8.1f} ms   full load() {load:8.1f} ms   (medians)")
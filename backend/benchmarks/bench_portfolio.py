@@ -0,0 +1,90 @@
+"""
+Ingest and read latency of the asset-management portfolio store.
+
+    python -m benchmarks.bench_portfolio [--customers 1000000]
+
+Loads a synthetic scored book (bulk-scoring output layout) in chunks, then
+times the dashboard reads, a small incremental update, and the same reads
+again after it. Checks that the incrementally maintained group sums match a
+store built from scratch on the final data.
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from app.services.portfolio import PortfolioStore, CATEGORIES, ALLOCATION_COLUMNS
+
+CHUNK_SIZE = 100000
+ALLOCATIONS = np.array([[70, 30, 0], [40, 40, 20], [20, 40, 40]], dtype=float)
+
+
+def scored_book(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tolerance = rng.integers(0, 3, n)
+    frame = pd.DataFrame({
+        "APPLICANT_ID": np.arange(n).astype(str),
+        "PORTFOLIO_VALUE": rng.uniform(0, 1e6, n).round(2),
+        "credit_score": rng.integers(0, 101, n),
+        "probability_of_default": rng.random(n),
+        "financial_health_score": rng.uniform(0, 100, n).round(2),
+    })
+    for name in ("risk_tier", "health_band", "investment_horizon"):
+        frame[name] = np.array(CATEGORIES[name])[rng.integers(0, 3, n)]
+    frame["risk_tolerance"] = np.array(CATEGORIES["risk_tolerance"])[tolerance]
+    frame[ALLOCATION_COLUMNS] = ALLOCATIONS[tolerance]
+    return frame
+
+
+def _ms(fn, repeat: int = 5) -> float:
+    fn()
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return min(runs) * 1000
+
+
+def _reads(store: PortfolioStore):
+    return {
+        "aum": lambda: store.aum(),
+        "segments": lambda: store.segments("persona"),
+        "risk-metrics (cached)": lambda: store.risk_metrics(),
+        "profiles (100)": lambda: store.profiles(0, 100),
+        "recommendations (100)": lambda: store.recommendations(0, 100),
+        "profile by id": lambda: store.profile("12345"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=1000000)
+    args = parser.parse_args()
+
+    book = scored_book(args.customers)
+    store = PortfolioStore()
+    start = time.perf_counter()
+    for first in range(0, len(book), CHUNK_SIZE):
+        store.ingest(book.iloc[first:first + CHUNK_SIZE])
+    print(f"ingest {len(book)} customers: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    store.risk_metrics()
+    print(f"risk-metrics first read after ingest (alert scan): {(time.perf_counter() - start) * 1000:.1f} ms")
+    for name, read in _reads(store).items():
+        print(f"  {name:24s} {_ms(read):8.3f} ms")
+
+    update = scored_book(1000, seed=1)
+    update["APPLICANT_ID"] = np.random.default_rng(2).choice(len(book), 1000, replace=False).astype(str)
+    print(f"upsert 1000 customers: {_ms(lambda: store.ingest(update)):.2f} ms")
+
+    final = pd.concat([book.set_index("APPLICANT_ID"), update.set_index("APPLICANT_ID")])
+    fresh = PortfolioStore()
+    fresh.ingest(final[~final.index.duplicated(keep="last")].reset_index())
+    for name in CATEGORIES:
+        assert np.allclose(store._sums[name], fresh._sums[name]), name
+    print("incremental group sums match a full rebuild")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Parity check and micro-benchmark for the compiled tree inference engine.
+
+    python -m benchmarks.bench_predict
+
+Loads the saved credit model, checks that CompiledTreeEnsemble reproduces
+XGBClassifier.predict_proba within 1e-6, and times both engines.
+"""
+import time
+import numpy as np
+import pandas as pd
+from app.models.credit_model import CreditScoringModel
+from app.services.feature_engineering import compute_feature_matrix, records_to_matrix, FEATURE_COLUMNS
+from app.services.scoring import CREDIT_MODEL_PATH, EXPLAINER_PATH
+from benchmarks.bench_features import sample_records
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    model = CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH, engine="compiled")
+    model.load()
+    if model.compiled is None:
+        raise SystemExit("Compiled engine could not be built for this model")
+
+    frame = pd.DataFrame(compute_feature_matrix(records_to_matrix(sample_records(10000))), columns=FEATURE_COLUMNS)
+    X = frame[model.features].to_numpy(dtype=np.float32)
+    diff = np.max(np.abs(model.compiled.predict_proba(X) - model.model.predict_proba(X)[:, 1]))
+    print(f"max |compiled - predict_proba| over {len(X)} rows: {diff:.2e}")
+    assert diff < 1e-6
+
+    print(f"{'rows':>7} {'xgb frame':>12} {'xgb array':>12} {'compiled':>12}   (ms per call)")
+    for n in (1, 100, 10000):
+        repeat = max(3, 1000 // n)
+        sub_frame, sub_X = frame.iloc[:n], X[:n]
+        frame_t = _time(lambda: model.model.predict_proba(sub_frame[model.features]), repeat)
+        array_t = _time(lambda: model.model.predict_proba(sub_X), repeat)
+        compiled_t = _time(lambda: model.compiled.predict_proba(sub_X), repeat)
+        print(f"{n:>7} {frame_t * 1e3:>12.3f} {array_t * 1e3:>12.3f} {compiled_t * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
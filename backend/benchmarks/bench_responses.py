@@ -0,0 +1,60 @@
+"""
+Per-request CPU cost of the three scoring routes.
+
+    python -m benchmarks.bench_responses
+
+Sends sequential requests (result cache off) through the ASGI app in-process
+and reports, per route, the median latency and the process CPU time per
+request. Run it before and after a change to the response path.
+"""
+import asyncio
+import statistics
+import time
+import httpx
+from app.main import app
+from app.services.cache import result_cache
+from app.services.dispatcher import inference_dispatcher
+from app.services.scoring import scoring_service
+from benchmarks.bench_features import sample_records
+from benchmarks.suite import _payloads
+
+REQUESTS = 2000
+ROUNDS = 5
+ROUTES = (
+    ("/api/credit/score?explanation=none", "/api/credit/score"),
+    ("/api/credit/score?explanation=fast", "/api/credit/score"),
+    ("/api/financial-health/score", "/api/financial-health/score"),
+    ("/api/asset-management/recommendation", "/api/asset-management/recommendation"),
+)
+
+
+async def _round(client, url: str, payloads: list):
+    latencies = []
+    cpu = time.process_time()
+    for payload in payloads:
+        start = time.perf_counter()
+        response = await client.post(url, json=payload)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return statistics.median(latencies), (time.process_time() - cpu) / len(payloads)
+
+
+async def main():
+    records = sample_records(REQUESTS)
+    inference_dispatcher.start()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for url, endpoint in ROUTES:
+            payloads = _payloads(endpoint, records)
+            await _round(client, url, payloads[:200])
+            # Best of several rounds keeps background noise out of the comparison
+            runs = [await _round(client, url, payloads) for _ in range(ROUNDS)]
+            median = min(r[0] for r in runs)
+            cpu = min(r[1] for r in runs)
+            print(f"  {url:42s} median {median * 1e6:8.1f} us   cpu {cpu * 1e6:8.1f} us/request")
+    inference_dispatcher.stop()
+
+
+if __name__ == "__main__":
+    result_cache.enabled = False
+    scoring_service.load()
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+Memory per worker and throughput of multi-process serving (gunicorn.conf.py).
+
+    python -m benchmarks.bench_workers [--workers 1,2,4] [--duration 10] [--clients N] [--compare-no-preload]
+
+For each worker count, starts gunicorn on a free local port, drives
+/api/credit/score from --clients keep-alive client processes for --duration
+seconds, then reads every worker's memory from /proc/<pid>/smaps_rollup:
+RSS, PSS (shared pages split between the processes sharing them) and USS
+(pages private to the process). The result cache and applicant store are
+off so every request is scored. The clients run on the same machine and
+take CPU from the workers, so small machines understate the scaling.
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from app.config import available_cpus
+from benchmarks.bench_features import sample_records
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDS = 512
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _client(args):
+    port, duration, seed = args
+    bodies = [json.dumps(r).encode() for r in sample_records(RECORDS, seed=seed)]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    done = errors = 0
+    latencies = []
+    stop = time.perf_counter() + duration
+    while time.perf_counter() < stop:
+        start = time.perf_counter()
+        conn.request("POST", "/api/credit/score", body=bodies[done % RECORDS], headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status == 200:
+            done += 1
+        else:
+            errors += 1
+    conn.close()
+    return done, errors, latencies
+
+
+def _memory_mb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def _wait_ready(port: int, workers: int, timeout: float = 120):
+    # Fresh connections land on any worker; wait for a run of ready answers long enough to cover them all
+    deadline = time.monotonic() + timeout
+    ready = 0
+    while ready < workers * 4:
+        if time.monotonic() > deadline:
+            raise RuntimeError("gunicorn did not become ready")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/readyz")
+            ready = ready + 1 if conn.getresponse().status == 200 else 0
+            conn.close()
+        except OSError:
+            ready = 0
+            time.sleep(0.2)
+
+
+def run(workers: int, duration: float, clients: int, preload: bool) -> dict:
+    port = _free_port()
+    env = {**os.environ, "PORT": str(port), "WEB_CONCURRENCY": str(workers),
+           "PRELOAD_MODELS": "1" if preload else "0", "MODEL_LOADING": "eager",
+           "RESULT_CACHE_ENABLED": "0", "APPLICANT_STORE_ENABLED": "0"}
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+                              cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(port, workers)
+        with Pool(clients) as pool:
+            # Short warm-up, then the measured run
+            pool.map(_client, [(port, 1.0, i) for i in range(clients)])
+            start = time.perf_counter()
+            results = pool.map(_client, [(port, duration, i) for i in range(clients)])
+            elapsed = time.perf_counter() - start
+        worker_memory = [_memory_mb(pid) for pid in _children(server.pid)]
+        master_memory = _memory_mb(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    latencies = sorted(l for _, _, runs in results for l in runs)
+    return {
+        "workers": workers,
+        "preload": preload,
+        "requests_per_second": sum(done for done, _, _ in results) / elapsed,
+        "errors": sum(errors for _, errors, _ in results),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "master": master_memory,
+        "worker_mean": {k: sum(m[k] for m in worker_memory) / len(worker_memory) for k in ("rss", "pss", "uss")},
+        "total_pss": master_memory["pss"] + sum(m["pss"] for m in worker_memory)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1..available CPUs)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=None, help="Client processes (default: 2 per worker)")
+    parser.add_argument("--compare-no-preload", action="store_true",
+                        help="Also run every worker count with each worker loading its own models")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.workers.split(",")] if args.workers else list(range(1, available_cpus() + 1))
+    print(f"{available_cpus()} CPU(s) available")
+    print(f"{'workers':>7} {'preload':>7} {'req/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'worker RSS':>10} "
+          f"{'worker PSS':>10} {'worker USS':>10} {'total PSS':>9}")
+    for preload in ((True, False) if args.compare_no_preload else (True,)):
+        for n in counts:
+            r = run(n, args.duration, args.clients or 2 * n, preload)
+            w = r["worker_mean"]
+            print(f"{n:7d} {str(preload):>7} {r['requests_per_second']:8.0f} {r['p50_ms']:7.2f} {r['p95_ms']:7.2f} "
+                  f"{w['rss']:8.0f}MB {w['pss']:8.0f}MB {w['uss']:8.0f}MB {r['total_pss']:7.0f}MB"
+                  + (f"  ({r['errors']} errors)" if r["errors"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Benchmark and load-test suite with baseline comparison.
+
+    python -m benchmarks.suite [--only micro|load] [--output results.json]
+                               [--baseline baseline.json] [--tolerance 0.25]
+
+Micro-benchmarks time compute_features, CreditScoringModel.predict,
+CreditScoringModel.explain (fast and exact modes), calculate_financial_health,
+financial_health_arrays and get_asset_recommendation at 1, 100 and 10,000
+rows; the two per-applicant service methods are called once per row. The load test drives the scoring
+endpoints in-process through httpx's ASGI transport (no network, result
+cache off) with a fixed number of concurrent clients and reports latency
+percentiles and requests per second.
+
+Results are written as JSON. With --baseline, every gated metric (micro
+median_ms, load p50_ms / p95_ms / rps) is compared against the baseline
+file and the run exits with status 1 when one is worse by more than the
+tolerance. p99 and max are reported but not gated: on a few cores they are
+too noisy to fail a build on. Compare runs from the same machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from app.services.feature_engineering import compute_features, compute_feature_matrix, records_to_matrix, FEATURE_COLUMNS
+from app.services.scoring import scoring_service, RISK_TIERS
+from benchmarks.bench_features import sample_records
+
+BATCH_SIZES = (1, 100, 10000)
+# Each timing sample loops the call until it takes at least this long
+MIN_SAMPLE_SECONDS = 0.02
+SAMPLES = 7
+GATED_MICRO = ("median_ms",)
+GATED_LOAD = ("p50_ms", "p95_ms", "rps")
+DEFAULT_TOLERANCE = 0.25
+
+ENDPOINTS = ("/api/credit/score", "/api/financial-health/score", "/api/asset-management/recommendation")
+
+
+def _median_ms(fn) -> float:
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+            break
+        number *= 2
+    samples = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1000)
+    return statistics.median(samples)
+
+
+def _asset_profile(record: dict, health: dict, score: float, tier: str) -> dict:
+    return {
+        'financial_health_score': health['financial_health_score'],
+        'credit_score': score,
+        'risk_tier': tier,
+        'LIMIT_BAL': record['LIMIT_BAL'],
+        'AGE': record['AGE']
+    }
+
+
+def micro_benchmarks(sizes: tuple = BATCH_SIZES) -> dict:
+    model = scoring_service.credit_model
+    records = sample_records(max(sizes))
+    frame = pd.DataFrame(records)
+    matrix = compute_feature_matrix(records_to_matrix(records))
+    inputs = matrix[:, [FEATURE_COLUMNS.index(f) for f in model.features]]
+    feature_rows = [dict(zip(FEATURE_COLUMNS, row)) for row in matrix.tolist()]
+    health = [scoring_service.calculate_financial_health(row) for row in feature_rows]
+    scores = scoring_service.score_arrays(matrix)
+    profiles = [
+        _asset_profile(r, h, float(s), RISK_TIERS[int(t)])
+        for r, h, s, t in zip(records, health, scores['credit_score'], scores['risk_tier'])
+    ]
+
+    cases = {
+        'compute_features': lambda n: lambda: compute_features(frame.iloc[:n]),
+        'predict': lambda n: lambda: model.predict(inputs[:n]),
+        'explain_fast': lambda n: lambda: model.explain_batch(inputs[:n], "fast"),
+        'explain_exact': lambda n: lambda: model.explain_batch(inputs[:n], "exact"),
+        'calculate_financial_health': lambda n: lambda: [
+            scoring_service.calculate_financial_health(row) for row in feature_rows[:n]
+        ],
+        'financial_health_arrays': lambda n: lambda: scoring_service.financial_health_arrays(matrix[:n]),
+        'get_asset_recommendation': lambda n: lambda: [
+            scoring_service.get_asset_recommendation(p) for p in profiles[:n]
+        ]
+    }
+    results = {}
+    for name, make in cases.items():
+        results[name] = {}
+        for n in sizes:
+            ms = _median_ms(make(n))
+            results[name][str(n)] = {'median_ms': round(ms, 4), 'rows_per_s': round(n / ms * 1000, 1)}
+            print(f"  {name:28s} {n:6d} rows  {ms:10.3f} ms  {n / ms * 1000:12.0f} rows/s")
+    return results
+
+
+def _payloads(endpoint: str, records: list) -> list:
+    if endpoint != "/api/asset-management/recommendation":
+        return records
+    profiles = []
+    for record in records:
+        row = compute_feature_matrix(records_to_matrix([record]))[0]
+        health = scoring_service.calculate_financial_health(dict(zip(FEATURE_COLUMNS, row.tolist())))
+        credit = scoring_service.predict_credit_score(record, "none")
+        profiles.append(_asset_profile(record, health, credit['credit_score'], credit['risk_tier']))
+    return profiles
+
+
+async def _drive(client, endpoint: str, payloads: list, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    pending = iter(payloads)
+
+    async def worker():
+        nonlocal errors
+        for payload in pending:
+            start = time.perf_counter()
+            response = await client.post(endpoint, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'concurrency': concurrency,
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'max_ms': round(float(ms.max()), 3),
+        'rps': round(len(latencies) / elapsed, 1)
+    }
+
+
+async def _load_test(requests: int, concurrency: int) -> dict:
+    import httpx
+    from app.main import app
+    from app.services.dispatcher import inference_dispatcher
+
+    records = sample_records(requests, seed=7)
+    results = {}
+    inference_dispatcher.start()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for endpoint in ENDPOINTS:
+                payloads = _payloads(endpoint, records)
+                # Warm up routing, validation and the model before measuring
+                await _drive(client, endpoint, payloads[:min(100, requests)], concurrency)
+                results[endpoint] = stats = await _drive(client, endpoint, payloads, concurrency)
+                print(f"  {endpoint:38s} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+                      f"p99 {stats['p99_ms']:8.2f} ms  {stats['rps']:8.1f} req/s  errors {stats['errors']}")
+    finally:
+        inference_dispatcher.stop()
+    return results
+
+
+def load_test(requests: int = 2000, concurrency: int = 16) -> dict:
+    from app.services.cache import result_cache
+
+    # Every request must reach the model; cached responses would measure the cache
+    enabled, result_cache.enabled = result_cache.enabled, False
+    try:
+        return asyncio.run(_load_test(requests, concurrency))
+    finally:
+        result_cache.enabled = enabled
+
+
+def _environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+        'model_version': scoring_service.model_version
+    }
+
+
+def gated_metrics(results: dict) -> dict:
+    """Flattens results to {"micro/predict/100/median_ms": value, ...} for the gated metrics."""
+    flat = {}
+    for name, sizes in results.get('micro', {}).items():
+        for n, stats in sizes.items():
+            for key in GATED_MICRO:
+                flat[f"micro/{name}/{n}/{key}"] = stats[key]
+    for endpoint, stats in results.get('load', {}).items():
+        for key in GATED_LOAD:
+            flat[f"load{endpoint}/{key}"] = stats[key]
+    return flat
+
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Returns the regressions as (metric, baseline, current, change) tuples.
+    Latencies regress when they grow by more than tolerance, throughput when
+    it drops by more than tolerance. Metrics missing from either run are skipped.
+    """
+    regressions = []
+    now, before = gated_metrics(current), gated_metrics(baseline)
+    for metric, value in now.items():
+        base = before.get(metric)
+        if not base:
+            continue
+        change = (value - base) / base
+        higher_is_better = metric.endswith("/rps")
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            regressions.append((metric, base, value, change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", choices=("micro", "load"), help="Run only one part of the suite")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint in the load test")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients in the load test")
+    args = parser.parse_args(argv)
+
+    if not scoring_service.load():
+        print(f"Credit model could not be loaded: {scoring_service.load_error}")
+        return 2
+    results = {'created_at': datetime.now(timezone.utc).isoformat(), 'environment': _environment()}
+    if args.only in (None, "micro"):
+        print("Micro-benchmarks")
+        results['micro'] = micro_benchmarks()
+    if args.only in (None, "load"):
+        print(f"Load test: {args.requests} requests per endpoint, {args.concurrency} concurrent clients")
+        results['load'] = load_test(args.requests, args.concurrency)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('environment', {}).get('cpu_count') != results['environment']['cpu_count']:
+        print("Warning: the baseline was recorded on a machine with a different CPU count")
+    regressions = compare(results, baseline, args.tolerance)
+    checked = len(set(gated_metrics(results)) & set(gated_metrics(baseline)))
+    if not regressions:
+        print(f"No regressions in {checked} metrics against {args.baseline} (tolerance {args.tolerance:.0%})")
+        return 0
+    print(f"{len(regressions)} of {checked} metrics regressed against {args.baseline} "
+          f"(tolerance {args.tolerance:.0%}):")
+    for metric, base, value, change in regressions:
+        print(f"  {metric:60s} {base:12.3f} -> {value:12.3f}  ({change:+.1%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
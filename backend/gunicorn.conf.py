@@ -0,0 +1,33 @@
+"""
+Multi-process serving:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Runs WEB_CONCURRENCY uvicorn workers (default: one per available CPU). With
+PRELOAD_MODELS (default on) the master imports the app and loads the models
+once (app.main.preload) before forking, so the workers share them
+copy-on-write. Single-process development still uses uvicorn directly.
+"""
+import os
+from app.config import available_cpus, WEB_CONCURRENCY, PRELOAD_MODELS
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = WEB_CONCURRENCY or available_cpus()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = PRELOAD_MODELS
+# Workers are only forked after preload() has finished, so loading does not
+# count against the worker timeout
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Split the CPUs between the workers' XGBoost/OpenMP thread pools instead of
+# giving every worker all of them. Set before the app (and XGBoost) is imported.
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, available_cpus() // workers)))
+
+
+def on_starting(server):
+    # Runs in the master after preload_app has imported the app, before any fork
+    if preload_app:
+        from app.main import preload
+        preload()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+
+# Keep the suite off the developer's registry, applicant store and investment
+# model: the API serves the shipped credit bundle and writes nowhere in the tree.
+_scratch = tempfile.mkdtemp(prefix="credit-tests-")
+os.environ.setdefault("MODEL_REGISTRY_DIR", os.path.join(_scratch, "registry"))
+os.environ.setdefault("INVESTMENT_MODEL_DIR", os.path.join(_scratch, "investment"))
+os.environ.setdefault("APPLICANT_STORE_ENABLED", "0")
+os.environ.setdefault("APPLICANT_STORE_PATH", os.path.join(_scratch, "applicants.db"))
+os.environ.setdefault("MODEL_LOADING", "eager")
+
+import numpy as np
+import pytest
+from app.services.feature_engineering import (
+    compute_feature_matrix, records_to_matrix, BILL_COLS, PAY_AMT_COLS, PAY_STATUS_COLS
+)
+
+
+def random_records(n: int, seed: int) -> list:
+    """
+    Random applicants, a share of them with zero credit limits, all-zero
+    bills, bills summing to zero and bills below 1 (the clamped ratio
+    denominator).
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n):
+        r = {
+            'LIMIT_BAL': float(rng.choice([0, rng.integers(1, 100) * 10000])),
+            'AGE': int(rng.integers(21, 75)),
+            'SEX': int(rng.integers(1, 3)),
+            'EDUCATION': int(rng.integers(1, 5)),
+            'MARRIAGE': int(rng.integers(1, 4)),
+        }
+        for c in PAY_STATUS_COLS:
+            r[c] = int(rng.integers(-2, 9))
+        bills = rng.integers(-5000, 300000, 6).astype(float)
+        kind = rng.random()
+        if kind < 0.05:
+            bills[:] = 0.0
+        elif kind < 0.10:
+            bills[3:] = -bills[:3]
+        elif kind < 0.15:
+            bills = rng.uniform(-1, 1, 6).round(2)
+        for c, bill in zip(BILL_COLS, bills):
+            r[c] = float(bill)
+        for c in PAY_AMT_COLS:
+            r[c] = float(rng.choice([0, rng.integers(0, 50000)]))
+        records.append(r)
+    return records
+
+
+@pytest.fixture(params=[0, 1, 2])
+def records(request):
+    return random_records(2000, seed=request.param)
+
+
+@pytest.fixture
+def applicant():
+    """One valid CreditScoreRequest body."""
+    return random_records(1, seed=11)[0]
+
+
+@pytest.fixture(scope="session")
+def feature_matrix():
+    """Engineered features (FEATURE_COLUMNS order) of 1,000 random applicants."""
+    return compute_feature_matrix(records_to_matrix(random_records(1000, seed=7)))
+
+
+@pytest.fixture(scope="session")
+def shipped_model():
+    """The credit model bundle shipped in app/models/saved_models, with the compiled engine."""
+    from app.models.credit_model import CreditScoringModel
+    from app.services.scoring import CREDIT_MODEL_PATH, EXPLAINER_PATH, CREDIT_BUNDLE_DIR
+
+    model = CreditScoringModel(CREDIT_MODEL_PATH, EXPLAINER_PATH, engine="compiled", bundle_dir=CREDIT_BUNDLE_DIR)
+    assert model.load()
+    return model
+
+
+@pytest.fixture(scope="session")
+def small_model(tmp_path_factory):
+    """
+    A small model trained on random data with missing values, so trees have
+    default (missing-value) directions, installed with the compiled engine.
+    """
+    import xgboost as xgb
+    from app.models.credit_model import CreditScoringModel
+
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(2000, 6)).astype(np.float32)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    y = ((np.nan_to_num(X[:, 0]) + np.nan_to_num(X[:, 1]) * X[:, 2] ** 2 > 0.5)
+         ^ (rng.random(2000) < 0.1)).astype(int)
+    booster = xgb.XGBClassifier(n_estimators=40, max_depth=5, learning_rate=0.2, random_state=0)
+    booster.fit(X, y)
+    root = tmp_path_factory.mktemp("small_model")
+    model = CreditScoringModel(str(root / "model.pkl"), str(root / "explainer.pkl"), engine="compiled",
+                               bundle_dir=str(root / "bundle"))
+    model.set_model(booster, [f"f{i}" for i in range(X.shape[1])], {})
+    return model, X
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient over the app, with the lifespan (model loading) run."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
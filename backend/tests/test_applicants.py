@@ -0,0 +1,46 @@
+"""
+Pagination cursors of /api/applicants are client input: anything but a
+cursor issued for the requested sort is rejected with a 400.
+"""
+import base64
+import json
+import pytest
+from app.services.applicants import _decode_cursor, _encode_cursor
+
+
+def _cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def test_issued_cursor_round_trips():
+    cursor = _encode_cursor("probability_of_default", {"id": 42, "probability_of_default": 0.125})
+    assert _decode_cursor(cursor, "probability_of_default") == (0.125, 42)
+
+
+@pytest.mark.parametrize("sort", ["id", "credit_score", "probability_of_default", "limit_bal"])
+def test_valid_cursor_is_accepted(client, sort):
+    response = client.get("/api/applicants", params={"sort": sort, "cursor": _cursor([sort, 10, 3])})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    _cursor({"sort": "credit_score", "value": 50, "id": 3}),
+    _cursor(["credit_score", 50]),
+    _cursor(["credit_score", 50, 3, 4]),
+    _cursor(["id", 50, 3]),
+    _cursor(["credit_score", [50], 3]),
+    _cursor(["credit_score", {"$gt": 0}, 3]),
+    _cursor(["credit_score", "50", 3]),
+    _cursor(["credit_score", None, 3]),
+    _cursor(["credit_score", True, 3]),
+    _cursor(["credit_score", 50, [3]]),
+    _cursor(["credit_score", 50, 3.5]),
+    _cursor(["credit_score", 50, True]),
+    _cursor(["credit_score", 50, 2 ** 70]),
+    _cursor(["credit_score", 2 ** 70, 3]),
+    _cursor("credit_score"),
+])
+def test_malformed_cursor_is_rejected(client, cursor):
+    response = client.get("/api/applicants", params={"sort": "credit_score", "cursor": cursor})
+    assert response.status_code == 400
@@ -0,0 +1,30 @@
+"""
+/api/credit/score/batch validates each record on its own: a malformed record,
+including one that is not an object, fails only at its index.
+"""
+from app.schemas.credit import MAX_BATCH_SIZE
+
+
+def test_batch_reports_bad_records_at_their_index(client, applicant):
+    missing = {k: v for k, v in applicant.items() if k != "AGE"}
+    records = [applicant, "not a record", missing, None, [1, 2], applicant]
+    response = client.post("/api/credit/score/batch", json={"records": records})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["succeeded"], body["failed"]) == (6, 2, 4)
+    assert [item["index"] for item in body["results"]] == list(range(6))
+    assert [item["status"] for item in body["results"]] == ["ok", "error", "error", "error", "error", "ok"]
+    assert body["results"][1]["errors"][0]["type"] == "model_type"
+    assert body["results"][2]["errors"][0]["loc"] == ["AGE"]
+    assert body["results"][0]["result"] == body["results"][5]["result"]
+
+
+def test_batch_matches_single_scores(client, applicant):
+    batch = client.post("/api/credit/score/batch", json={"records": [applicant]}).json()
+    single = client.post("/api/credit/score", json=applicant).json()
+    assert batch["results"][0]["result"] == single
+
+
+def test_batch_size_limit(client):
+    response = client.post("/api/credit/score/batch", json={"records": [{}] * (MAX_BATCH_SIZE + 1)})
+    assert response.status_code == 422
@@ -0,0 +1,118 @@
+"""
+InferenceDispatcher: concurrent requests are merged into batches, every
+caller gets its own result, a failed batch fails each of its callers, and
+stop() shuts the inference threads down cleanly. Scoring is replaced by a
+recording stub so batches can be held open and inspected.
+"""
+import asyncio
+import threading
+import pytest
+from app.services.dispatcher import InferenceDispatcher
+from app.services.scoring import scoring_service
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class StubScorer:
+    """Stands in for predict_credit_scores; the first batch can be held until release()."""
+
+    def __init__(self, hold_first: bool = False, fail_modes: tuple = ()):
+        self.batches = []
+        self.fail_modes = fail_modes
+        self.started = threading.Event()
+        self._gate = threading.Event()
+        if not hold_first:
+            self._gate.set()
+
+    def release(self):
+        self._gate.set()
+
+    def __call__(self, records, explanation, timings=None, include_features=False):
+        self.batches.append((explanation, [r["id"] for r in records]))
+        self.started.set()
+        self._gate.wait(5)
+        if explanation in self.fail_modes:
+            raise RuntimeError(f"{explanation} batch failed")
+        return [{"id": r["id"], "explanation": explanation} for r in records]
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = InferenceDispatcher(window_ms=50, max_batch=64, workers=1)
+    yield dispatcher
+    dispatcher.stop()
+
+
+async def _submit_while_held(dispatcher, stub, requests):
+    """Scores one request, holds its batch open, queues `requests` behind it, then releases."""
+    first = asyncio.ensure_future(dispatcher.score({"id": "first"}, "none"))
+    assert await asyncio.to_thread(stub.started.wait, 5)
+    rest = [asyncio.ensure_future(dispatcher.score({"id": i}, mode)) for i, mode in requests]
+    await asyncio.sleep(0)
+    assert dispatcher._queue.qsize() == len(requests)
+    stub.release()
+    return await asyncio.gather(first, *rest, return_exceptions=True)
+
+
+@pytest.mark.anyio
+async def test_concurrent_requests_are_batched(dispatcher, monkeypatch):
+    stub = StubScorer(hold_first=True)
+    monkeypatch.setattr(scoring_service, "predict_credit_scores", stub)
+    await _submit_while_held(dispatcher, stub, [(i, "none") for i in range(10)])
+    assert stub.batches == [("none", ["first"]), ("none", list(range(10)))]
+    stats = dispatcher.stats()
+    assert stats["batches"] == 2 and stats["rows"] == 11 and stats["requests"] == 11
+
+
+@pytest.mark.anyio
+async def test_each_caller_gets_its_own_result(dispatcher, monkeypatch):
+    stub = StubScorer(hold_first=True)
+    monkeypatch.setattr(scoring_service, "predict_credit_scores", stub)
+    requests = [(i, "fast" if i % 3 else "exact") for i in range(12)]
+    results = await _submit_while_held(dispatcher, stub, requests)
+    assert results[0] == {"id": "first", "explanation": "none"}
+    assert results[1:] == [{"id": i, "explanation": mode} for i, mode in requests]
+    # One scoring call per explanation mode within the batch
+    assert sorted(mode for mode, _ in stub.batches[1:]) == ["exact", "fast"]
+
+
+@pytest.mark.anyio
+async def test_failed_batch_fails_every_caller(dispatcher, monkeypatch):
+    stub = StubScorer(hold_first=True, fail_modes=("exact",))
+    monkeypatch.setattr(scoring_service, "predict_credit_scores", stub)
+    requests = [(i, "exact" if i < 4 else "fast") for i in range(8)]
+    results = await _submit_while_held(dispatcher, stub, requests)
+    failed = results[1:5]
+    assert all(isinstance(r, RuntimeError) and str(r) == "exact batch failed" for r in failed)
+    # Requests of the same batch scored in another mode are unaffected
+    assert results[5:] == [{"id": i, "explanation": "fast"} for i in range(4, 8)]
+    assert dispatcher.stats()["errors"] == 1
+
+
+@pytest.mark.anyio
+async def test_stop_shuts_down_cleanly(dispatcher, monkeypatch):
+    stub = StubScorer()
+    monkeypatch.setattr(scoring_service, "predict_credit_scores", stub)
+    results = await asyncio.gather(*[dispatcher.score({"id": i}, "none") for i in range(5)])
+    assert [r["id"] for r in results] == list(range(5))
+    threads = list(dispatcher._threads)
+    assert threads and all(t.is_alive() for t in threads)
+
+    await asyncio.to_thread(dispatcher.stop)
+    assert dispatcher._threads == []
+    assert not any(t.is_alive() for t in threads)
+    # The dispatcher restarts on the next request
+    assert (await dispatcher.score({"id": "again"}, "none"))["id"] == "again"
+
+
+@pytest.mark.anyio
+async def test_disabled_dispatcher_scores_directly(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scoring_service, "predict_credit_score",
+                        lambda record, explanation, timings=None: calls.append(record) or {"id": record["id"]})
+    dispatcher = InferenceDispatcher(enabled=False)
+    assert (await dispatcher.score({"id": 1}, "none")) == {"id": 1}
+    assert calls == [{"id": 1}] and dispatcher._threads == []
@@ -0,0 +1,89 @@
+"""
+Parity of the feature engines with the original per-request pandas pipeline.
+
+    python -m pytest tests
+
+compute_feature_matrix (NumPy), the numba kernel (FEATURE_ENGINE_JIT, when
+numba is installed) and the compute_features wrapper must reproduce the
+reference exactly, including rows with zero denominators.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.feature_engineering import (
+    compute_features, compute_feature_matrix, records_to_matrix, _derive_rows,
+    DERIVED_FEATURES, FEATURE_COLUMNS, RAW_FEATURES, BILL_COLS, PAY_AMT_COLS, PAY_STATUS_COLS
+)
+
+
+def reference_compute_features(df: pd.DataFrame) -> pd.DataFrame:
+    # The original pandas implementation, kept as the parity reference
+    df = df.copy()
+    df['avg_bill_amt'] = df[BILL_COLS].mean(axis=1)
+    df['avg_pay_amt'] = df[PAY_AMT_COLS].mean(axis=1)
+    df['credit_utilization'] = df['avg_bill_amt'] / df['LIMIT_BAL'].replace(0, 1)
+    df['credit_utilization'] = df['credit_utilization'].clip(0, 1.5)
+    sum_pay = df[PAY_AMT_COLS].sum(axis=1)
+    sum_bill = df[BILL_COLS].sum(axis=1)
+    df['payment_consistency'] = sum_pay / sum_bill.replace(0, 1)
+    df['payment_consistency'] = df['payment_consistency'].clip(0, 2)
+    existing_pay_cols = [c for c in PAY_STATUS_COLS if c in df.columns]
+    df['late_payment_count'] = (df[existing_pay_cols] > 0).sum(axis=1)
+    df['severe_delinquency'] = (df[existing_pay_cols] >= 3).any(axis=1).astype(int)
+    df['cashflow_volatility'] = df[BILL_COLS].std(axis=1)
+    ratio_vals = []
+    for b_col, p_col in zip(BILL_COLS, PAY_AMT_COLS):
+        ratio_vals.append(df[p_col] / df[b_col].apply(lambda x: max(x, 1)))
+    df['ratio_volatility'] = pd.concat(ratio_vals, axis=1).std(axis=1)
+    return df
+
+
+def test_numpy_engine_matches_reference(records):
+    expected = reference_compute_features(pd.DataFrame(records))
+    matrix = compute_feature_matrix(records_to_matrix(records))
+    np.testing.assert_array_equal(matrix, expected[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+
+
+def test_jit_engine_matches_reference(records):
+    numba = pytest.importorskip("numba")
+    kernel = numba.njit(cache=True)(_derive_rows)
+    expected = reference_compute_features(pd.DataFrame(records))
+    out = np.empty((len(records), len(DERIVED_FEATURES)))
+    kernel(records_to_matrix(records), out)
+    np.testing.assert_array_equal(out, expected[DERIVED_FEATURES].to_numpy(dtype=np.float64))
+
+
+def test_compute_features_matches_reference(records):
+    df = pd.DataFrame(records)
+    pd.testing.assert_frame_equal(compute_features(df), reference_compute_features(df), check_exact=True)
+
+
+def test_missing_pay_status_columns_count_as_paid(records):
+    partial = pd.DataFrame(records).drop(columns=['PAY_5', 'PAY_6'])
+    pd.testing.assert_frame_equal(
+        compute_features(partial), reference_compute_features(partial), check_exact=True
+    )
+
+
+def test_missing_demographic_columns_are_not_required(records):
+    # Demographics do not feed the derived features, as in the original pipeline
+    partial = pd.DataFrame(records).drop(columns=['AGE', 'SEX', 'EDUCATION', 'MARRIAGE', 'PAY_0'])
+    result = compute_features(partial)
+    pd.testing.assert_frame_equal(result, reference_compute_features(partial), check_exact=True)
+    assert 'AGE' not in result.columns
+
+
+@pytest.mark.parametrize("column", ['LIMIT_BAL', 'BILL_AMT3', 'PAY_AMT6'])
+def test_missing_amount_column_is_rejected(records, column):
+    with pytest.raises(KeyError, match=column):
+        compute_features(pd.DataFrame(records).drop(columns=[column]))
+
+
+def test_zero_denominators():
+    record = dict.fromkeys(RAW_FEATURES, 0.0)
+    record['PAY_AMT1'] = 600.0
+    row = dict(zip(FEATURE_COLUMNS, compute_feature_matrix(records_to_matrix([record]))[0]))
+    # Zero limit and zero bills fall back to a denominator of 1, then clip
+    assert row['credit_utilization'] == 0.0
+    assert row['payment_consistency'] == 2.0
+    assert np.isfinite(row['ratio_volatility'])
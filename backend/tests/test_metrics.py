@@ -0,0 +1,35 @@
+"""
+Request parsing is timed by the scoring routers' TimedRoute as the
+"validation" stage; the request schemas stay free of service imports.
+"""
+import re
+import sys
+import subprocess
+from app.services.metrics import metrics
+
+
+def _stage_count(client, stage):
+    text = client.get("/metrics").text
+    counts = re.findall(rf'scoring_stage_duration_seconds_count{{stage="{stage}",[^}}]*}} (\d+)', text)
+    return sum(int(c) for c in counts)
+
+
+def test_validation_stage_is_timed_per_request(client, applicant):
+    assert metrics.enabled
+    before = _stage_count(client, "validation")
+    assert client.post("/api/credit/score?explanation=none", json=applicant).status_code == 200
+    assert client.post("/api/financial-health/score", json=applicant).status_code == 200
+    assert _stage_count(client, "validation") == before + 2
+
+
+def test_batch_record_validation_is_one_stage(client, applicant):
+    before = _stage_count(client, "record_validation")
+    response = client.post("/api/credit/score/batch?explanation=none", json={"records": [applicant] * 5})
+    assert "record_validation;dur=" in response.headers["Server-Timing"]
+    assert _stage_count(client, "record_validation") == before + 1
+
+
+def test_schemas_do_not_import_services():
+    code = "import sys, app.schemas.credit; print(any(m.startswith('app.services') for m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,46 @@
+"""
+PortfolioStore keeps allocations as float32; what it serves must carry the
+one-decimal percentages the investment model produced, not float32 noise.
+"""
+import json
+import pandas as pd
+import pytest
+from app.services.portfolio import PortfolioStore, ALLOCATION_COLUMNS
+
+ALLOCATIONS = [[5.8, 21.1, 73.1], [20.3, 9.9, 69.8], [33.3, 33.3, 33.4]]
+
+
+@pytest.fixture
+def store():
+    frame = pd.DataFrame(ALLOCATIONS, columns=ALLOCATION_COLUMNS)
+    frame["APPLICANT_ID"] = ["a", "b", "c"]
+    frame["PORTFOLIO_VALUE"] = [1000.0, 2500.0, 0.0]
+    frame["risk_tier"] = ["LOW", "MEDIUM", "HIGH"]
+    frame["health_band"] = ["Strong", "Moderate", "Fragile"]
+    frame["risk_tolerance"] = ["HIGH", "HIGH", "MEDIUM"]
+    frame["investment_horizon"] = ["LONG", "SHORT", "MEDIUM"]
+    frame["credit_score"] = [80, 60, 40]
+    frame["probability_of_default"] = [0.2, 0.4, 0.6]
+    frame["financial_health_score"] = [75.0, 55.0, 30.0]
+    store = PortfolioStore()
+    store.ingest(frame)
+    return store
+
+
+def test_recommendation_percentages_are_exact(store):
+    for customer_id, expected in zip("abc", ALLOCATIONS):
+        allocation = store.recommendation(customer_id)["suggestedAllocation"]
+        assert [a["percentage"] for a in allocation] == expected
+        assert [a["targetPercentage"] for a in allocation] == expected
+    # Serialized as written, e.g. 5.8 rather than 5.800000190734863
+    assert '"percentage": 5.8,' in json.dumps(store.recommendation("a"))
+    assert store.recommendation("a")["suggestedAllocation"][0]["currentValue"] == 58.0
+
+
+def test_risk_alerts_are_exact(store):
+    metrics = store.risk_metrics()
+    # Largest exposure (value x share) first
+    assert [a["concentration"] for a in metrics["concentrationAlerts"]] == [69.8, 73.1]
+    liquidity = {i["customerId"]: i for i in metrics["liquidityStressIndicators"]}
+    assert liquidity["a"]["liquidityRatio"] == 0.058
+    assert liquidity["a"]["liquidAssets"] == 58.0
@@ -0,0 +1,58 @@
+"""
+The compiled tree engine (CREDIT_INFERENCE_ENGINE=compiled) must match
+XGBClassifier.predict_proba within COMPILED_TOLERANCE, one row at a time as
+served per request and over whole batches.
+"""
+import numpy as np
+from app.models.credit_model import COMPILED_TOLERANCE, COMPILED_MAX_ROWS
+from app.services.feature_engineering import FEATURE_INDEX
+
+
+def _model_inputs(model, feature_matrix):
+    return np.ascontiguousarray(feature_matrix[:, [FEATURE_INDEX[f] for f in model.features]], dtype=np.float32)
+
+
+def test_shipped_model_compiles(shipped_model):
+    assert shipped_model.compiled is not None
+
+
+def test_shipped_model_single_rows(shipped_model, feature_matrix):
+    X = _model_inputs(shipped_model, feature_matrix)[:200]
+    for row in X:
+        row = row[None, :]
+        expected = shipped_model.model.predict_proba(row)[:, 1]
+        np.testing.assert_allclose(shipped_model.compiled.predict_proba(row), expected, rtol=0, atol=COMPILED_TOLERANCE)
+        np.testing.assert_allclose(shipped_model.predict(row), expected, rtol=0, atol=COMPILED_TOLERANCE)
+
+
+def test_shipped_model_batch(shipped_model, feature_matrix):
+    X = _model_inputs(shipped_model, feature_matrix)
+    np.testing.assert_allclose(
+        shipped_model.compiled.predict_proba(X), shipped_model.model.predict_proba(X)[:, 1],
+        rtol=0, atol=COMPILED_TOLERANCE
+    )
+    # Batches up to COMPILED_MAX_ROWS are served by the compiled engine
+    small = X[:COMPILED_MAX_ROWS]
+    np.testing.assert_allclose(
+        shipped_model.predict(small), shipped_model.model.predict_proba(small)[:, 1], rtol=0, atol=COMPILED_TOLERANCE
+    )
+
+
+def test_probe_rows_match(shipped_model):
+    probe = shipped_model.compiled.probe_rows(len(shipped_model.features))
+    np.testing.assert_allclose(
+        shipped_model.compiled.predict_proba(probe), shipped_model.model.predict_proba(probe)[:, 1],
+        rtol=0, atol=COMPILED_TOLERANCE
+    )
+
+
+def test_missing_values_follow_default_direction(small_model):
+    model, X = small_model
+    assert model.compiled is not None
+    assert np.isnan(X).any()
+    np.testing.assert_allclose(model.compiled.predict_proba(X), model.model.predict_proba(X)[:, 1],
+                               rtol=0, atol=COMPILED_TOLERANCE)
+    for row in X[:100]:
+        row = row[None, :]
+        np.testing.assert_allclose(model.predict(row), model.model.predict_proba(row)[:, 1],
+                                   rtol=0, atol=COMPILED_TOLERANCE)
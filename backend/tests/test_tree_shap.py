@@ -0,0 +1,72 @@
+"""
+Fast TreeSHAP (precomputed tables) against shap.TreeExplainer, additivity of
+both on the margin (log-odds) scale, and the explanation mode reported by
+/api/credit/score.
+"""
+import numpy as np
+import pytest
+from app.models.credit_model import FAST_SHAP_TOLERANCE
+from app.services.feature_engineering import FEATURE_INDEX
+
+
+def _model_inputs(model, feature_matrix):
+    return np.ascontiguousarray(feature_matrix[:, [FEATURE_INDEX[f] for f in model.features]], dtype=np.float32)
+
+
+def _margin(model, X):
+    return model.model.predict(X, output_margin=True)
+
+
+def _exact_expected_value(model):
+    model.explain_batch(model.compiled.probe_rows(len(model.features))[:1], "exact")
+    expected = model.explainer.expected_value
+    return float(np.ravel(expected)[-1])
+
+
+def test_shipped_model_has_fast_explainer(shipped_model):
+    assert shipped_model.fast_explainer is not None
+
+
+def test_fast_matches_exact(shipped_model, feature_matrix):
+    X = _model_inputs(shipped_model, feature_matrix)[:300]
+    np.testing.assert_allclose(
+        shipped_model.explain_batch(X, "fast"), shipped_model.explain_batch(X, "exact"),
+        rtol=0, atol=FAST_SHAP_TOLERANCE
+    )
+
+
+def test_fast_matches_exact_with_missing_values(small_model):
+    model, X = small_model
+    assert model.fast_explainer is not None
+    X = X[:300]
+    np.testing.assert_allclose(model.explain_batch(X, "fast"), model.explain_batch(X, "exact"),
+                               rtol=0, atol=FAST_SHAP_TOLERANCE)
+
+
+@pytest.mark.parametrize("mode", ["fast", "exact"])
+def test_shap_values_add_up_to_the_margin(shipped_model, feature_matrix, mode):
+    X = _model_inputs(shipped_model, feature_matrix)[:300]
+    phi = shipped_model.explain_batch(X, mode)
+    expected = shipped_model.fast_explainer.expected_value if mode == "fast" else _exact_expected_value(shipped_model)
+    np.testing.assert_allclose(phi.sum(axis=1) + expected, _margin(shipped_model, X), rtol=0, atol=FAST_SHAP_TOLERANCE)
+
+
+def test_single_row_explanation(shipped_model, feature_matrix):
+    row = _model_inputs(shipped_model, feature_matrix)[:1]
+    phi = shipped_model.explain(row, "fast")
+    assert phi.shape == (len(shipped_model.features),)
+    np.testing.assert_allclose(phi, shipped_model.explain(row, "exact"), rtol=0, atol=FAST_SHAP_TOLERANCE)
+
+
+@pytest.mark.parametrize("mode", ["none", "fast", "exact"])
+def test_score_reports_explanation_mode(client, applicant, mode):
+    response = client.post(f"/api/credit/score?explanation={mode}", json=applicant)
+    assert response.status_code == 200
+    assert response.headers["X-Explanation-Mode"] == mode
+    explainability = response.json()["explainability"]
+    assert (explainability is None) == (mode == "none")
+
+
+def test_score_rejects_unknown_explanation_mode(client, applicant):
+    response = client.post("/api/credit/score?explanation=slow", json=applicant)
+    assert response.status_code == 422
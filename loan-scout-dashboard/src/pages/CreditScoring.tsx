@@ -84,20 +84,11 @@ const CreditScoring = () => {
     const calculateScore = async () => {
         setLoading(true);
         try {
-            // 1. Credit Score
-            const creditRes = await api.getCreditScore(formData);
-
-            // 2. Financial Health
-            const healthRes = await api.getFinancialHealth(formData);
-
-            // 3. Asset Recommendation
-            const assetRes = await api.getAssetRecommendation({
-                financial_health_score: healthRes.financial_health_score,
-                credit_score: creditRes.credit_score,
-                risk_tier: creditRes.risk_tier,
-                LIMIT_BAL: formData.LIMIT_BAL,
-                AGE: formData.AGE
-            });
+            // Credit score, financial health and asset recommendation in one call
+            const assessment = await api.getAssessment(formData);
+            const creditRes = assessment.credit;
+            const healthRes = assessment.financial_health;
+            const assetRes = assessment.asset_recommendation;
 
             const applicantData = adaptResponseToApplicant(creditRes, healthRes, formData);
             setResult(applicantData);
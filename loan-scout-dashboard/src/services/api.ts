@@ -54,7 +54,24 @@ export interface AssetRecommendationResponse {
     };
 }
 
+export interface AssessmentResponse {
+    credit: CreditScoreResponse;
+    financial_health: FinancialHealthResponse;
+    asset_recommendation: AssetRecommendationResponse;
+}
+
 export const api = {
+    async getAssessment(data: CreditScoreRequest): Promise<AssessmentResponse> {
+        const response = await fetch(`${API_BASE_URL}/assessment`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data),
+        });
+        if (!response.ok) throw new Error('Failed to fetch assessment');
+        return response.json();
+    },
+
+
     async getCreditScore(data: CreditScoreRequest): Promise<CreditScoreResponse> {
         const response = await fetch(`${API_BASE_URL}/credit/score`, {
             method: 'POST',
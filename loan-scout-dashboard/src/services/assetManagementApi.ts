@@ -11,40 +11,45 @@ import {
   mockProfiles,
   mockPortfolios,
   mockRecommendations,
-  mockAUMMetrics,
-  mockRiskMetrics,
-  mockInvestorSegments,
   investmentProducts,
 } from '@/data/mockAssetManagement';
+import { API_BASE_URL as BACKEND_URL } from './api';
 
 // Simulated API delay
 const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
 
-// Base URL for future API integration
-const API_BASE_URL = '/api/asset-management';
+const API_BASE_URL = `${BACKEND_URL}/asset-management`;
+
+async function getJson<T>(path: string): Promise<T> {
+  const response = await fetch(`${API_BASE_URL}${path}`);
+  if (!response.ok) throw new Error(`Failed to fetch ${path}`);
+  return response.json();
+}
 
 // API service layer - ready for backend integration
 export const assetManagementApi = {
-  // AUM & Dashboard
+  // AUM & Dashboard: served from the backend's portfolio store
   async getAUMMetrics(): Promise<AUMMetrics> {
-    await delay(300);
-    // Future: return fetch(`${API_BASE_URL}/aum`).then(r => r.json());
-    return mockAUMMetrics;
+    return getJson<AUMMetrics>('/aum');
   },
 
   async getRiskMetrics(): Promise<RiskMetrics> {
-    await delay(300);
-    // Future: return fetch(`${API_BASE_URL}/risk-metrics`).then(r => r.json());
-    return mockRiskMetrics;
+    const metrics = await getJson<RiskMetrics>('/risk-metrics');
+    // The portfolio store keeps no customer names; show the customer id instead
+    return {
+      ...metrics,
+      concentrationAlerts: metrics.concentrationAlerts.map(a => ({ ...a, customerName: a.customerName ?? a.customerId })),
+      liquidityStressIndicators: metrics.liquidityStressIndicators.map(i => ({ ...i, customerName: i.customerName ?? i.customerId })),
+    };
   },
 
   async getInvestorSegments(): Promise<InvestorSegment[]> {
-    await delay(300);
-    // Future: return fetch(`${API_BASE_URL}/segments`).then(r => r.json());
-    return mockInvestorSegments;
+    return getJson<InvestorSegment[]>('/segments');
   },
 
-  // Investment Profiles
+  // Investment Profiles. Still mock data: the backend's /profiles and
+  // /recommendations items lack the contact details, repayment summary,
+  // products and rationale these views render.
   async getInvestmentProfiles(): Promise<InvestmentProfile[]> {
     await delay(300);
     // Future: return fetch(`${API_BASE_URL}/profiles`).then(r => r.json());